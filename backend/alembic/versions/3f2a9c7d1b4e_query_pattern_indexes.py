@@ -0,0 +1,78 @@
+"""índices compuestos y parciales para los patrones de consulta
+
+Cada índice cubre el filtro + orden de un listado de los controladores:
+- pets: owner_id + created_at (listado / keyset)
+- vaccinations: pet_id + date_administered; pet_id + next_due parcial (vencimientos)
+- dewormings: pet_id + next_due parcial (vencimientos)
+- meals: pet_id + meal_time
+- reminders: owner_id + event_time
+- notifications: owner_id + sent_at
+- audit_logs: actor_user_id + created_at; object_type + object_id + created_at;
+  created_at (listado admin)
+- users: created_at (listado admin)
+
+Se crean con CONCURRENTLY para no bloquear escrituras y con IF NOT EXISTS
+porque init_db.py (create_all) ya los crea en bases nuevas.
+
+Revision ID: 3f2a9c7d1b4e
+Revises:
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c7d1b4e'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "petcare"
+
+# (nombre, tabla, columnas, condición del índice parcial)
+INDEXES = [
+    ("ix_users_created_at_id", "users", ["created_at", "id"], None),
+    ("ix_pets_owner_created_at", "pets", ["owner_id", "created_at", "id"], None),
+    ("ix_vaccinations_pet_date_administered", "vaccinations", ["pet_id", "date_administered", "id"], None),
+    ("ix_vaccinations_pet_next_due", "vaccinations", ["pet_id", "next_due"], "next_due IS NOT NULL"),
+    ("ix_dewormings_pet_next_due", "dewormings", ["pet_id", "next_due"], "next_due IS NOT NULL"),
+    ("ix_meals_pet_meal_time", "meals", ["pet_id", "meal_time", "id"], None),
+    ("ix_reminders_owner_event_time", "reminders", ["owner_id", "event_time"], None),
+    ("ix_notifications_owner_sent_at", "notifications", ["owner_id", "sent_at", "id"], None),
+    ("ix_audit_logs_actor_created_at", "audit_logs", ["actor_user_id", "created_at", "id"], None),
+    ("ix_audit_logs_object_created_at", "audit_logs", ["object_type", "object_id", "created_at"], None),
+    ("ix_audit_logs_created_at_id", "audit_logs", ["created_at", "id"], None),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                schema=SCHEMA,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                schema=SCHEMA,
+                if_exists=True,
+                postgresql_concurrently=True
+            )
@@ -0,0 +1,49 @@
+"""variantes redimensionadas de imágenes
+
+Tabla image_variants: una fila por (digest del original, tamaño, formato)
+con el digest de la variante en el blob store.
+
+Revision ID: 5d9b2e6f0a13
+Revises: 8c4e1b7a9d20
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d9b2e6f0a13'
+down_revision: Union[str, Sequence[str], None] = '8c4e1b7a9d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "petcare"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "image_variants",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("source_sha256", sa.String(64), nullable=False),
+        sa.Column("size", sa.String(), nullable=False),
+        sa.Column("format", sa.String(), nullable=False),
+        sa.Column("width", sa.Integer()),
+        sa.Column("height", sa.Integer()),
+        sa.Column("sha256", sa.String(64), nullable=False),
+        sa.Column("file_size_bytes", sa.BigInteger()),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("source_sha256", "size", "format", name="uq_image_variants_source_size_format"),
+        schema=SCHEMA,
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("image_variants", schema=SCHEMA)
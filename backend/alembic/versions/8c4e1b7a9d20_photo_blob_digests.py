@@ -0,0 +1,53 @@
+"""digest SHA-256 de fotos en el blob store
+
+- pet_photos.sha256 + índice (conteo de referencias al borrar)
+- pets.photo_sha256
+Las columnas bytea (pet_photos.data, pets.photo_bytea) se mantienen hasta
+que migrate_blobs.py mueva su contenido al blob store.
+
+Revision ID: 8c4e1b7a9d20
+Revises: 3f2a9c7d1b4e
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4e1b7a9d20'
+down_revision: Union[str, Sequence[str], None] = '3f2a9c7d1b4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "petcare"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(f"ALTER TABLE {SCHEMA}.pet_photos ADD COLUMN IF NOT EXISTS sha256 VARCHAR(64)")
+    op.execute(f"ALTER TABLE {SCHEMA}.pets ADD COLUMN IF NOT EXISTS photo_sha256 VARCHAR(64)")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_pet_photos_sha256",
+            "pet_photos",
+            ["sha256"],
+            schema=SCHEMA,
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_pet_photos_sha256",
+            table_name="pet_photos",
+            schema=SCHEMA,
+            if_exists=True,
+            postgresql_concurrently=True
+        )
+    op.drop_column("pets", "photo_sha256", schema=SCHEMA)
+    op.drop_column("pet_photos", "sha256", schema=SCHEMA)
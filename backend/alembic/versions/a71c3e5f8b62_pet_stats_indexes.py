@@ -0,0 +1,62 @@
+"""índices por mascota para las estadísticas
+
+Los contadores de /pets/{pet_id}/stats (subconsultas por pet_id) necesitan
+un índice que empiece por pet_id en cada tabla:
+- dewormings: pet_id + date_administered
+- vet_visits: pet_id + visit_date
+- reminders: pet_id parcial (is_active)
+vaccinations y meals ya lo tienen (3f2a9c7d1b4e).
+
+Revision ID: a71c3e5f8b62
+Revises: 5d9b2e6f0a13
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a71c3e5f8b62'
+down_revision: Union[str, Sequence[str], None] = '5d9b2e6f0a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "petcare"
+
+# (nombre, tabla, columnas, condición del índice parcial)
+INDEXES = [
+    ("ix_dewormings_pet_date_administered", "dewormings", ["pet_id", "date_administered"], None),
+    ("ix_vet_visits_pet_visit_date", "vet_visits", ["pet_id", "visit_date"], None),
+    ("ix_reminders_pet_active", "reminders", ["pet_id"], "is_active"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                schema=SCHEMA,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                schema=SCHEMA,
+                if_exists=True,
+                postgresql_concurrently=True
+            )
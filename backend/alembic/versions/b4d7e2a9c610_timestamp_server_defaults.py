@@ -0,0 +1,88 @@
+"""created_at / updated_at generados por la base
+
+Los modelos ya no calculan las fechas en Python: el INSERT usa DEFAULT now()
+y el UPDATE el trigger petcare.update_updated_at(); el flush las trae con
+RETURNING (eager_defaults). Esta revisión deja eso garantizado en todas las
+tablas:
+- DEFAULT now() en created_at / updated_at (image_variants y email_outbox
+  se crearon sin default)
+- trigger trg_<tabla>_updated_at donde falte (image_variants, y las tablas
+  creadas con create_all en lugar de pet_health_tracker_schema.sql)
+
+Revision ID: b4d7e2a9c610
+Revises: f3a6d2c8b519
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d7e2a9c610'
+down_revision: Union[str, Sequence[str], None] = 'f3a6d2c8b519'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "petcare"
+
+TABLES = [
+    "users",
+    "pets",
+    "pet_photos",
+    "image_variants",
+    "vaccinations",
+    "dewormings",
+    "vet_visits",
+    "nutrition_plans",
+    "meals",
+    "reminders",
+    "notifications",
+    "password_resets",
+    "email_outbox",
+    "audit_logs",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION {SCHEMA}.update_updated_at()
+        RETURNS TRIGGER AS $$
+        BEGIN
+          NEW.updated_at = now();
+          RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in TABLES:
+        op.execute(
+            f"ALTER TABLE {SCHEMA}.{table} "
+            f"ALTER COLUMN created_at SET DEFAULT now(), "
+            f"ALTER COLUMN updated_at SET DEFAULT now()"
+        )
+        # El esquema SQL usa otros nombres en algunas tablas (trg_nutrition_updated_at):
+        # se busca cualquier trigger de la tabla que llame a la función
+        op.execute(f"""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM pg_trigger
+                    WHERE tgrelid = '{SCHEMA}.{table}'::regclass
+                      AND tgfoid = '{SCHEMA}.update_updated_at'::regproc
+                ) THEN
+                    CREATE TRIGGER trg_{table}_updated_at
+                    BEFORE UPDATE ON {SCHEMA}.{table}
+                    FOR EACH ROW
+                    EXECUTE FUNCTION {SCHEMA}.update_updated_at();
+                END IF;
+            END$$
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Los defaults y triggers son compatibles con el código anterior (que
+    # manda las fechas explícitas): solo se quita el trigger que agregó esta revisión
+    op.execute(f"DROP TRIGGER IF EXISTS trg_image_variants_updated_at ON {SCHEMA}.image_variants")
@@ -0,0 +1,77 @@
+"""búsqueda full-text (tsvector) y por similitud (pg_trgm)
+
+- pets.search_vector y vet_visits.search_vector: columnas generadas
+  (STORED) con pesos A/B/C, cada una con su índice GIN
+- índices GIN gin_trgm_ops en pets.name y users.username/email/full_name
+  (similitud y ILIKE '%...%')
+
+Agregar una columna generada STORED reescribe la tabla: ejecutar en una
+ventana de mantenimiento en tablas grandes. Los índices se crean con
+CONCURRENTLY.
+
+Revision ID: c2d84f1a6e37
+Revises: a71c3e5f8b62
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d84f1a6e37'
+down_revision: Union[str, Sequence[str], None] = 'a71c3e5f8b62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "petcare"
+
+# tabla -> expresión de la columna generada search_vector
+SEARCH_VECTORS = {
+    "pets": (
+        "setweight(to_tsvector('spanish', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('spanish', coalesce(species, '') || ' ' || coalesce(breed, '')), 'B') || "
+        "setweight(to_tsvector('spanish', coalesce(notes, '')), 'C')"
+    ),
+    "vet_visits": (
+        "setweight(to_tsvector('spanish', coalesce(reason, '')), 'A') || "
+        "setweight(to_tsvector('spanish', coalesce(diagnosis, '')), 'B') || "
+        "setweight(to_tsvector('spanish', coalesce(treatment, '')), 'C')"
+    ),
+}
+
+# (nombre, tabla, expresión indexada)
+INDEXES = [
+    ("ix_pets_search_vector", "pets", "search_vector"),
+    ("ix_vet_visits_search_vector", "vet_visits", "search_vector"),
+    ("ix_pets_name_trgm", "pets", "name gin_trgm_ops"),
+    ("ix_users_username_trgm", "users", "username gin_trgm_ops"),
+    ("ix_users_email_trgm", "users", "email gin_trgm_ops"),
+    ("ix_users_full_name_trgm", "users", "full_name gin_trgm_ops"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, expression in SEARCH_VECTORS.items():
+        op.execute(
+            f"ALTER TABLE {SCHEMA}.{table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({expression}) STORED"
+        )
+    with op.get_context().autocommit_block():
+        for name, table, expression in INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON {SCHEMA}.{table} USING gin ({expression})"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {SCHEMA}.{name}")
+    for table in SEARCH_VECTORS:
+        op.drop_column(table, "search_vector", schema=SCHEMA)
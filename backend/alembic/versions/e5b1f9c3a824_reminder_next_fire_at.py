@@ -0,0 +1,105 @@
+"""próxima ocurrencia de recordatorios (next_fire_at)
+
+- reminders.next_fire_at / last_fired_at
+- índice parcial ix_reminders_next_fire_at (is_active AND next_fire_at IS NOT NULL)
+- backfill de next_fire_at con app/utils/recurrence.py (frequency / rrule)
+- vista upcoming_reminders basada en next_fire_at
+
+Revision ID: e5b1f9c3a824
+Revises: c2d84f1a6e37
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.recurrence import InvalidRecurrenceError, first_fire_at
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b1f9c3a824'
+down_revision: Union[str, Sequence[str], None] = 'c2d84f1a6e37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "petcare"
+BATCH_SIZE = 1000
+
+# Recordatorios de una sola vez más viejos que esto no se programan
+# (igual que la vista anterior), para no dispararlos todos al migrar
+ONCE_GRACE = timedelta(days=1)
+
+
+def _backfill() -> None:
+    conn = op.get_bind()
+    now = datetime.now(timezone.utc)
+    rows = conn.execute(sa.text(
+        f"SELECT id, event_time, frequency::text AS frequency, rrule, timezone "
+        f"FROM {SCHEMA}.reminders WHERE is_active"
+    )).all()
+    updates = []
+    for row in rows:
+        try:
+            next_fire_at = first_fire_at(row.event_time, row.frequency, row.rrule, row.timezone, now)
+        except InvalidRecurrenceError:
+            print(f"⚠️ Recordatorio {row.id} con rrule inválida, queda sin programar")
+            continue
+        if next_fire_at is not None and next_fire_at >= now - ONCE_GRACE:
+            updates.append({"id": row.id, "next_fire_at": next_fire_at})
+    for start in range(0, len(updates), BATCH_SIZE):
+        conn.execute(
+            sa.text(f"UPDATE {SCHEMA}.reminders SET next_fire_at = :next_fire_at WHERE id = :id"),
+            updates[start:start + BATCH_SIZE]
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(f"ALTER TABLE {SCHEMA}.reminders ADD COLUMN IF NOT EXISTS next_fire_at TIMESTAMPTZ")
+    op.execute(f"ALTER TABLE {SCHEMA}.reminders ADD COLUMN IF NOT EXISTS last_fired_at TIMESTAMPTZ")
+    _backfill()
+    op.execute(f"""
+        CREATE OR REPLACE VIEW {SCHEMA}.upcoming_reminders AS
+        SELECT r.*
+        FROM {SCHEMA}.reminders r
+        WHERE r.is_active = TRUE
+          AND r.next_fire_at IS NOT NULL
+        ORDER BY r.next_fire_at ASC
+    """)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_reminders_next_fire_at",
+            "reminders",
+            ["next_fire_at"],
+            schema=SCHEMA,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text("is_active AND next_fire_at IS NOT NULL")
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_reminders_next_fire_at",
+            table_name="reminders",
+            schema=SCHEMA,
+            if_exists=True,
+            postgresql_concurrently=True
+        )
+    op.execute(f"DROP VIEW IF EXISTS {SCHEMA}.upcoming_reminders")
+    op.drop_column("reminders", "last_fired_at", schema=SCHEMA)
+    op.drop_column("reminders", "next_fire_at", schema=SCHEMA)
+    op.execute(f"""
+        CREATE OR REPLACE VIEW {SCHEMA}.upcoming_reminders AS
+        SELECT r.*
+        FROM {SCHEMA}.reminders r
+        WHERE r.is_active = TRUE
+          AND (r.frequency <> 'once' OR r.event_time >= now())
+          AND (r.event_time >= now() - interval '1 day')
+        ORDER BY r.event_time ASC
+    """)
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -6,6 +7,13 @@ load_dotenv()
 class Settings:
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    
+    # Routers que usan el stack async (asyncpg), separados por coma. Ej: "meals,vaccinations"
+    ASYNC_ROUTERS: list = [name.strip() for name in os.getenv("ASYNC_ROUTERS", "").split(",") if name.strip()]
+    ASYNC_DB_POOL_SIZE: int = int(os.getenv("ASYNC_DB_POOL_SIZE", "20"))
+    ASYNC_DB_MAX_OVERFLOW: int = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "40"))
     
     # JWT Configuration
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
@@ -13,11 +21,67 @@ class Settings:
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Instrumentación SQL por request (app/middleware/query_stats.py): header
+    # Server-Timing con sentencias y tiempo de DB, y log de las sentencias que
+    # superan el umbral (0 = no loguear)
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    
+    # Métricas Prometheus (/metrics). Con varios workers, PROMETHEUS_MULTIPROC_DIR
+    # hace que /metrics agregue todos los procesos; el comando web del Procfile
+    # lo vacía antes de arrancar uvicorn
+    PROMETHEUS_MULTIPROC_DIR: str = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+    METRICS_REFRESH_SECONDS: float = float(os.getenv("METRICS_REFRESH_SECONDS", "5"))
+    
+    # Readiness (/health/ready): SELECT 1 con timeout estricto, resultado cacheado
+    READINESS_CACHE_SECONDS: float = float(os.getenv("READINESS_CACHE_SECONDS", "2"))
+    READINESS_DB_TIMEOUT_MS: int = int(os.getenv("READINESS_DB_TIMEOUT_MS", "500"))
+    # Fracción de conexiones en uso (pool_size + max_overflow) a partir de la cual el worker no está listo
+    READINESS_MAX_POOL_SATURATION: float = float(os.getenv("READINESS_MAX_POOL_SATURATION", "1.0"))
+    
     # Security
-    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_SCHEME: str = os.getenv("PASSWORD_HASH_SCHEME", "bcrypt")  # bcrypt | scrypt
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    SCRYPT_LOG_N: int = int(os.getenv("SCRYPT_LOG_N", "14"))
+    SCRYPT_R: int = int(os.getenv("SCRYPT_R", "8"))
+    SCRYPT_P: int = int(os.getenv("SCRYPT_P", "1"))
     MAX_LOGIN_ATTEMPTS: int = 5
     ACCOUNT_LOCK_MINUTES: int = 30
     
+    # Pool de procesos para bcrypt (0 workers = hashear en el mismo hilo).
+    # Cada worker de uvicorn tiene su propio pool: por defecto se reparten los
+    # CPUs entre los WEB_CONCURRENCY workers (uvicorn lo usa como --workers)
+    WEB_CONCURRENCY: int = max(int(os.getenv("WEB_CONCURRENCY", "1")), 1)
+    PASSWORD_HASH_WORKERS: int = int(os.getenv(
+        "PASSWORD_HASH_WORKERS",
+        str(max((os.cpu_count() or 1) // WEB_CONCURRENCY, 1))
+    ))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+    # Caché de usuarios autenticados (0 segundos la desactiva)
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+
+    # Escritura de auditoría: "sync" (en la misma transacción) | "async" (lotes en segundo plano)
+    AUDIT_SINK_MODE: str = os.getenv("AUDIT_SINK_MODE", "sync")
+    AUDIT_SINK_MAX_QUEUE: int = int(os.getenv("AUDIT_SINK_MAX_QUEUE", "10000"))
+    AUDIT_SINK_BATCH_SIZE: int = int(os.getenv("AUDIT_SINK_BATCH_SIZE", "500"))
+    AUDIT_SINK_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("AUDIT_SINK_FLUSH_INTERVAL_SECONDS", "0.5"))
+    AUDIT_SINK_ENQUEUE_TIMEOUT_SECONDS: float = float(os.getenv("AUDIT_SINK_ENQUEUE_TIMEOUT_SECONDS", "0.1"))
+    # Espera entre reintentos de un lote que la base no aceptó (mientras tanto la auditoría es síncrona)
+    AUDIT_SINK_RETRY_INTERVAL_SECONDS: float = float(os.getenv("AUDIT_SINK_RETRY_INTERVAL_SECONDS", "5"))
+
+    # Almacenamiento de fotos (direccionado por SHA-256)
+    BLOB_STORE_BACKEND: str = os.getenv("BLOB_STORE_BACKEND", "local")
+    BLOB_STORE_PATH: str = os.getenv("BLOB_STORE_PATH", "media/blobs")
+    BLOB_MAX_UPLOAD_MB: int = int(os.getenv("BLOB_MAX_UPLOAD_MB", "20"))
+
+    # Variantes redimensionadas de fotos (pool de procesos con Pillow)
+    IMAGE_VARIANT_WORKERS: int = int(os.getenv("IMAGE_VARIANT_WORKERS", "2"))
+    IMAGE_VARIANT_QUALITY: int = int(os.getenv("IMAGE_VARIANT_QUALITY", "80"))
+    IMAGE_VARIANT_TIMEOUT_SECONDS: float = float(os.getenv("IMAGE_VARIANT_TIMEOUT_SECONDS", "30"))
+    IMAGE_VARIANT_FAILURE_TTL_SECONDS: float = float(os.getenv("IMAGE_VARIANT_FAILURE_TTL_SECONDS", "3600"))
+
     # Email verification
     EMAIL_VERIFICATION_EXPIRE_HOURS: int = 24
     PASSWORD_RESET_EXPIRE_HOURS: int = 1
@@ -28,11 +92,38 @@ class Settings:
     EMAIL_FROM: str = os.getenv("EMAIL_FROM", "onboarding@resend.dev")
     EMAIL_FROM_NAME: str = os.getenv("EMAIL_FROM_NAME", "Pet HealthCare")
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:3000")
+    # Bytecode cache de las plantillas Jinja2 de emails ("" lo desactiva). Por
+    # defecto en el directorio temporal: no depende del CWD ni de que el código sea escribible
+    EMAIL_TEMPLATE_CACHE_DIR: str = os.getenv(
+        "EMAIL_TEMPLATE_CACHE_DIR",
+        os.path.join(tempfile.gettempdir(), "petcare-jinja")
+    )
     
     # Gmail SMTP (alternativa)
     SMTP_HOST: str = os.getenv("SMTP_HOST", "smtp.gmail.com")
     SMTP_PORT: int = int(os.getenv("SMTP_PORT", "587"))
     SMTP_USER: str = os.getenv("SMTP_USER", "")
     SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "")
+    # Las conexiones SMTP de los workers se reutilizan; pasado este tiempo inactivas se reabren
+    SMTP_MAX_IDLE_SECONDS: float = float(os.getenv("SMTP_MAX_IDLE_SECONDS", "60"))
+    # Tiempo máximo de cada envío (timeout del socket SMTP y espera de los workers)
+    EMAIL_SEND_TIMEOUT_SECONDS: float = float(os.getenv("EMAIL_SEND_TIMEOUT_SECONDS", "30"))
+
+    # Outbox de emails (email_outbox_worker.py): reintentos con backoff exponencial
+    EMAIL_OUTBOX_BATCH_SIZE: int = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "50"))
+    EMAIL_OUTBOX_CONCURRENCY: int = int(os.getenv("EMAIL_OUTBOX_CONCURRENCY", "4"))
+    EMAIL_OUTBOX_POLL_INTERVAL_SECONDS: float = float(os.getenv("EMAIL_OUTBOX_POLL_INTERVAL_SECONDS", "2"))
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "8"))
+    EMAIL_OUTBOX_BACKOFF_SECONDS: float = float(os.getenv("EMAIL_OUTBOX_BACKOFF_SECONDS", "30"))
+    EMAIL_OUTBOX_MAX_BACKOFF_SECONDS: float = float(os.getenv("EMAIL_OUTBOX_MAX_BACKOFF_SECONDS", "3600"))
+
+    # Proveedor falso (EMAIL_PROVIDER=fake) para pruebas de carga sin red
+    FAKE_EMAIL_LATENCY_MS: float = float(os.getenv("FAKE_EMAIL_LATENCY_MS", "50"))
+    FAKE_EMAIL_FAILURE_RATE: float = float(os.getenv("FAKE_EMAIL_FAILURE_RATE", "0"))
+
+    # Worker de notificaciones (notification_worker.py)
+    NOTIFICATION_BATCH_SIZE: int = int(os.getenv("NOTIFICATION_BATCH_SIZE", "100"))
+    NOTIFICATION_CONCURRENCY: int = int(os.getenv("NOTIFICATION_CONCURRENCY", "10"))
+    NOTIFICATION_POLL_INTERVAL_SECONDS: float = float(os.getenv("NOTIFICATION_POLL_INTERVAL_SECONDS", "5"))
 
 settings = Settings()
\ No newline at end of file
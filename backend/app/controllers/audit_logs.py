@@ -3,30 +3,42 @@
 # ========================================
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import desc, and_
+from sqlalchemy.engine import Row
 from app.models import AuditLog, User
 from app.schemas.audit_logs import AuditLogCreate, AuditLogFilter
+from app.utils.unit_of_work import commit_with_audit
+from app.utils.pagination import Keyset
 from fastapi import HTTPException, status
 
+AUDIT_LOG_KEYSET = Keyset("audit_logs", AuditLog.created_at, AuditLog.id)
+
+# Columnas de AuditLogWithUser (mismos nombres que el schema)
+AUDIT_LOG_WITH_USER_COLUMNS = (
+    AuditLog.id,
+    AuditLog.actor_user_id,
+    AuditLog.action,
+    AuditLog.object_type,
+    AuditLog.object_id,
+    AuditLog.meta,
+    AuditLog.created_at,
+    AuditLog.updated_at,
+    User.username.label("actor_username"),
+    User.email.label("actor_email"),
+)
+
+# Usuario actor de AuditLogWithUser: solo username y email (más el id), en una
+# consulta IN por página en lugar de un lazy load por cada log
+ACTOR_IN_LIST = selectinload(AuditLog.actor).load_only(User.username, User.email)
+ACTOR_IN_DETAIL = joinedload(AuditLog.actor).load_only(User.username, User.email)
+
 class AuditLogController:
     """Controlador para logs de auditoría"""
     
     @staticmethod
-    def get_all(
-        db: Session,
-        current_user: User,
-        filters: Optional[AuditLogFilter] = None,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[AuditLog]:
-        """
-        Obtiene todos los logs de auditoría con filtros
-        Solo admins pueden ver todos los logs
-        Usuarios normales solo ven sus propios logs
-        """
-        query = db.query(AuditLog)
-        
+    def _filtered(query, current_user: User, filters: Optional[AuditLogFilter]):
+        """Aplica permisos y filtros a una consulta sobre AuditLog"""
         # Si no es admin, solo puede ver sus propios logs
         if current_user.role != "admin":
             query = query.filter(AuditLog.actor_user_id == current_user.id)
@@ -51,12 +63,47 @@ class AuditLogController:
             if filters.date_to:
                 query = query.filter(AuditLog.created_at <= filters.date_to)
         
-        return query.order_by(desc(AuditLog.created_at)).offset(skip).limit(limit).all()
+        return query
+    
+    @staticmethod
+    def get_all(
+        db: Session,
+        current_user: User,
+        filters: Optional[AuditLogFilter] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[AuditLog]:
+        """
+        Obtiene todos los logs de auditoría con filtros
+        Solo admins pueden ver todos los logs
+        Usuarios normales solo ven sus propios logs
+        """
+        query = AuditLogController._filtered(db.query(AuditLog), current_user, filters)
+        return AUDIT_LOG_KEYSET.paginate(query, cursor, skip, limit).all()
+    
+    @staticmethod
+    def get_all_with_user_rows(
+        db: Session,
+        current_user: User,
+        filters: Optional[AuditLogFilter] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[Row]:
+        """
+        Igual que get_all, pero como filas con las columnas de AuditLogWithUser
+        (usuario actor en el mismo JOIN): se serializan directo a JSON, sin
+        materializar AuditLog / User ni pasar por Pydantic
+        """
+        query = db.query(*AUDIT_LOG_WITH_USER_COLUMNS).outerjoin(User, User.id == AuditLog.actor_user_id)
+        query = AuditLogController._filtered(query, current_user, filters)
+        return AUDIT_LOG_KEYSET.paginate(query, cursor, skip, limit).all()
     
     @staticmethod
     def get_by_id(db: Session, audit_log_id: str, current_user: User) -> AuditLog:
         """Obtiene un log específico por ID"""
-        audit_log = db.query(AuditLog).filter(AuditLog.id == audit_log_id).first()
+        audit_log = db.query(AuditLog).options(ACTOR_IN_DETAIL).filter(AuditLog.id == audit_log_id).first()
         
         if not audit_log:
             raise HTTPException(
@@ -82,7 +129,6 @@ class AuditLogController:
         new_log = AuditLog(**data.model_dump())
         db.add(new_log)
         db.commit()
-        db.refresh(new_log)
         return new_log
     
     @staticmethod
@@ -122,7 +168,7 @@ class AuditLogController:
                 detail="No tienes permiso para ver este historial"
             )
         
-        return db.query(AuditLog).filter(
+        return db.query(AuditLog).options(ACTOR_IN_LIST).filter(
             and_(
                 AuditLog.object_type == object_type,
                 AuditLog.object_id == object_id
@@ -205,10 +251,9 @@ class AuditLogController:
             AuditLog.created_at < cutoff_date
         ).delete()
         
-        db.commit()
-        
-        # Log de la eliminación
-        audit = AuditLog(
+        # Purga y log de la eliminación en una sola transacción
+        commit_with_audit(
+            db,
             actor_user_id=current_user.id,
             action="AUDIT_LOGS_PURGED",
             object_type="AuditLog",
@@ -218,7 +263,5 @@ class AuditLogController:
                 "cutoff_date": cutoff_date.isoformat()
             }
         )
-        db.add(audit)
-        db.commit()
         
         return deleted_count
\ No newline at end of file
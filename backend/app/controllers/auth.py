@@ -1,10 +1,12 @@
+import uuid
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from app.models import User, PasswordReset, AuditLog
+from app.models import User, PasswordReset
 from app.schemas.auth import UserRegister, UserLogin
 from app.utils.security import (
     hash_password,
     verify_password,
+    password_needs_rehash,
     create_access_token,
     create_refresh_token,
     decode_token,
@@ -21,7 +23,9 @@ from app.utils.exceptions import (
     InvalidTokenException
 )
 from app.config import settings
-from app.services.email_service import EmailService
+from app.services.email_outbox import enqueue as enqueue_email
+from app.services.user_cache import user_cache
+from app.utils.unit_of_work import commit_with_audit
 
 class AuthController:
     """Controlador para operaciones de autenticación"""
@@ -56,6 +60,7 @@ class AuthController:
         # Crear nuevo usuario
         verification_token = generate_verification_token()
         new_user = User(
+            id=uuid.uuid4(),  # el audit lo referencia como actor antes del INSERT
             username=username,
             email=user_data.email,
             hashed_password=hash_password(user_data.password),
@@ -67,32 +72,23 @@ class AuthController:
             is_active=True
         )
         
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-        
-        # Log de auditoría
-        audit = AuditLog(
+        # Usuario, email de verificación (outbox) y log de auditoría en una sola transacción;
+        # el email lo envía email_outbox_worker.py, el registro no espera al proveedor
+        enqueue_email(
+            db,
+            new_user.email,
+            "verification",
+            username=new_user.username,
+            token=verification_token
+        )
+        commit_with_audit(
+            db,
+            new_user,
             actor_user_id=new_user.id,
             action="USER_REGISTERED",
             object_type="User",
-            object_id=new_user.id,
             meta={"email": new_user.email, "username": new_user.username}
         )
-        db.add(audit)
-        db.commit()
-        
-        # Enviar email de verificación
-        try:
-            EmailService.send_verification_email(
-                email=new_user.email,
-                username=new_user.username,
-                token=verification_token
-            )
-            print(f"✅ Email de verificación enviado a {new_user.email}")
-        except Exception as e:
-            print(f"⚠️ Error enviando email de verificación: {str(e)}")
-            # No fallar el registro si el email no se envía
         
         return new_user
     
@@ -125,6 +121,7 @@ class AuthController:
             if user.failed_attempts >= settings.MAX_LOGIN_ATTEMPTS:
                 user.locked_until = datetime.utcnow() + timedelta(minutes=settings.ACCOUNT_LOCK_MINUTES)
                 db.commit()
+                user_cache.invalidate(user.id)
                 raise AccountLockedException(user.locked_until.isoformat())
             
             db.commit()
@@ -138,6 +135,10 @@ class AuthController:
         if not user.email_verified:
             raise EmailNotVerifiedException()
         
+        # Re-hashear si el hash guardado no sigue la política actual (esquema o costo)
+        if password_needs_rehash(user.hashed_password):
+            user.hashed_password = hash_password(credentials.password)
+        
         # Login exitoso - resetear intentos fallidos
         user.failed_attempts = 0
         user.locked_until = None
@@ -150,18 +151,16 @@ class AuthController:
         
         # Guardar refresh token en la base de datos
         user.refresh_token = refresh_token
-        db.commit()
         
-        # Log de auditoría
-        audit = AuditLog(
+        # Refresh token, reseteo de intentos y log de auditoría en un solo commit
+        commit_with_audit(
+            db,
+            user,
             actor_user_id=user.id,
             action="USER_LOGIN",
             object_type="User",
-            object_id=user.id,
             meta={"email": user.email}
         )
-        db.add(audit)
-        db.commit()
         
         return {
             "access_token": access_token,
@@ -216,17 +215,13 @@ class AuthController:
         
         user.email_verified = True
         user.verification_token = None
-        db.commit()
-        
-        # Log de auditoría
-        audit = AuditLog(
+        commit_with_audit(
+            db,
+            user,
             actor_user_id=user.id,
             action="EMAIL_VERIFIED",
-            object_type="User",
-            object_id=user.id
+            object_type="User"
         )
-        db.add(audit)
-        db.commit()
         
         return True
     
@@ -251,19 +246,10 @@ class AuthController:
             used=False
         )
         db.add(password_reset)
+        # Email de reseteo en el outbox, en la misma transacción que el token
+        enqueue_email(db, user.email, "password_reset", username=user.username, token=reset_token)
         db.commit()
         
-        # Enviar email de reseteo
-        try:
-            EmailService.send_password_reset_email(
-                email=user.email,
-                username=user.username,
-                token=reset_token
-            )
-            print(f"✅ Email de reseteo enviado a {user.email}")
-        except Exception as e:
-            print(f"⚠️ Error enviando email de reseteo: {str(e)}")
-        
         return "Si el email existe, recibirás un link de reseteo"
     
     @staticmethod
@@ -287,17 +273,13 @@ class AuthController:
         
         user.hashed_password = hash_password(new_password)
         reset.used = True
-        db.commit()
-        
-        # Log de auditoría
-        audit = AuditLog(
+        commit_with_audit(
+            db,
+            user,
             actor_user_id=user.id,
             action="PASSWORD_RESET",
-            object_type="User",
-            object_id=user.id
+            object_type="User"
         )
-        db.add(audit)
-        db.commit()
         
         return True
     
@@ -306,16 +288,13 @@ class AuthController:
         """Cierra sesión del usuario (invalida refresh token)"""
         
         user.refresh_token = None
-        db.commit()
-        
-        # Log de auditoría
-        audit = AuditLog(
+        commit_with_audit(
+            db,
+            user,
             actor_user_id=user.id,
             action="USER_LOGOUT",
-            object_type="User",
-            object_id=user.id
+            object_type="User"
         )
-        db.add(audit)
-        db.commit()
+        user_cache.invalidate(user.id)
         
         return True
\ No newline at end of file
@@ -1,11 +1,12 @@
 # ========================================
 # app/controllers/dewormings.py
 # ========================================
-from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from app.models import Deworming, Pet, User, AuditLog
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Deworming, Pet, User
+from app.utils.unit_of_work import commit_with_audit, commit_with_audit_async
 from app.schemas.dewormings import DewormingCreate, DewormingUpdate
 from fastapi import HTTPException, status
 
@@ -31,14 +32,7 @@ class DewormingController:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mascota no encontrada")
         
         new_item = Deworming(**data.model_dump())
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
-        
-        audit = AuditLog(actor_user_id=current_user.id, action="DEWORMING_CREATED", object_type="Deworming", object_id=new_item.id)
-        db.add(audit)
-        db.commit()
-        return new_item
+        return commit_with_audit(db, new_item, actor_user_id=current_user.id, action="DEWORMING_CREATED", object_type="Deworming")
     
     @staticmethod
     def update(db: Session, deworming_id: str, data: DewormingUpdate, current_user: User) -> Deworming:
@@ -46,29 +40,62 @@ class DewormingController:
         update_data = data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(deworming, field, value)
-        deworming.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(deworming)
-        
-        audit = AuditLog(actor_user_id=current_user.id, action="DEWORMING_UPDATED", object_type="Deworming", object_id=deworming.id)
-        db.add(audit)
-        db.commit()
-        return deworming
+        return commit_with_audit(db, deworming, actor_user_id=current_user.id, action="DEWORMING_UPDATED", object_type="Deworming")
     
     @staticmethod
     def delete(db: Session, deworming_id: str, current_user: User) -> bool:
         deworming = DewormingController.get_by_id(db, deworming_id, current_user)
-        audit = AuditLog(actor_user_id=current_user.id, action="DEWORMING_DELETED", object_type="Deworming", object_id=deworming.id)
-        db.add(audit)
-        db.delete(deworming)
-        db.commit()
+        commit_with_audit(db, deworming, actor_user_id=current_user.id, action="DEWORMING_DELETED", object_type="Deworming", delete=True)
+        return True
+
+
+class AsyncDewormingController:
+    """Versión async de DewormingController (AsyncSession + asyncpg)"""
+    
+    @staticmethod
+    async def get_all(db: AsyncSession, current_user: User, pet_id: Optional[str] = None, skip: int = 0, limit: int = 100) -> List[Deworming]:
+        query = select(Deworming).join(Pet).where(Pet.owner_id == current_user.id)
+        if pet_id:
+            query = query.where(Deworming.pet_id == pet_id)
+        result = await db.execute(query.order_by(desc(Deworming.date_administered)).offset(skip).limit(limit))
+        return result.scalars().all()
+    
+    @staticmethod
+    async def get_by_id(db: AsyncSession, deworming_id: str, current_user: User) -> Deworming:
+        result = await db.execute(select(Deworming).join(Pet).where(Deworming.id == deworming_id, Pet.owner_id == current_user.id))
+        deworming = result.scalar_one_or_none()
+        if not deworming:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Desparasitación no encontrada")
+        return deworming
+    
+    @staticmethod
+    async def create(db: AsyncSession, data: DewormingCreate, current_user: User) -> Deworming:
+        pet_id = await db.scalar(select(Pet.id).where(Pet.id == data.pet_id, Pet.owner_id == current_user.id))
+        if not pet_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mascota no encontrada")
+        
+        new_item = Deworming(**data.model_dump())
+        return await commit_with_audit_async(db, new_item, actor_user_id=current_user.id, action="DEWORMING_CREATED", object_type="Deworming")
+    
+    @staticmethod
+    async def update(db: AsyncSession, deworming_id: str, data: DewormingUpdate, current_user: User) -> Deworming:
+        deworming = await AsyncDewormingController.get_by_id(db, deworming_id, current_user)
+        update_data = data.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(deworming, field, value)
+        return await commit_with_audit_async(db, deworming, actor_user_id=current_user.id, action="DEWORMING_UPDATED", object_type="Deworming")
+    
+    @staticmethod
+    async def delete(db: AsyncSession, deworming_id: str, current_user: User) -> bool:
+        deworming = await AsyncDewormingController.get_by_id(db, deworming_id, current_user)
+        await commit_with_audit_async(db, deworming, actor_user_id=current_user.id, action="DEWORMING_DELETED", object_type="Deworming", delete=True)
         return True
 
 
+
 # ========================================
 # app/controllers/vet_visits.py
 # ========================================
-from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
@@ -113,7 +140,6 @@ class VetVisitController:
         update_data = data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(visit, field, value)
-        visit.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(visit)
         
@@ -135,7 +161,6 @@ class VetVisitController:
 # ========================================
 # app/controllers/nutrition_plans.py
 # ========================================
-from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.models import NutritionPlan, Pet, User, AuditLog
@@ -179,7 +204,6 @@ class NutritionPlanController:
         update_data = data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(plan, field, value)
-        plan.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(plan)
         
@@ -201,7 +225,6 @@ class NutritionPlanController:
 # ========================================
 # app/controllers/meals.py
 # ========================================
-from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
@@ -246,7 +269,6 @@ class MealController:
         update_data = data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(meal, field, value)
-        meal.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(meal)
         
@@ -268,7 +290,6 @@ class MealController:
 # ========================================
 # app/controllers/reminders.py
 # ========================================
-from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
@@ -316,7 +337,6 @@ class ReminderController:
         update_data = data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(reminder, field, value)
-        reminder.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(reminder)
         
@@ -338,7 +358,6 @@ class ReminderController:
 # ========================================
 # app/controllers/notifications.py
 # ========================================
-from datetime import datetime
 from typing import List
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
@@ -372,7 +391,6 @@ class NotificationController:
         update_data = data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(notif, field, value)
-        notif.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(notif)
         return notif
@@ -388,7 +406,6 @@ class NotificationController:
 # ========================================
 # app/controllers/pet_photos.py
 # ========================================
-from datetime import datetime
 from typing import List
 from sqlalchemy.orm import Session
 from app.models import PetPhoto, Pet, User, AuditLog
@@ -434,7 +451,6 @@ class PetPhotoController:
         update_data = data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(photo, field, value)
-        photo.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(photo)
         return photo
@@ -446,4 +462,4 @@ class PetPhotoController:
         db.add(audit)
         db.delete(photo)
         db.commit()
-        return True
\ No newline at end of file
+        return True
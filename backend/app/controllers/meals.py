@@ -1,21 +1,25 @@
 # ========================================
 # app/controllers/meals.py
 # ========================================
-from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from app.models import Meal, Pet, User, AuditLog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Meal, Pet, User
+from app.utils.unit_of_work import commit_with_audit, commit_with_audit_async
+from app.utils.pagination import Keyset
 from app.schemas.meals import MealCreate, MealUpdate
 from fastapi import HTTPException, status
 
+MEAL_KEYSET = Keyset("meals", Meal.meal_time, Meal.id)
+
 class MealController:
     @staticmethod
-    def get_all(db: Session, current_user: User, pet_id: Optional[str] = None, skip: int = 0, limit: int = 100) -> List[Meal]:
+    def get_all(db: Session, current_user: User, pet_id: Optional[str] = None, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Meal]:
         query = db.query(Meal).join(Pet).filter(Pet.owner_id == current_user.id)
         if pet_id:
             query = query.filter(Meal.pet_id == pet_id)
-        return query.order_by(desc(Meal.meal_time)).offset(skip).limit(limit).all()
+        return MEAL_KEYSET.paginate(query, cursor, skip, limit).all()
     
     @staticmethod
     def get_by_id(db: Session, meal_id: str, current_user: User) -> Meal:
@@ -31,14 +35,7 @@ class MealController:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mascota no encontrada")
         
         new_item = Meal(**data.model_dump())
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
-        
-        audit = AuditLog(actor_user_id=current_user.id, action="MEAL_CREATED", object_type="Meal", object_id=new_item.id)
-        db.add(audit)
-        db.commit()
-        return new_item
+        return commit_with_audit(db, new_item, actor_user_id=current_user.id, action="MEAL_CREATED", object_type="Meal")
     
     @staticmethod
     def update(db: Session, meal_id: str, data: MealUpdate, current_user: User) -> Meal:
@@ -46,22 +43,53 @@ class MealController:
         update_data = data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(meal, field, value)
-        meal.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(meal)
-        
-        audit = AuditLog(actor_user_id=current_user.id, action="MEAL_UPDATED", object_type="Meal", object_id=meal.id)
-        db.add(audit)
-        db.commit()
-        return meal
+        return commit_with_audit(db, meal, actor_user_id=current_user.id, action="MEAL_UPDATED", object_type="Meal")
     
     @staticmethod
     def delete(db: Session, meal_id: str, current_user: User) -> bool:
         meal = MealController.get_by_id(db, meal_id, current_user)
-        audit = AuditLog(actor_user_id=current_user.id, action="MEAL_DELETED", object_type="Meal", object_id=meal.id)
-        db.add(audit)
-        db.delete(meal)
-        db.commit()
+        commit_with_audit(db, meal, actor_user_id=current_user.id, action="MEAL_DELETED", object_type="Meal", delete=True)
         return True
 
 
+class AsyncMealController:
+    """Versión async de MealController (AsyncSession + asyncpg)"""
+    
+    @staticmethod
+    async def get_all(db: AsyncSession, current_user: User, pet_id: Optional[str] = None, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Meal]:
+        query = select(Meal).join(Pet).where(Pet.owner_id == current_user.id)
+        if pet_id:
+            query = query.where(Meal.pet_id == pet_id)
+        result = await db.execute(MEAL_KEYSET.paginate(query, cursor, skip, limit))
+        return result.scalars().all()
+    
+    @staticmethod
+    async def get_by_id(db: AsyncSession, meal_id: str, current_user: User) -> Meal:
+        result = await db.execute(select(Meal).join(Pet).where(Meal.id == meal_id, Pet.owner_id == current_user.id))
+        meal = result.scalar_one_or_none()
+        if not meal:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comida no encontrada")
+        return meal
+    
+    @staticmethod
+    async def create(db: AsyncSession, data: MealCreate, current_user: User) -> Meal:
+        pet_id = await db.scalar(select(Pet.id).where(Pet.id == data.pet_id, Pet.owner_id == current_user.id))
+        if not pet_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mascota no encontrada")
+        
+        new_item = Meal(**data.model_dump())
+        return await commit_with_audit_async(db, new_item, actor_user_id=current_user.id, action="MEAL_CREATED", object_type="Meal")
+    
+    @staticmethod
+    async def update(db: AsyncSession, meal_id: str, data: MealUpdate, current_user: User) -> Meal:
+        meal = await AsyncMealController.get_by_id(db, meal_id, current_user)
+        update_data = data.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(meal, field, value)
+        return await commit_with_audit_async(db, meal, actor_user_id=current_user.id, action="MEAL_UPDATED", object_type="Meal")
+    
+    @staticmethod
+    async def delete(db: AsyncSession, meal_id: str, current_user: User) -> bool:
+        meal = await AsyncMealController.get_by_id(db, meal_id, current_user)
+        await commit_with_audit_async(db, meal, actor_user_id=current_user.id, action="MEAL_DELETED", object_type="Meal", delete=True)
+        return True
@@ -1,18 +1,22 @@
 # ========================================
 # app/controllers/notifications.py
 # ========================================
-from datetime import datetime
-from typing import List
+from typing import List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from app.models import Notification, User, AuditLog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Notification, User
+from app.utils.pagination import Keyset
 from app.schemas.notifications import NotificationCreate, NotificationUpdate
 from fastapi import HTTPException, status
 
+NOTIFICATION_KEYSET = Keyset("notifications", Notification.sent_at, Notification.id)
+
 class NotificationController:
     @staticmethod
-    def get_all(db: Session, current_user: User, skip: int = 0, limit: int = 100) -> List[Notification]:
-        return db.query(Notification).filter(Notification.owner_id == current_user.id).order_by(desc(Notification.sent_at)).offset(skip).limit(limit).all()
+    def get_all(db: Session, current_user: User, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Notification]:
+        query = db.query(Notification).filter(Notification.owner_id == current_user.id)
+        return NOTIFICATION_KEYSET.paginate(query, cursor, skip, limit).all()
     
     @staticmethod
     def get_by_id(db: Session, notification_id: str, current_user: User) -> Notification:
@@ -26,7 +30,6 @@ class NotificationController:
         new_item = Notification(**data.model_dump())
         db.add(new_item)
         db.commit()
-        db.refresh(new_item)
         return new_item
     
     @staticmethod
@@ -35,9 +38,7 @@ class NotificationController:
         update_data = data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(notif, field, value)
-        notif.updated_at = datetime.utcnow()
         db.commit()
-        db.refresh(notif)
         return notif
     
     @staticmethod
@@ -48,3 +49,42 @@ class NotificationController:
         return True
 
 
+class AsyncNotificationController:
+    """Versión async de NotificationController (AsyncSession + asyncpg)"""
+    
+    @staticmethod
+    async def get_all(db: AsyncSession, current_user: User, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Notification]:
+        query = select(Notification).where(Notification.owner_id == current_user.id)
+        result = await db.execute(NOTIFICATION_KEYSET.paginate(query, cursor, skip, limit))
+        return result.scalars().all()
+    
+    @staticmethod
+    async def get_by_id(db: AsyncSession, notification_id: str, current_user: User) -> Notification:
+        result = await db.execute(select(Notification).where(Notification.id == notification_id, Notification.owner_id == current_user.id))
+        notif = result.scalar_one_or_none()
+        if not notif:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notificación no encontrada")
+        return notif
+    
+    @staticmethod
+    async def create(db: AsyncSession, data: NotificationCreate, current_user: User) -> Notification:
+        new_item = Notification(**data.model_dump())
+        db.add(new_item)
+        await db.commit()
+        return new_item
+    
+    @staticmethod
+    async def update(db: AsyncSession, notification_id: str, data: NotificationUpdate, current_user: User) -> Notification:
+        notif = await AsyncNotificationController.get_by_id(db, notification_id, current_user)
+        update_data = data.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(notif, field, value)
+        await db.commit()
+        return notif
+    
+    @staticmethod
+    async def delete(db: AsyncSession, notification_id: str, current_user: User) -> bool:
+        notif = await AsyncNotificationController.get_by_id(db, notification_id, current_user)
+        await db.delete(notif)
+        await db.commit()
+        return True
@@ -1,11 +1,11 @@
 # ========================================
 # app/controllers/nutrition_plans.py
 # ========================================
-from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, func
-from app.models import NutritionPlan, Pet, User, AuditLog, Meal
+from app.models import NutritionPlan, Pet, User, Meal
+from app.utils.unit_of_work import commit_with_audit
 from app.schemas.nutrition_plans import NutritionPlanCreate, NutritionPlanUpdate
 from fastapi import HTTPException, status
 
@@ -101,26 +101,20 @@ class NutritionPlanController:
         
         # Crear plan
         new_plan = NutritionPlan(**data.model_dump())
-        db.add(new_plan)
-        db.commit()
-        db.refresh(new_plan)
         
-        # Log de auditoría
-        audit = AuditLog(
+        # Plan y log de auditoría en una sola transacción
+        return commit_with_audit(
+            db,
+            new_plan,
             actor_user_id=current_user.id,
             action="NUTRITION_PLAN_CREATED",
             object_type="NutritionPlan",
-            object_id=new_plan.id,
             meta={
                 "plan_name": new_plan.name,
                 "pet_id": str(new_plan.pet_id),
                 "calories_per_day": new_plan.calories_per_day
             }
         )
-        db.add(audit)
-        db.commit()
-        
-        return new_plan
     
     @staticmethod
     def update(
@@ -154,23 +148,18 @@ class NutritionPlanController:
                 setattr(plan, field, value)
         
         if modified_fields:
-            plan.updated_at = datetime.utcnow()
-            db.commit()
-            db.refresh(plan)
-            
-            # Log de auditoría
-            audit = AuditLog(
+            # Cambios y log de auditoría en una sola transacción
+            commit_with_audit(
+                db,
+                plan,
                 actor_user_id=current_user.id,
                 action="NUTRITION_PLAN_UPDATED",
                 object_type="NutritionPlan",
-                object_id=plan.id,
                 meta={
                     "updated_fields": modified_fields,
                     "plan_name": plan.name
                 }
             )
-            db.add(audit)
-            db.commit()
         
         return plan
     
@@ -199,19 +188,16 @@ class NutritionPlanController:
             "calories_per_day": plan.calories_per_day
         }
         
-        # Log de auditoría antes de eliminar
-        audit = AuditLog(
+        # Eliminar plan y registrar auditoría en la misma transacción
+        commit_with_audit(
+            db,
+            plan,
             actor_user_id=current_user.id,
             action="NUTRITION_PLAN_DELETED",
             object_type="NutritionPlan",
-            object_id=plan.id,
-            meta=plan_info
+            meta=plan_info,
+            delete=True
         )
-        db.add(audit)
-        
-        # Eliminar plan
-        db.delete(plan)
-        db.commit()
         
         return True
     
@@ -335,23 +321,15 @@ class NutritionPlanController:
             calories_per_day=original_plan.calories_per_day
         )
         
-        db.add(new_plan)
-        db.commit()
-        db.refresh(new_plan)
-        
-        # Log de auditoría
-        audit = AuditLog(
+        return commit_with_audit(
+            db,
+            new_plan,
             actor_user_id=current_user.id,
             action="NUTRITION_PLAN_DUPLICATED",
             object_type="NutritionPlan",
-            object_id=new_plan.id,
             meta={
                 "original_plan_id": str(original_plan.id),
                 "new_plan_name": new_plan.name,
                 "pet_id": str(target_pet_id)
             }
-        )
-        db.add(audit)
-        db.commit()
-        
-        return new_plan
\ No newline at end of file
+        )
\ No newline at end of file
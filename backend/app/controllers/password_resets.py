@@ -3,19 +3,24 @@
 # ========================================
 from datetime import datetime, timedelta
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import desc, func, and_
-from app.models import PasswordReset, User, AuditLog
+from app.models import PasswordReset, User
 from app.schemas.password_resets import (
     PasswordResetCreate,
     PasswordResetUpdate,
     PasswordResetStats
 )
 from app.utils.security import generate_password_reset_token, hash_password
-from app.services.email_service import EmailService
+from app.services.email_outbox import enqueue as enqueue_email
+from app.utils.unit_of_work import commit_with_audit
 from app.config import settings
 from fastapi import HTTPException, status
 
+# Usuario de PasswordResetWithUser: solo email y username (más el id)
+USER_IN_LIST = selectinload(PasswordReset.user).load_only(User.email, User.username)
+USER_IN_DETAIL = joinedload(PasswordReset.user).load_only(User.email, User.username)
+
 class PasswordResetController:
     """Controlador para operaciones de password reset"""
     
@@ -26,7 +31,8 @@ class PasswordResetController:
         user_id: Optional[str] = None,
         is_used: Optional[bool] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        with_user: bool = False
     ) -> List[PasswordReset]:
         """
         Obtiene todos los password resets (solo admin)
@@ -38,6 +44,7 @@ class PasswordResetController:
             is_used: Filtrar por tokens usados/no usados
             skip: Registros a omitir
             limit: Máximo de registros
+            with_user: Cargar el usuario de cada reset (una consulta más por página)
         
         Returns:
             Lista de password resets
@@ -50,6 +57,8 @@ class PasswordResetController:
             )
         
         query = db.query(PasswordReset)
+        if with_user:
+            query = query.options(USER_IN_LIST)
         
         if user_id:
             query = query.filter(PasswordReset.user_id == user_id)
@@ -78,7 +87,7 @@ class PasswordResetController:
                 detail="No tienes permiso para ver este reset"
             )
         
-        reset = db.query(PasswordReset).filter(PasswordReset.id == reset_id).first()
+        reset = db.query(PasswordReset).options(USER_IN_DETAIL).filter(PasswordReset.id == reset_id).first()
         
         if not reset:
             raise HTTPException(
@@ -136,31 +145,16 @@ class PasswordResetController:
             expires_at=expires_at,
             used=False
         )
-        db.add(password_reset)
-        db.commit()
-        db.refresh(password_reset)
-        
-        # Log de auditoría
-        audit = AuditLog(
+        # Token, email de reseteo (outbox) y log de auditoría en una sola transacción
+        enqueue_email(db, user.email, "password_reset", username=user.username, token=reset_token)
+        commit_with_audit(
+            db,
+            password_reset,
             actor_user_id=user.id,
             action="PASSWORD_RESET_REQUESTED",
             object_type="PasswordReset",
-            object_id=password_reset.id,
             meta={"email": user.email}
         )
-        db.add(audit)
-        db.commit()
-        
-        # Enviar email de reseteo
-        try:
-            EmailService.send_password_reset_email(
-                email=user.email,
-                username=user.username,
-                token=reset_token
-            )
-            print(f"✅ Email de reseteo enviado a {user.email}")
-        except Exception as e:
-            print(f"⚠️ Error enviando email de reseteo: {str(e)}")
         
         return {
             "message": "Si el email existe, recibirás un link de reseteo",
@@ -205,27 +199,22 @@ class PasswordResetController:
         
         # Actualizar contraseña
         user.hashed_password = hash_password(new_password)
-        user.updated_at = datetime.utcnow()
         
         # Marcar token como usado
         reset.used = True
-        reset.updated_at = datetime.utcnow()
         
         # Invalidar refresh token por seguridad
         user.refresh_token = None
         
-        db.commit()
-        
-        # Log de auditoría
-        audit = AuditLog(
+        # Usuario, token y log de auditoría en un solo commit
+        commit_with_audit(
+            db,
+            reset,
             actor_user_id=user.id,
             action="PASSWORD_RESET_COMPLETED",
             object_type="PasswordReset",
-            object_id=reset.id,
             meta={"email": user.email}
         )
-        db.add(audit)
-        db.commit()
         
         return {
             "message": "Contraseña actualizada exitosamente",
@@ -324,17 +313,13 @@ class PasswordResetController:
             PasswordReset.expires_at < datetime.utcnow()
         ).delete()
         
-        db.commit()
-        
-        # Log de auditoría
-        audit = AuditLog(
+        commit_with_audit(
+            db,
             actor_user_id=current_user.id,
             action="PASSWORD_RESETS_CLEANED",
             object_type="PasswordReset",
             meta={"deleted_count": deleted_count}
         )
-        db.add(audit)
-        db.commit()
         
         return deleted_count
     
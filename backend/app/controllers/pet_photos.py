@@ -1,12 +1,16 @@
 # ========================================
 # app/controllers/pet_photos.py
 # ========================================
-from datetime import datetime
-from typing import List
+from typing import Callable, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from app.models import PetPhoto, Pet, User, AuditLog
+from app.models import ImageVariant, PetPhoto, Pet, User
+from app.config import settings
+from app.services.blob_store import blob_store, guess_image_type, lock_digest, BlobTooLargeError
+from app.services.image_variants import image_variants
+from app.utils.unit_of_work import commit_with_audit
+from app.utils.exceptions import PayloadTooLargeException
 from app.schemas.pet_photos import PetPhotoCreate, PetPhotoUpdate
-from fastapi import HTTPException, status
+from fastapi import HTTPException, UploadFile, status
 
 class PetPhotoController:
     @staticmethod
@@ -23,6 +27,22 @@ class PetPhotoController:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Foto no encontrada")
         return photo
     
+    @staticmethod
+    def get_content(db: Session, photo_id: str, current_user: User) -> Tuple[PetPhoto, Optional[bytes]]:
+        """
+        Foto a descargar y su binario legado
+
+        Si está en el blob store basta con el digest (binario None); si todavía
+        no fue migrada se carga PetPhoto.data (deferred) para servirlo desde memoria
+        """
+        photo = PetPhotoController.get_by_id(db, photo_id, current_user)
+        if photo.sha256 and blob_store.exists(photo.sha256):
+            return photo, None
+        legacy_data = db.query(PetPhoto.data).filter(PetPhoto.id == photo.id).scalar()
+        if legacy_data is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Foto no encontrada")
+        return photo, legacy_data
+    
     @staticmethod
     def create(db: Session, data: PetPhotoCreate, current_user: User) -> PetPhoto:
         pet = db.query(Pet).filter(Pet.id == data.pet_id, Pet.owner_id == current_user.id).first()
@@ -31,32 +51,121 @@ class PetPhotoController:
         
         new_item = PetPhoto(**data.model_dump(exclude={'data'}))
         if data.data:
-            new_item.data = data.data
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
+            # Compatibilidad: el binario en JSON va al blob store, no a la base
+            new_item.sha256, new_item.file_size_bytes = blob_store.save_bytes(data.data)
+            new_item.mime_type = new_item.mime_type or guess_image_type(data.data[:16])
+        PetPhotoController._commit_photo(db, new_item, current_user, lambda: blob_store.save_bytes(data.data))
+        image_variants.schedule(new_item.sha256)
+        return new_item
+    
+    @staticmethod
+    def upload(db: Session, pet_id: str, file: UploadFile, current_user: User) -> PetPhoto:
+        """
+        Sube una foto (multipart) al blob store leyendo por bloques
+
+        Raises:
+            PayloadTooLargeException: Si supera BLOB_MAX_UPLOAD_MB
+        """
+        pet = db.query(Pet).filter(Pet.id == pet_id, Pet.owner_id == current_user.id).first()
+        if not pet:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mascota no encontrada")
         
-        audit = AuditLog(actor_user_id=current_user.id, action="PET_PHOTO_CREATED", object_type="PetPhoto", object_id=new_item.id)
-        db.add(audit)
-        db.commit()
+        head = file.file.read(16)
+        file.file.seek(0)
+        try:
+            digest, size = blob_store.save_file(file.file, max_bytes=settings.BLOB_MAX_UPLOAD_MB * 1024 * 1024)
+        except BlobTooLargeError:
+            raise PayloadTooLargeException(settings.BLOB_MAX_UPLOAD_MB)
+        
+        new_item = PetPhoto(
+            pet_id=pet.id,
+            file_name=file.filename,
+            file_size_bytes=size,
+            mime_type=guess_image_type(head) or file.content_type,
+            sha256=digest
+        )
+        
+        def rewrite():
+            file.file.seek(0)
+            blob_store.save_file(file.file)
+        
+        PetPhotoController._commit_photo(db, new_item, current_user, rewrite)
+        image_variants.schedule(digest)
         return new_item
     
+    @staticmethod
+    def _commit_photo(db: Session, photo: PetPhoto, current_user: User, rewrite: Callable[[], object]) -> None:
+        """
+        Confirma una foto nueva bajo el lock de su digest
+
+        Entre el guardado en el store y este commit otro request pudo borrar
+        el blob (si era un duplicado sin referencias): con el lock tomado se
+        revisa y, si falta, se vuelve a escribir con `rewrite`. Si el commit
+        falla, el blob se libera (se borra si nadie más lo referencia).
+        """
+        try:
+            if photo.sha256:
+                lock_digest(db, photo.sha256)
+                if not blob_store.exists(photo.sha256):
+                    rewrite()
+            commit_with_audit(db, photo, actor_user_id=current_user.id, action="PET_PHOTO_CREATED", object_type="PetPhoto")
+        except Exception:
+            db.rollback()
+            try:
+                PetPhotoController.release_blob(db, photo.sha256)
+            except Exception as e:
+                print(f"⚠️ No se pudo liberar el blob {photo.sha256}: {str(e)}")
+            raise
+    
+    @staticmethod
+    def _blob_in_use(db: Session, digest: str) -> bool:
+        return bool(
+            db.query(PetPhoto.id).filter(PetPhoto.sha256 == digest).first() or
+            db.query(Pet.id).filter(Pet.photo_sha256 == digest).first() or
+            db.query(ImageVariant.id).filter(ImageVariant.sha256 == digest).first()
+        )
+    
+    @staticmethod
+    def release_blob(db: Session, digest: Optional[str]) -> None:
+        """
+        Borra el blob del store si ninguna foto ni mascota lo sigue referenciando (dedup),
+        junto con sus variantes redimensionadas
+
+        El conteo de referencias y el borrado ocurren bajo el lock del digest,
+        en la misma transacción: un upload que deduplica sobre este blob espera
+        y, si el blob ya no está, lo vuelve a escribir (ver _commit_photo)
+        """
+        if not digest:
+            return
+        try:
+            lock_digest(db, digest)
+            if PetPhotoController._blob_in_use(db, digest):
+                db.rollback()
+                return
+            variant_digests = [row.sha256 for row in db.query(ImageVariant.sha256).filter(ImageVariant.source_sha256 == digest)]
+            if variant_digests:
+                db.query(ImageVariant).filter(ImageVariant.source_sha256 == digest).delete(synchronize_session=False)
+            blob_store.delete(digest)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        for variant_digest in variant_digests:
+            PetPhotoController.release_blob(db, variant_digest)
+    
     @staticmethod
     def update(db: Session, photo_id: str, data: PetPhotoUpdate, current_user: User) -> PetPhoto:
         photo = PetPhotoController.get_by_id(db, photo_id, current_user)
         update_data = data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(photo, field, value)
-        photo.updated_at = datetime.utcnow()
         db.commit()
-        db.refresh(photo)
         return photo
     
     @staticmethod
     def delete(db: Session, photo_id: str, current_user: User) -> bool:
         photo = PetPhotoController.get_by_id(db, photo_id, current_user)
-        audit = AuditLog(actor_user_id=current_user.id, action="PET_PHOTO_DELETED", object_type="PetPhoto", object_id=photo.id)
-        db.add(audit)
-        db.delete(photo)
-        db.commit()
+        digest = photo.sha256
+        commit_with_audit(db, photo, actor_user_id=current_user.id, action="PET_PHOTO_DELETED", object_type="PetPhoto", delete=True)
+        PetPhotoController.release_blob(db, digest)
         return True
\ No newline at end of file
@@ -1,12 +1,21 @@
-from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
-from app.models import Pet, User, AuditLog
+from app.models import Pet, PetPhoto, User
+from app.controllers.pet_photos import PetPhotoController
+from app.services.blob_store import blob_store
+from app.services.pet_stats import get_pets_with_stats
+from app.services.pet_dashboard import get_dashboard, get_health_summaries
+from app.services.pet_attention import DEFAULT_HORIZON_DAYS, get_pets_needing_attention
+from app.services.search import pet_match, pet_rank
+from app.utils.unit_of_work import commit_with_audit
+from app.utils.pagination import Keyset
 from app.schemas.pets import PetCreate, PetUpdate
 from app.utils.exceptions import UserNotFoundException
 from fastapi import HTTPException, status
 
+PET_KEYSET = Keyset("pets", Pet.created_at, Pet.id)
+
 class PetController:
     """Controlador para operaciones con mascotas"""
     
@@ -16,7 +25,8 @@ class PetController:
         current_user: User,
         skip: int = 0,
         limit: int = 100,
-        species: Optional[str] = None
+        species: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[Pet]:
         """
         Obtiene todas las mascotas del usuario actual con filtros
@@ -27,6 +37,7 @@ class PetController:
             skip: Número de registros a omitir
             limit: Número máximo de registros
             species: Filtrar por especie (opcional)
+            cursor: Cursor de la página anterior (keyset, reemplaza a skip)
         
         Returns:
             List[Pet]: Lista de mascotas
@@ -37,7 +48,7 @@ class PetController:
         if species:
             query = query.filter(Pet.species.ilike(f"%{species}%"))
         
-        return query.order_by(desc(Pet.created_at)).offset(skip).limit(limit).all()
+        return PET_KEYSET.paginate(query, cursor, skip, limit).all()
     
     @staticmethod
     def get_pet_by_id(db: Session, pet_id: str, current_user: User) -> Pet:
@@ -95,26 +106,19 @@ class PetController:
             notes=pet_data.notes
         )
         
-        db.add(new_pet)
-        db.commit()
-        db.refresh(new_pet)
-        
-        # Log de auditoría
-        audit = AuditLog(
+        # Mascota y log de auditoría en una sola transacción
+        return commit_with_audit(
+            db,
+            new_pet,
             actor_user_id=current_user.id,
             action="PET_CREATED",
             object_type="Pet",
-            object_id=new_pet.id,
             meta={
                 "name": new_pet.name,
                 "species": new_pet.species,
                 "breed": new_pet.breed
             }
         )
-        db.add(audit)
-        db.commit()
-        
-        return new_pet
     
     @staticmethod
     def update_pet(
@@ -151,25 +155,20 @@ class PetController:
                 modified_fields.append(field)
                 setattr(pet, field, value)
         
-        # Solo actualizar updated_at si hubo cambios
+        # Solo guardar si hubo cambios (el trigger actualiza updated_at)
         if modified_fields:
-            pet.updated_at = datetime.utcnow()
-            db.commit()
-            db.refresh(pet)
-            
-            # Log de auditoría
-            audit = AuditLog(
+            # Cambios y log de auditoría en una sola transacción
+            commit_with_audit(
+                db,
+                pet,
                 actor_user_id=current_user.id,
                 action="PET_UPDATED",
                 object_type="Pet",
-                object_id=pet.id,
                 meta={
                     "updated_fields": modified_fields,
                     "pet_name": pet.name
                 }
             )
-            db.add(audit)
-            db.commit()
         
         return pet
     
@@ -209,22 +208,110 @@ class PetController:
             "age_years": pet.age_years
         }
         
-        # Log de auditoría ANTES de eliminar
-        audit = AuditLog(
+        # Blobs de la mascota y sus fotos, para liberarlos del store tras el borrado
+        digests = {digest for (digest,) in db.query(PetPhoto.sha256).filter(
+            PetPhoto.pet_id == pet.id,
+            PetPhoto.sha256.isnot(None)
+        )}
+        if pet.photo_sha256:
+            digests.add(pet.photo_sha256)
+        
+        # Eliminar mascota (cascade eliminará registros relacionados)
+        # y registrar auditoría en la misma transacción
+        commit_with_audit(
+            db,
+            pet,
             actor_user_id=current_user.id,
             action="PET_DELETED",
             object_type="Pet",
-            object_id=pet.id,
-            meta=pet_info
+            meta=pet_info,
+            delete=True
         )
-        db.add(audit)
         
-        # Eliminar mascota (cascade eliminará registros relacionados)
-        db.delete(pet)
-        db.commit()
+        for digest in digests:
+            PetPhotoController.release_blob(db, digest)
         
         return True
     
+    @staticmethod
+    def get_pets_with_stats(
+        db: Session,
+        current_user: User,
+        pet_ids: Optional[List[str]] = None
+    ) -> List[Tuple[Pet, Dict[str, int]]]:
+        """
+        Mascotas del usuario con sus contadores, en una sola consulta
+        
+        Args:
+            db: Sesión de base de datos
+            current_user: Usuario autenticado
+            pet_ids: Mascotas a incluir (None = todas); las ajenas se ignoran
+        
+        Returns:
+            Lista de (mascota, contadores)
+        """
+        return get_pets_with_stats(db, current_user.id, pet_ids)
+    
+    @staticmethod
+    def get_pet_with_stats(db: Session, pet_id: str, current_user: User) -> Tuple[Pet, Dict[str, int]]:
+        """
+        Una mascota con sus contadores (misma consulta que get_pets_with_stats)
+        
+        Raises:
+            HTTPException: Si la mascota no se encuentra
+        """
+        rows = get_pets_with_stats(db, current_user.id, [pet_id])
+        if not rows:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Mascota no encontrada o no tienes permiso para acceder a ella"
+            )
+        return rows[0]
+    
+    @staticmethod
+    def get_dashboard(db: Session, current_user: User) -> List[dict]:
+        """
+        Dashboard de todas las mascotas del usuario (número fijo de consultas)
+        
+        Returns:
+            Lista de {"pet", "stats", "health_summary"}
+        """
+        return get_dashboard(db, current_user.id)
+    
+    @staticmethod
+    def get_health_summary(db: Session, pet_id: str, current_user: User) -> Tuple[Pet, dict]:
+        """
+        Resumen de salud de una mascota
+        
+        Raises:
+            HTTPException: Si la mascota no se encuentra
+        """
+        pet = PetController.get_pet_by_id(db, pet_id, current_user)
+        summaries = get_health_summaries(db, current_user.id, [pet.id])
+        return pet, summaries[str(pet.id)]
+    
+    @staticmethod
+    def get_pet_photo(db: Session, pet_id: str, current_user: User) -> Tuple[Pet, Optional[bytes]]:
+        """
+        Foto principal de la mascota y su binario legado
+
+        Si está en el blob store basta con el digest (binario None); si todavía
+        no fue migrada se carga Pet.photo_bytea (deferred)
+        
+        Raises:
+            HTTPException: Si la mascota no existe o no tiene foto
+        """
+        pet = PetController.get_pet_by_id(db, pet_id, current_user)
+        if pet.photo_sha256 and blob_store.exists(pet.photo_sha256):
+            return pet, None
+        legacy_data = db.query(Pet.photo_bytea).filter(Pet.id == pet.id).scalar()
+        if legacy_data is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="La mascota no tiene foto"
+            )
+        return pet, legacy_data
+    
     @staticmethod
     def get_pet_count(db: Session, current_user: User) -> int:
         """
@@ -273,7 +360,8 @@ class PetController:
         limit: int = 100
     ) -> List[Pet]:
         """
-        Busca mascotas por nombre, especie o raza
+        Busca mascotas por nombre, especie, raza o notas
+        (full-text por prefijos + similitud del nombre, ordenado por relevancia)
         
         Args:
             db: Sesión de base de datos
@@ -285,101 +373,64 @@ class PetController:
         Returns:
             List[Pet]: Lista de mascotas que coinciden
         """
-        from sqlalchemy import or_
-        
-        search_filter = f"%{search_term}%"
-        
         return db.query(Pet).filter(
             Pet.owner_id == current_user.id,
-            or_(
-                Pet.name.ilike(search_filter),
-                Pet.species.ilike(search_filter),
-                Pet.breed.ilike(search_filter)
-            )
-        ).order_by(desc(Pet.created_at)).offset(skip).limit(limit).all()
+            pet_match(search_term)
+        ).order_by(desc(pet_rank(search_term)), desc(Pet.created_at)).offset(skip).limit(limit).all()
     
     @staticmethod
-    def get_pets_needing_attention(db: Session, current_user: User) -> dict:
+    def get_pets_needing_attention(
+        db: Session,
+        current_user: User,
+        vaccine_days: int = DEFAULT_HORIZON_DAYS,
+        deworming_days: int = DEFAULT_HORIZON_DAYS,
+        follow_up_days: int = DEFAULT_HORIZON_DAYS
+    ) -> dict:
         """
         Obtiene mascotas que necesitan atención
-        (vacunas vencidas, visitas pendientes, etc.)
+        (vacunas y desparasitaciones vencidas o próximas, controles veterinarios pendientes)
         
         Args:
             db: Sesión de base de datos
             current_user: Usuario autenticado
+            vaccine_days: Horizonte en días para vacunas próximas
+            deworming_days: Horizonte en días para desparasitaciones próximas
+            follow_up_days: Horizonte en días para controles veterinarios próximos
         
         Returns:
-            dict: Información sobre mascotas que necesitan atención
+            dict: Pendientes por mascota ("pets") y las listas por tipo de pendiente
         """
-        from app.models import Vaccination, Deworming
-        from datetime import date, timedelta
-        from sqlalchemy import and_
-        
-        today = date.today()
-        next_week = today + timedelta(days=7)
-        
-        # Mascotas con vacunas vencidas
-        pets_with_overdue_vaccines = db.query(Pet).join(
-            Vaccination,
-            and_(
-                Vaccination.pet_id == Pet.id,
-                Vaccination.next_due < today,
-                Vaccination.next_due.isnot(None)
-            )
-        ).filter(
-            Pet.owner_id == current_user.id
-        ).distinct().all()
-        
-        # Mascotas con vacunas próximas (próxima semana)
-        pets_with_upcoming_vaccines = db.query(Pet).join(
-            Vaccination,
-            and_(
-                Vaccination.pet_id == Pet.id,
-                Vaccination.next_due >= today,
-                Vaccination.next_due <= next_week,
-                Vaccination.next_due.isnot(None)
-            )
-        ).filter(
-            Pet.owner_id == current_user.id
-        ).distinct().all()
-        
-        # Mascotas con desparasitaciones vencidas
-        pets_with_overdue_deworming = db.query(Pet).join(
-            Deworming,
-            and_(
-                Deworming.pet_id == Pet.id,
-                Deworming.next_due < today,
-                Deworming.next_due.isnot(None)
-            )
-        ).filter(
-            Pet.owner_id == current_user.id
-        ).distinct().all()
+        pets = get_pets_needing_attention(
+            db,
+            current_user.id,
+            vaccine_days=vaccine_days,
+            deworming_days=deworming_days,
+            follow_up_days=follow_up_days
+        )
         
-        return {
-            "overdue_vaccines": [
+        def with_flag(flag: str) -> List[dict]:
+            return [
                 {
-                    "pet_id": str(pet.id),
-                    "pet_name": pet.name,
-                    "species": pet.species
+                    "pet_id": pet["pet_id"],
+                    "pet_name": pet["pet_name"],
+                    "species": pet["species"]
                 }
-                for pet in pets_with_overdue_vaccines
-            ],
-            "upcoming_vaccines": [
-                {
-                    "pet_id": str(pet.id),
-                    "pet_name": pet.name,
-                    "species": pet.species
-                }
-                for pet in pets_with_upcoming_vaccines
-            ],
-            "overdue_deworming": [
-                {
-                    "pet_id": str(pet.id),
-                    "pet_name": pet.name,
-                    "species": pet.species
-                }
-                for pet in pets_with_overdue_deworming
+                for pet in pets if pet[flag]
             ]
+        
+        return {
+            "horizons": {
+                "vaccine_days": vaccine_days,
+                "deworming_days": deworming_days,
+                "follow_up_days": follow_up_days
+            },
+            "pets": pets,
+            "overdue_vaccines": with_flag("vaccine_overdue"),
+            "upcoming_vaccines": with_flag("vaccine_upcoming"),
+            "overdue_deworming": with_flag("deworming_overdue"),
+            "upcoming_deworming": with_flag("deworming_upcoming"),
+            "overdue_follow_ups": with_flag("follow_up_overdue"),
+            "upcoming_follow_ups": with_flag("follow_up_upcoming")
         }
     
     @staticmethod
@@ -409,14 +460,12 @@ class PetController:
             synchronize_session=False
         )
         
-        db.commit()
-        
-        # Log de auditoría
-        audit = AuditLog(
+        # UPDATE masivo y log de auditoría en una sola transacción
+        commit_with_audit(
+            db,
             actor_user_id=current_user.id,
             action="PETS_BULK_UPDATED",
             object_type="Pet",
-            object_id=None,
             meta={
                 "action": "species_update",
                 "old_species": old_species,
@@ -424,7 +473,5 @@ class PetController:
                 "count": updated_count
             }
         )
-        db.add(audit)
-        db.commit()
         
         return updated_count
\ No newline at end of file
@@ -1,11 +1,13 @@
 # ========================================
 # app/controllers/reminders.py
 # ========================================
-from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from app.models import Reminder, Pet, User, AuditLog
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Reminder, Pet, User
+from app.utils.unit_of_work import commit_with_audit, commit_with_audit_async
+from app.services.reminder_scheduler import SCHEDULE_FIELDS, schedule
 from app.schemas.reminders import ReminderCreate, ReminderUpdate
 from fastapi import HTTPException, status
 
@@ -34,14 +36,8 @@ class ReminderController:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mascota no encontrada")
         
         new_item = Reminder(owner_id=current_user.id, **data.model_dump())
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
-        
-        audit = AuditLog(actor_user_id=current_user.id, action="REMINDER_CREATED", object_type="Reminder", object_id=new_item.id)
-        db.add(audit)
-        db.commit()
-        return new_item
+        schedule(new_item)
+        return commit_with_audit(db, new_item, actor_user_id=current_user.id, action="REMINDER_CREATED", object_type="Reminder")
     
     @staticmethod
     def update(db: Session, reminder_id: str, data: ReminderUpdate, current_user: User) -> Reminder:
@@ -49,22 +45,61 @@ class ReminderController:
         update_data = data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(reminder, field, value)
-        reminder.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(reminder)
-        
-        audit = AuditLog(actor_user_id=current_user.id, action="REMINDER_UPDATED", object_type="Reminder", object_id=reminder.id)
-        db.add(audit)
-        db.commit()
-        return reminder
+        if SCHEDULE_FIELDS & update_data.keys():
+            schedule(reminder)
+        return commit_with_audit(db, reminder, actor_user_id=current_user.id, action="REMINDER_UPDATED", object_type="Reminder")
     
     @staticmethod
     def delete(db: Session, reminder_id: str, current_user: User) -> bool:
         reminder = ReminderController.get_by_id(db, reminder_id, current_user)
-        audit = AuditLog(actor_user_id=current_user.id, action="REMINDER_DELETED", object_type="Reminder", object_id=reminder.id)
-        db.add(audit)
-        db.delete(reminder)
-        db.commit()
+        commit_with_audit(db, reminder, actor_user_id=current_user.id, action="REMINDER_DELETED", object_type="Reminder", delete=True)
         return True
 
 
+class AsyncReminderController:
+    """Versión async de ReminderController (AsyncSession + asyncpg)"""
+    
+    @staticmethod
+    async def get_all(db: AsyncSession, current_user: User, pet_id: Optional[str] = None, is_active: Optional[bool] = None, skip: int = 0, limit: int = 100) -> List[Reminder]:
+        query = select(Reminder).where(Reminder.owner_id == current_user.id)
+        if pet_id:
+            query = query.where(Reminder.pet_id == pet_id)
+        if is_active is not None:
+            query = query.where(Reminder.is_active == is_active)
+        result = await db.execute(query.order_by(Reminder.event_time).offset(skip).limit(limit))
+        return result.scalars().all()
+    
+    @staticmethod
+    async def get_by_id(db: AsyncSession, reminder_id: str, current_user: User) -> Reminder:
+        result = await db.execute(select(Reminder).where(Reminder.id == reminder_id, Reminder.owner_id == current_user.id))
+        reminder = result.scalar_one_or_none()
+        if not reminder:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recordatorio no encontrado")
+        return reminder
+    
+    @staticmethod
+    async def create(db: AsyncSession, data: ReminderCreate, current_user: User) -> Reminder:
+        if data.pet_id:
+            pet_id = await db.scalar(select(Pet.id).where(Pet.id == data.pet_id, Pet.owner_id == current_user.id))
+            if not pet_id:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mascota no encontrada")
+        
+        new_item = Reminder(owner_id=current_user.id, **data.model_dump())
+        schedule(new_item)
+        return await commit_with_audit_async(db, new_item, actor_user_id=current_user.id, action="REMINDER_CREATED", object_type="Reminder")
+    
+    @staticmethod
+    async def update(db: AsyncSession, reminder_id: str, data: ReminderUpdate, current_user: User) -> Reminder:
+        reminder = await AsyncReminderController.get_by_id(db, reminder_id, current_user)
+        update_data = data.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(reminder, field, value)
+        if SCHEDULE_FIELDS & update_data.keys():
+            schedule(reminder)
+        return await commit_with_audit_async(db, reminder, actor_user_id=current_user.id, action="REMINDER_UPDATED", object_type="Reminder")
+    
+    @staticmethod
+    async def delete(db: AsyncSession, reminder_id: str, current_user: User) -> bool:
+        reminder = await AsyncReminderController.get_by_id(db, reminder_id, current_user)
+        await commit_with_audit_async(db, reminder, actor_user_id=current_user.id, action="REMINDER_DELETED", object_type="Reminder", delete=True)
+        return True
@@ -0,0 +1,41 @@
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.models import User
+from app.services.search import SEARCH_TYPES, search
+from app.utils.exceptions import InsufficientPermissionsException
+
+
+class SearchController:
+    @staticmethod
+    def search(
+        db: Session,
+        current_user: User,
+        term: str,
+        types: Optional[List[str]] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> List[dict]:
+        """
+        Búsqueda unificada en mascotas, visitas veterinarias y usuarios
+        
+        Args:
+            db: Sesión de base de datos
+            current_user: Usuario autenticado
+            term: Texto a buscar
+            types: Tipos a incluir (por defecto todos los permitidos para el rol)
+            skip: Número de resultados a omitir
+            limit: Número máximo de resultados
+        
+        Returns:
+            List[dict]: Resultados ordenados por relevancia
+        
+        Raises:
+            InsufficientPermissionsException: Si un usuario no admin pide "users"
+        """
+        is_admin = current_user.role == "admin"
+        if types is None:
+            types = [name for name in SEARCH_TYPES if name != "users" or is_admin]
+        elif "users" in types and not is_admin:
+            raise InsufficientPermissionsException()
+        
+        return search(db, current_user.id, term, types=types, skip=skip, limit=limit)
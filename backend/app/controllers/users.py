@@ -1,10 +1,12 @@
-from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, or_
-from app.models import User, AuditLog
+from sqlalchemy import or_
+from app.models import User
 from app.schemas.users import UserUpdate, UserChangePassword
 from app.utils.security import hash_password, verify_password
+from app.services.user_cache import user_cache
+from app.utils.unit_of_work import commit_with_audit
+from app.utils.pagination import Keyset
 from app.utils.exceptions import (
     UserNotFoundException,
     UserAlreadyExistsException,
@@ -12,6 +14,8 @@ from app.utils.exceptions import (
 )
 from fastapi import HTTPException, status
 
+USER_KEYSET = Keyset("users", User.created_at, User.id)
+
 class UserController:
     """Controlador para operaciones con usuarios"""
     
@@ -22,7 +26,8 @@ class UserController:
         skip: int = 0,
         limit: int = 100,
         search: Optional[str] = None,
-        is_active: Optional[bool] = None
+        is_active: Optional[bool] = None,
+        cursor: Optional[str] = None
     ) -> List[User]:
         """
         Obtiene todos los usuarios (solo admins)
@@ -35,7 +40,7 @@ class UserController:
         
         query = db.query(User)
         
-        # Filtrar por búsqueda (username, email, full_name)
+        # Filtrar por búsqueda (username, email, full_name); ILIKE usa los índices trigram ix_users_*_trgm
         if search:
             search_filter = f"%{search}%"
             query = query.filter(
@@ -50,7 +55,7 @@ class UserController:
         if is_active is not None:
             query = query.filter(User.is_active == is_active)
         
-        return query.order_by(desc(User.created_at)).offset(skip).limit(limit).all()
+        return USER_KEYSET.paginate(query, cursor, skip, limit).all()
     
     @staticmethod
     def get_user_by_id(db: Session, user_id: str, current_user: User) -> User:
@@ -126,23 +131,19 @@ class UserController:
         for field, value in update_data.items():
             setattr(user, field, value)
         
-        user.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(user)
-        
-        # Log de auditoría
-        audit = AuditLog(
+        # Cambios y log de auditoría en una sola transacción
+        commit_with_audit(
+            db,
+            user,
             actor_user_id=current_user.id,
             action="USER_UPDATED",
             object_type="User",
-            object_id=user.id,
             meta={
                 "updated_fields": list(update_data.keys()),
                 "updated_by": "self" if is_self else "admin"
             }
         )
-        db.add(audit)
-        db.commit()
+        user_cache.invalidate(user.id)
         
         return user
     
@@ -173,22 +174,18 @@ class UserController:
         
         # Actualizar contraseña
         user.hashed_password = hash_password(password_data.new_password)
-        user.updated_at = datetime.utcnow()
         
         # Invalidar refresh token por seguridad
         user.refresh_token = None
         
-        db.commit()
-        
-        # Log de auditoría
-        audit = AuditLog(
+        commit_with_audit(
+            db,
+            user,
             actor_user_id=current_user.id,
             action="PASSWORD_CHANGED",
-            object_type="User",
-            object_id=user.id
+            object_type="User"
         )
-        db.add(audit)
-        db.commit()
+        user_cache.invalidate(user.id)
         
         return True
     
@@ -221,19 +218,15 @@ class UserController:
         
         user.is_active = False
         user.refresh_token = None  # Invalidar sesiones
-        user.updated_at = datetime.utcnow()
-        db.commit()
-        
-        # Log de auditoría
-        audit = AuditLog(
+        commit_with_audit(
+            db,
+            user,
             actor_user_id=current_user.id,
             action="USER_DEACTIVATED",
             object_type="User",
-            object_id=user.id,
             meta={"deactivated_by": "self" if is_self else "admin"}
         )
-        db.add(audit)
-        db.commit()
+        user_cache.invalidate(user.id)
         
         return True
     
@@ -252,18 +245,14 @@ class UserController:
             raise UserNotFoundException()
         
         user.is_active = True
-        user.updated_at = datetime.utcnow()
-        db.commit()
-        
-        # Log de auditoría
-        audit = AuditLog(
+        commit_with_audit(
+            db,
+            user,
             actor_user_id=current_user.id,
             action="USER_REACTIVATED",
-            object_type="User",
-            object_id=user.id
+            object_type="User"
         )
-        db.add(audit)
-        db.commit()
+        user_cache.invalidate(user.id)
         
         return True
     
@@ -289,22 +278,21 @@ class UserController:
                 detail="No puedes eliminar tu propia cuenta de administrador"
             )
         
-        # Log de auditoría ANTES de eliminar
-        audit = AuditLog(
+        # Eliminar usuario (cascade eliminará todos los datos relacionados)
+        # y registrar auditoría en la misma transacción
+        commit_with_audit(
+            db,
+            user,
             actor_user_id=current_user.id,
             action="USER_DELETED",
             object_type="User",
-            object_id=user.id,
             meta={
                 "deleted_user_email": user.email,
                 "deleted_user_username": user.username
-            }
+            },
+            delete=True
         )
-        db.add(audit)
-        
-        # Eliminar usuario (cascade eliminará todos los datos relacionados)
-        db.delete(user)
-        db.commit()
+        user_cache.invalidate(user_id)
         
         return True
     
@@ -1,11 +1,15 @@
-from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from app.models import Vaccination, Pet, User, AuditLog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Vaccination, Pet, User
+from app.utils.unit_of_work import commit_with_audit, commit_with_audit_async
+from app.utils.pagination import Keyset
 from app.schemas.vaccinations import VaccinationCreate, VaccinationUpdate
 from fastapi import HTTPException, status
 
+VACCINATION_KEYSET = Keyset("vaccinations", Vaccination.date_administered, Vaccination.id)
+
 class VaccinationController:
     """Controlador para operaciones con vacunaciones"""
     
@@ -15,7 +19,8 @@ class VaccinationController:
         current_user: User,
         pet_id: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[Vaccination]:
         """Obtiene todas las vacunaciones del usuario (opcionalmente filtradas por mascota)"""
         # Base query - solo vacunas de mascotas del usuario
@@ -25,7 +30,7 @@ class VaccinationController:
         if pet_id:
             query = query.filter(Vaccination.pet_id == pet_id)
         
-        return query.order_by(desc(Vaccination.date_administered)).offset(skip).limit(limit).all()
+        return VACCINATION_KEYSET.paginate(query, cursor, skip, limit).all()
     
     @staticmethod
     def get_vaccination_by_id(db: Session, vaccination_id: str, current_user: User) -> Vaccination:
@@ -74,25 +79,18 @@ class VaccinationController:
             proof_document_id=vaccination_data.proof_document_id
         )
         
-        db.add(new_vaccination)
-        db.commit()
-        db.refresh(new_vaccination)
-        
-        # Log de auditoría
-        audit = AuditLog(
+        # Vacunación y log de auditoría en una sola transacción
+        return commit_with_audit(
+            db,
+            new_vaccination,
             actor_user_id=current_user.id,
             action="VACCINATION_CREATED",
             object_type="Vaccination",
-            object_id=new_vaccination.id,
             meta={
                 "pet_id": str(vaccination_data.pet_id),
                 "vaccine_name": vaccination_data.vaccine_name
             }
         )
-        db.add(audit)
-        db.commit()
-        
-        return new_vaccination
     
     @staticmethod
     def update_vaccination(
@@ -109,42 +107,154 @@ class VaccinationController:
         for field, value in update_data.items():
             setattr(vaccination, field, value)
         
-        vaccination.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(vaccination)
-        
-        # Log de auditoría
-        audit = AuditLog(
+        # Cambios y log de auditoría en una sola transacción
+        return commit_with_audit(
+            db,
+            vaccination,
             actor_user_id=current_user.id,
             action="VACCINATION_UPDATED",
             object_type="Vaccination",
-            object_id=vaccination.id,
             meta={"updated_fields": list(update_data.keys())}
         )
-        db.add(audit)
-        db.commit()
-        
-        return vaccination
     
     @staticmethod
     def delete_vaccination(db: Session, vaccination_id: str, current_user: User) -> bool:
         """Elimina una vacunación"""
         vaccination = VaccinationController.get_vaccination_by_id(db, vaccination_id, current_user)
         
-        # Log de auditoría antes de eliminar
-        audit = AuditLog(
+        # Eliminar y registrar auditoría en la misma transacción
+        commit_with_audit(
+            db,
+            vaccination,
             actor_user_id=current_user.id,
             action="VACCINATION_DELETED",
             object_type="Vaccination",
-            object_id=vaccination.id,
             meta={
                 "pet_id": str(vaccination.pet_id),
                 "vaccine_name": vaccination.vaccine_name
+            },
+            delete=True
+        )
+        
+        return True
+
+
+class AsyncVaccinationController:
+    """Versión async de VaccinationController (AsyncSession + asyncpg)"""
+    
+    @staticmethod
+    async def get_all_vaccinations(
+        db: AsyncSession,
+        current_user: User,
+        pet_id: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[Vaccination]:
+        """Obtiene todas las vacunaciones del usuario (opcionalmente filtradas por mascota)"""
+        query = select(Vaccination).join(Pet).where(Pet.owner_id == current_user.id)
+        
+        if pet_id:
+            query = query.where(Vaccination.pet_id == pet_id)
+        
+        result = await db.execute(VACCINATION_KEYSET.paginate(query, cursor, skip, limit))
+        return result.scalars().all()
+    
+    @staticmethod
+    async def get_vaccination_by_id(db: AsyncSession, vaccination_id: str, current_user: User) -> Vaccination:
+        """Obtiene una vacunación por ID (solo del usuario actual)"""
+        result = await db.execute(
+            select(Vaccination).join(Pet).where(
+                Vaccination.id == vaccination_id,
+                Pet.owner_id == current_user.id
+            )
+        )
+        vaccination = result.scalar_one_or_none()
+        
+        if not vaccination:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Vacunación no encontrada"
+            )
+        
+        return vaccination
+    
+    @staticmethod
+    async def create_vaccination(
+        db: AsyncSession,
+        vaccination_data: VaccinationCreate,
+        current_user: User
+    ) -> Vaccination:
+        """Crea una nueva vacunación"""
+        pet_id = await db.scalar(
+            select(Pet.id).where(
+                Pet.id == vaccination_data.pet_id,
+                Pet.owner_id == current_user.id
+            )
+        )
+        
+        if not pet_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Mascota no encontrada"
+            )
+        
+        new_vaccination = Vaccination(**vaccination_data.model_dump())
+        
+        # Vacunación y log de auditoría en una sola transacción
+        return await commit_with_audit_async(
+            db,
+            new_vaccination,
+            actor_user_id=current_user.id,
+            action="VACCINATION_CREATED",
+            object_type="Vaccination",
+            meta={
+                "pet_id": str(vaccination_data.pet_id),
+                "vaccine_name": vaccination_data.vaccine_name
             }
         )
-        db.add(audit)
+    
+    @staticmethod
+    async def update_vaccination(
+        db: AsyncSession,
+        vaccination_id: str,
+        vaccination_data: VaccinationUpdate,
+        current_user: User
+    ) -> Vaccination:
+        """Actualiza una vacunación existente"""
+        vaccination = await AsyncVaccinationController.get_vaccination_by_id(db, vaccination_id, current_user)
+        
+        update_data = vaccination_data.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(vaccination, field, value)
+        
+        # Cambios y log de auditoría en una sola transacción
+        return await commit_with_audit_async(
+            db,
+            vaccination,
+            actor_user_id=current_user.id,
+            action="VACCINATION_UPDATED",
+            object_type="Vaccination",
+            meta={"updated_fields": list(update_data.keys())}
+        )
+    
+    @staticmethod
+    async def delete_vaccination(db: AsyncSession, vaccination_id: str, current_user: User) -> bool:
+        """Elimina una vacunación"""
+        vaccination = await AsyncVaccinationController.get_vaccination_by_id(db, vaccination_id, current_user)
         
-        db.delete(vaccination)
-        db.commit()
+        # Eliminar y registrar auditoría en la misma transacción
+        await commit_with_audit_async(
+            db,
+            vaccination,
+            actor_user_id=current_user.id,
+            action="VACCINATION_DELETED",
+            object_type="Vaccination",
+            meta={
+                "pet_id": str(vaccination.pet_id),
+                "vaccine_name": vaccination.vaccine_name
+            },
+            delete=True
+        )
         
-        return True
\ No newline at end of file
+        return True
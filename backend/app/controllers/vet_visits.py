@@ -1,11 +1,12 @@
 # ========================================
 # app/controllers/vet_visits.py
 # ========================================
-from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from app.models import VetVisit, Pet, User, AuditLog
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import VetVisit, Pet, User
+from app.utils.unit_of_work import commit_with_audit, commit_with_audit_async
 from app.schemas.vet_visits import VetVisitCreate, VetVisitUpdate
 from fastapi import HTTPException, status
 
@@ -31,14 +32,7 @@ class VetVisitController:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mascota no encontrada")
         
         new_item = VetVisit(**data.model_dump())
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
-        
-        audit = AuditLog(actor_user_id=current_user.id, action="VET_VISIT_CREATED", object_type="VetVisit", object_id=new_item.id)
-        db.add(audit)
-        db.commit()
-        return new_item
+        return commit_with_audit(db, new_item, actor_user_id=current_user.id, action="VET_VISIT_CREATED", object_type="VetVisit")
     
     @staticmethod
     def update(db: Session, visit_id: str, data: VetVisitUpdate, current_user: User) -> VetVisit:
@@ -46,22 +40,53 @@ class VetVisitController:
         update_data = data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(visit, field, value)
-        visit.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(visit)
-        
-        audit = AuditLog(actor_user_id=current_user.id, action="VET_VISIT_UPDATED", object_type="VetVisit", object_id=visit.id)
-        db.add(audit)
-        db.commit()
-        return visit
+        return commit_with_audit(db, visit, actor_user_id=current_user.id, action="VET_VISIT_UPDATED", object_type="VetVisit")
     
     @staticmethod
     def delete(db: Session, visit_id: str, current_user: User) -> bool:
         visit = VetVisitController.get_by_id(db, visit_id, current_user)
-        audit = AuditLog(actor_user_id=current_user.id, action="VET_VISIT_DELETED", object_type="VetVisit", object_id=visit.id)
-        db.add(audit)
-        db.delete(visit)
-        db.commit()
+        commit_with_audit(db, visit, actor_user_id=current_user.id, action="VET_VISIT_DELETED", object_type="VetVisit", delete=True)
         return True
 
 
+class AsyncVetVisitController:
+    """Versión async de VetVisitController (AsyncSession + asyncpg)"""
+    
+    @staticmethod
+    async def get_all(db: AsyncSession, current_user: User, pet_id: Optional[str] = None, skip: int = 0, limit: int = 100) -> List[VetVisit]:
+        query = select(VetVisit).join(Pet).where(Pet.owner_id == current_user.id)
+        if pet_id:
+            query = query.where(VetVisit.pet_id == pet_id)
+        result = await db.execute(query.order_by(desc(VetVisit.visit_date)).offset(skip).limit(limit))
+        return result.scalars().all()
+    
+    @staticmethod
+    async def get_by_id(db: AsyncSession, visit_id: str, current_user: User) -> VetVisit:
+        result = await db.execute(select(VetVisit).join(Pet).where(VetVisit.id == visit_id, Pet.owner_id == current_user.id))
+        visit = result.scalar_one_or_none()
+        if not visit:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Visita veterinaria no encontrada")
+        return visit
+    
+    @staticmethod
+    async def create(db: AsyncSession, data: VetVisitCreate, current_user: User) -> VetVisit:
+        pet_id = await db.scalar(select(Pet.id).where(Pet.id == data.pet_id, Pet.owner_id == current_user.id))
+        if not pet_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mascota no encontrada")
+        
+        new_item = VetVisit(**data.model_dump())
+        return await commit_with_audit_async(db, new_item, actor_user_id=current_user.id, action="VET_VISIT_CREATED", object_type="VetVisit")
+    
+    @staticmethod
+    async def update(db: AsyncSession, visit_id: str, data: VetVisitUpdate, current_user: User) -> VetVisit:
+        visit = await AsyncVetVisitController.get_by_id(db, visit_id, current_user)
+        update_data = data.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(visit, field, value)
+        return await commit_with_audit_async(db, visit, actor_user_id=current_user.id, action="VET_VISIT_UPDATED", object_type="VetVisit")
+    
+    @staticmethod
+    async def delete(db: AsyncSession, visit_id: str, current_user: User) -> bool:
+        visit = await AsyncVetVisitController.get_by_id(db, visit_id, current_user)
+        await commit_with_audit_async(db, visit, actor_user_id=current_user.id, action="VET_VISIT_DELETED", object_type="VetVisit", delete=True)
+        return True
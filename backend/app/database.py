@@ -1,7 +1,13 @@
+import threading
+from typing import Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
 from dotenv import load_dotenv
+from app.config import settings
+from app.services.metrics import TimedAsyncQueuePool, TimedQueuePool
 import os
 
 load_dotenv()
@@ -13,19 +19,123 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+psycopg2://", 1)
 
-# Configuración del engine con opciones para producción
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,  # Verificar conexiones antes de usarlas
-    pool_recycle=300,    # Reciclar conexiones cada 5 minutos
-    pool_size=10,        # Número de conexiones en el pool
-    max_overflow=20,     # Conexiones adicionales permitidas
-    echo=False           # No mostrar SQL en producción (cambiar a True para debug)
-)
+# asyncpg necesita el esquema postgresql+asyncpg://
+ASYNC_DATABASE_URL = DATABASE_URL
+if ASYNC_DATABASE_URL:
+    for prefix in ("postgresql+psycopg2://", "postgresql://"):
+        if ASYNC_DATABASE_URL.startswith(prefix):
+            ASYNC_DATABASE_URL = ASYNC_DATABASE_URL.replace(prefix, "postgresql+asyncpg://", 1)
+            break
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# ============================================
+# ENGINES (se crean en el primer uso)
+# ============================================
+# Importar app.database (o app.main) no carga el driver ni abre conexiones:
+# el engine se crea con la primera sesión que consulta o al llamar get_engine().
+# El esquema lo crean init_db.py y alembic, no el arranque de la app.
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_engine_lock = threading.Lock()
 
-Base = declarative_base()
+
+def get_engine() -> Engine:
+    """Engine sync (psycopg2) del proceso"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                # Configuración del engine con opciones para producción
+                _engine = create_engine(
+                    DATABASE_URL,
+                    poolclass=TimedQueuePool,  # QueuePool que mide la espera por conexión (/metrics)
+                    pool_pre_ping=True,  # Verificar conexiones antes de usarlas
+                    pool_recycle=300,    # Reciclar conexiones cada 5 minutos
+                    pool_size=settings.DB_POOL_SIZE,          # Número de conexiones en el pool
+                    max_overflow=settings.DB_MAX_OVERFLOW,    # Conexiones adicionales permitidas
+                    echo=False           # No mostrar SQL en producción (cambiar a True para debug)
+                )
+    return _engine
+
+
+def get_async_engine() -> Optional[AsyncEngine]:
+    """Engine async (asyncpg); None si ningún router usa el stack async (ASYNC_ROUTERS)"""
+    global _async_engine
+    if _async_engine is None and settings.ASYNC_ROUTERS:
+        with _engine_lock:
+            if _async_engine is None:
+                _async_engine = create_async_engine(
+                    ASYNC_DATABASE_URL,
+                    poolclass=TimedAsyncQueuePool,
+                    pool_pre_ping=True,
+                    pool_recycle=300,
+                    pool_size=settings.ASYNC_DB_POOL_SIZE,
+                    max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+                    echo=False
+                )
+    return _async_engine
+
+
+async def dispose_engines() -> None:
+    """Cierra los pools de los engines que llegaron a crearse (al apagar la app)"""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+
+
+def __getattr__(name: str):
+    # Compatibilidad con `from app.database import engine` (scripts y benchmarks):
+    # crea el engine al importarlo. El código de la app usa get_engine()
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazyBindSession(Session):
+    """Session sin bind fijo: pide el engine (y lo crea si hace falta) en su primera consulta"""
+
+    def get_bind(self, mapper=None, **kwargs):
+        if self.bind is None:
+            self.bind = get_engine()
+        return super().get_bind(mapper, **kwargs)
+
+
+class LazyAsyncBindSession(Session):
+    """Session sync interna de AsyncSession, sobre el engine async creado en el primer uso"""
+
+    def get_bind(self, mapper=None, **kwargs):
+        if self.bind is None:
+            self.bind = get_async_engine().sync_engine
+        return super().get_bind(mapper, **kwargs)
+
+
+# expire_on_commit=False: tras el commit los objetos conservan sus valores y no
+# hace falta db.refresh() ni un SELECT extra al serializar la respuesta
+SessionLocal = sessionmaker(class_=LazyBindSession, autocommit=False, autoflush=False, expire_on_commit=False)
+
+# ============================================
+# STACK ASYNC (opt-in por router, ver ASYNC_ROUTERS)
+# ============================================
+AsyncSessionLocal = None
+
+if settings.ASYNC_ROUTERS:
+    # expire_on_commit=False: en async no se puede hacer lazy load al serializar la respuesta
+    AsyncSessionLocal = async_sessionmaker(
+        sync_session_class=LazyAsyncBindSession,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+class _EagerDefaults:
+    # created_at / updated_at los pone la base (DEFAULT now() y los triggers
+    # trg_*_updated_at): con eager_defaults el INSERT / UPDATE del flush los
+    # trae con RETURNING, sin refresh ni un SELECT extra al serializar
+    __mapper_args__ = {"eager_defaults": True}
+
+
+Base = declarative_base(cls=_EagerDefaults)
 
 # Local
 # from sqlalchemy import create_engine
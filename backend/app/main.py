@@ -1,8 +1,18 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
-from app import models
-from app.database import engine
+from app.database import dispose_engines
+from app.config import settings
 from app.middleware.error_handler import setup_error_handlers
+from app.middleware.query_stats import setup_query_stats
+from app.middleware.metrics import process_gauges, setup_metrics
+from app.services.user_cache import user_cache
+from app.services.password_hasher import password_hasher
+from app.services.audit_sink import audit_sink
+from app.services.image_variants import image_variants
+from app.services.health import readiness_probe
+from app.services.email_service import smtp_pool
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.serialization import ORJSONResponse
 
 # Importar TODAS las rutas
 from app.routes import (
@@ -18,11 +28,12 @@ from app.routes import (
     pet_photos,
     users,
     audit_logs,
-    password_resets
+    password_resets,
+    search
 )
 
-# Crear las tablas en la base de datos
-models.Base.metadata.create_all(bind=engine)
+# El esquema lo crean init_db.py y alembic (release del Procfile): importar la
+# app no conecta a la base; el engine se crea con la primera consulta
 
 # Inicializar la aplicación
 app = FastAPI(
@@ -30,7 +41,9 @@ app = FastAPI(
     description="API REST completa para gestión de salud de mascotas con autenticación JWT",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # orjson (UUID/datetime nativos, Decimal y Row de SQLAlchemy) en lugar del json de la stdlib
+    default_response_class=ORJSONResponse
 )
 
 # Configurar CORS (permite peticiones desde el frontend)
@@ -40,27 +53,41 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],  # Paginación por cursor
 )
 
 # Configurar manejadores de errores globales
 setup_error_handlers(app)
 
+# Sentencias SQL y tiempo de DB por request (header Server-Timing y log de consultas lentas)
+setup_query_stats(app)
+
+# Métricas Prometheus: middleware HTTP y GET /metrics
+setup_metrics(app)
+
+def async_or_sync_router(name: str, module):
+    """Usa el router async del módulo si está habilitado en ASYNC_ROUTERS"""
+    if name in settings.ASYNC_ROUTERS and hasattr(module, "async_router"):
+        return module.async_router
+    return module.router
+
 # ============================================
 # INCLUIR TODAS LAS RUTAS
 # ============================================
-app.include_router(auth.router)              # Autenticación
-app.include_router(pets.router)              # Mascotas
-app.include_router(vaccinations.router)      # Vacunaciones
-app.include_router(dewormings.router)        # Desparasitaciones
-app.include_router(vet_visits.router)        # Visitas veterinarias
-app.include_router(nutrition_plans.router)   # Planes de nutrición
-app.include_router(meals.router)             # Comidas
-app.include_router(reminders.router)         # Recordatorios
-app.include_router(notifications.router)     # Notificaciones
-app.include_router(pet_photos.router)        # Fotos de mascotas
-app.include_router(users.router)             # Usuarios
-app.include_router(audit_logs.router)       # Registros de auditoría
-app.include_router(password_resets.router)   # Reseteos de contraseña
+app.include_router(auth.router)                                           # Autenticación
+app.include_router(pets.router)                                           # Mascotas
+app.include_router(async_or_sync_router("vaccinations", vaccinations))    # Vacunaciones
+app.include_router(async_or_sync_router("dewormings", dewormings))        # Desparasitaciones
+app.include_router(async_or_sync_router("vet_visits", vet_visits))        # Visitas veterinarias
+app.include_router(nutrition_plans.router)                                # Planes de nutrición
+app.include_router(async_or_sync_router("meals", meals))                  # Comidas
+app.include_router(async_or_sync_router("reminders", reminders))          # Recordatorios
+app.include_router(async_or_sync_router("notifications", notifications))  # Notificaciones
+app.include_router(pet_photos.router)                                     # Fotos de mascotas
+app.include_router(users.router)                                          # Usuarios
+app.include_router(audit_logs.router)                                     # Registros de auditoría
+app.include_router(password_resets.router)                                # Reseteos de contraseña
+app.include_router(search.router)                                         # Búsqueda
 
 @app.get("/")
 def root():
@@ -80,22 +107,47 @@ def root():
             "meals": "/meals",
             "reminders": "/reminders",
             "notifications": "/notifications",
-            "pet_photos": "/pet-photos"
+            "pet_photos": "/pet-photos",
+            "search": "/search"
         }
     }
 
 @app.get("/health")
 def health_check():
     """Endpoint para verificar el estado de salud de la API"""
+    readiness = readiness_probe.check()
     return {
-        "status": "healthy",
-        "database": "connected",
-        "version": "2.0.0"
+        "status": "healthy" if readiness["ready"] else "unhealthy",
+        "database": readiness["checks"]["database"]["status"],
+        "version": "2.0.0",
+        "user_cache": user_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "audit_sink": audit_sink.stats(),
+        "image_variants": image_variants.stats()
     }
 
+@app.get("/health/live")
+async def liveness_probe():
+    """Liveness: el proceso responde (no consulta dependencias)"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+def readiness_check():
+    """
+    Readiness: base de datos (SELECT 1 con timeout), saturación del pool y proveedor de email
+    Responde 503 si el worker no debe recibir tráfico; el resultado se cachea unos segundos
+    """
+    readiness = readiness_probe.check()
+    return ORJSONResponse(
+        readiness,
+        status_code=status.HTTP_200_OK if readiness["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
 # Evento de inicio
 @app.on_event("startup")
 async def startup_event():
+    audit_sink.start()
+    process_gauges.start()
     print("="*60)
     print("🚀 Pet HealthCare API v2.0 iniciada correctamente")
     print("📚 Documentación disponible en: http://localhost:8000/docs")
@@ -105,4 +157,12 @@ async def startup_event():
 # Evento de cierre
 @app.on_event("shutdown")
 async def shutdown_event():
+    # Drenar la cola de auditoría antes de cerrar los pools de conexiones
+    audit_sink.stop()
+    password_hasher.shutdown()
+    image_variants.shutdown()
+    process_gauges.stop()
+    readiness_probe.shutdown()
+    smtp_pool.close()
+    await dispose_engines()
     print("👋 Pet HealthCare API detenida")
\ No newline at end of file
@@ -2,10 +2,13 @@ from datetime import datetime
 from typing import Optional
 from fastapi import Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.database import SessionLocal, AsyncSessionLocal
 from app.models import User
 from app.utils.security import decode_token
+from app.services.user_cache import user_cache
 from app.utils.exceptions import (
     InvalidTokenException,
     TokenExpiredException,
@@ -24,13 +27,13 @@ def get_db():
     finally:
         db.close()
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """
-    Middleware para obtener el usuario actual desde el token JWT
-    """
+async def get_async_db():
+    """Dependency para obtener sesión async de base de datos (requiere ASYNC_ROUTERS)"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def _user_id_from_credentials(credentials: HTTPAuthorizationCredentials) -> str:
+    """Valida el access token JWT y retorna el user_id (sub)"""
     token = credentials.credentials
     
     # Decodificar token
@@ -55,8 +58,35 @@ async def get_current_user(
     if not user_id:
         raise InvalidTokenException()
     
-    # Buscar usuario en la base de datos
-    user = db.query(User).filter(User.id == user_id).first()
+    return user_id
+
+def _get_cached_principal(user_id: str):
+    """
+    Busca el usuario en la caché en proceso y aplica las mismas verificaciones
+    que con la fila de la base de datos. Retorna None si hay que ir a la DB.
+    """
+    principal = user_cache.get(user_id)
+    if principal is None:
+        return None
+    
+    if not principal.is_active:
+        raise InactiveAccountException()
+    
+    if principal.locked_until and principal.locked_until > datetime.utcnow():
+        raise AccountLockedException(principal.locked_until.isoformat())
+    
+    if principal.locked_until:
+        # El bloqueo expiró: ir a la base de datos para resetearlo
+        user_cache.invalidate(user_id)
+        return None
+    
+    return principal
+
+def _check_user_row(user: Optional[User]) -> bool:
+    """
+    Verifica la fila del usuario. Retorna True si el bloqueo ya expiró
+    y hay que resetearlo en la base de datos.
+    """
     if not user:
         raise UserNotFoundException()
     
@@ -68,14 +98,77 @@ async def get_current_user(
     if user.locked_until and user.locked_until > datetime.utcnow():
         raise AccountLockedException(user.locked_until.isoformat())
     
+    return bool(user.locked_until and user.locked_until <= datetime.utcnow())
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Middleware para obtener el usuario actual desde el token JWT
+    """
+    user_id = _user_id_from_credentials(credentials)
+    
+    # Intentar resolver el usuario desde la caché en proceso
+    principal = _get_cached_principal(user_id)
+    if principal is not None:
+        return _attach_cached_user(principal, db)
+    
+    # Buscar usuario en la base de datos
+    user = db.query(User).filter(User.id == user_id).first()
+    
     # Si el bloqueo expiró, resetear intentos fallidos
-    if user.locked_until and user.locked_until <= datetime.utcnow():
+    if _check_user_row(user):
         user.locked_until = None
         user.failed_attempts = 0
         db.commit()
     
+    user_cache.set(user)
+    return user
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    Igual que get_current_user pero con la sesión async (routers async)
+    """
+    user_id = _user_id_from_credentials(credentials)
+    
+    principal = _get_cached_principal(user_id)
+    if principal is not None:
+        return await db.merge(_user_from_principal(principal), load=False)
+    
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    
+    if _check_user_row(user):
+        user.locked_until = None
+        user.failed_attempts = 0
+        await db.commit()
+    
+    user_cache.set(user)
+    return user
+
+def _user_from_principal(principal) -> User:
+    """
+    User detached construido desde el snapshot de la caché (sin SELECT).
+    La caché guarda solo el snapshot, nunca la instancia: cada request
+    hace merge(load=False) de un User nuevo en su propia sesión.
+    """
+    user = User(**principal.as_dict())
+    make_transient_to_detached(user)
     return user
 
+def _attach_cached_user(principal, db: Session) -> User:
+    """
+    User de la sesión del request a partir del snapshot. Los atributos
+    que no están en el snapshot quedan expirados y se cargan de forma
+    perezosa (una sola consulta) solo si el endpoint los usa. Con la
+    sesión async no hay carga perezosa: los routers async solo usan id y role.
+    """
+    return db.merge(_user_from_principal(principal), load=False)
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -86,6 +179,16 @@ async def get_current_active_user(
         raise InactiveAccountException()
     return current_user
 
+async def get_current_active_user_async(
+    current_user: User = Depends(get_current_user_async)
+) -> User:
+    """
+    Middleware para verificar que el usuario esté activo (routers async)
+    """
+    if not current_user.is_active:
+        raise InactiveAccountException()
+    return current_user
+
 async def get_current_verified_user(
     current_user: User = Depends(get_current_active_user)
 ) -> User:
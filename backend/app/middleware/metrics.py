@@ -0,0 +1,133 @@
+"""
+Métricas HTTP y de proceso para Prometheus (definidas en app/services/metrics.py)
+- MetricsMiddleware: latencia, requests en curso y status por plantilla de
+  ruta (/pets/{pet_id}, no la URL con IDs: la cardinalidad queda acotada)
+- ProcessGauges: un hilo por worker copia cada METRICS_REFRESH_SECONDS el
+  estado del pool de conexiones, el pool de bcrypt, la cola de auditoría y
+  las cachés a los gauges, y suma a los counters lo acumulado desde la
+  copia anterior (así también se actualizan los workers que no atienden el
+  scrape de /metrics)
+"""
+import threading
+import time
+from typing import Optional
+from fastapi import Response
+from app.config import settings
+from app.database import get_async_engine, get_engine
+from app.services.audit_sink import audit_sink
+from app.services.image_variants import image_variants
+from app.services.metrics import (
+    AUDIT_SINK_QUEUE_DEPTH,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    IMAGE_VARIANTS_IN_FLIGHT,
+    METRICS_CONTENT_TYPE,
+    PASSWORD_HASH_IN_FLIGHT,
+    PASSWORD_HASH_QUEUE_DEPTH,
+    PASSWORD_HASH_REJECTED,
+    inc_to_total,
+    mark_process_dead,
+    render_metrics,
+    set_cache_gauges,
+    set_pool_gauges
+)
+from app.services.password_hasher import password_hasher
+from app.services.user_cache import user_cache
+
+# Requests que no coinciden con ninguna ruta (404): una sola serie
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """Middleware ASGI: mide cada request HTTP"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            in_progress.dec()
+            # El router de Starlette deja la ruta encontrada en el scope
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            HTTP_REQUEST_DURATION.labels(method, route).observe(elapsed)
+            HTTP_REQUESTS.labels(method, route, str(status["code"])).inc()
+
+
+class ProcessGauges:
+    """Copia periódica del estado de los pools, colas y cachés del proceso a los gauges"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> None:
+        set_pool_gauges("sync", get_engine().pool)
+        async_engine = get_async_engine()
+        if async_engine is not None:
+            set_pool_gauges("async", async_engine.pool)
+
+        hasher = password_hasher.stats()
+        PASSWORD_HASH_IN_FLIGHT.set(hasher["in_flight"])
+        PASSWORD_HASH_QUEUE_DEPTH.set(max(hasher["in_flight"] - hasher["workers"], 0))
+        inc_to_total(PASSWORD_HASH_REJECTED, hasher["rejected"])
+
+        AUDIT_SINK_QUEUE_DEPTH.set(audit_sink.stats()["queued"])
+        IMAGE_VARIANTS_IN_FLIGHT.set(image_variants.stats()["in_flight"])
+        set_cache_gauges("user_principal", user_cache.stats())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️ No se pudieron actualizar las métricas del proceso: {str(e)}")
+
+    def start(self) -> None:
+        if self._thread is not None or self.interval <= 0:
+            return
+        self._stop.clear()
+        self.refresh()
+        self._thread = threading.Thread(target=self._run, name="process-metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        mark_process_dead()
+
+
+process_gauges = ProcessGauges(settings.METRICS_REFRESH_SECONDS)
+
+
+def metrics_endpoint() -> Response:
+    """Métricas en formato de texto de Prometheus (agregadas entre workers si hay PROMETHEUS_MULTIPROC_DIR)"""
+    process_gauges.refresh()
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
+def setup_metrics(app) -> None:
+    """Instala el middleware y la ruta /metrics en la aplicación"""
+    app.add_middleware(MetricsMiddleware)
+    app.add_api_route("/metrics", metrics_endpoint, methods=["GET"], include_in_schema=False)
@@ -0,0 +1,145 @@
+"""
+Instrumentación SQL por request
+- Los eventos before/after_cursor_execute de SQLAlchemy (registrados en la
+  clase Engine: cubren el engine sync, el async y los de los workers) suman
+  sentencias y tiempo de DB al request en curso (contextvar)
+- QueryStatsMiddleware agrega el header Server-Timing:
+    Server-Timing: db;dur=12.4;desc="SQL", db-queries;dur=5;desc="Sentencias SQL", app;dur=31.0
+  (DevTools lo muestra en la pestaña Timing de cada request)
+- Las sentencias que superan SLOW_QUERY_THRESHOLD_MS se loguean con el SQL
+  normalizado (sin valores) y la ruta del endpoint
+Fuera de un request (workers, scripts) los eventos solo aplican el log de lentas.
+"""
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+
+_START_TIMES = "query_stats_start_times"
+_MAX_SQL_LENGTH = 1000
+
+_WHITESPACE = re.compile(r"\s+")
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+class RequestQueryStats:
+    """Sentencias y tiempo de DB de un request"""
+
+    __slots__ = ("scope", "queries", "db_seconds", "started_at")
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.started_at = time.perf_counter()
+
+    def route_name(self) -> str:
+        """Método y plantilla de la ruta (/pets/{pet_id}), no la URL con IDs"""
+        route = self.scope.get("route")
+        path = getattr(route, "path", None) or self.scope.get("path", "")
+        return f"{self.scope.get('method', '')} {path}"
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+
+def normalize_sql(statement: str) -> str:
+    """SQL en una línea, con los valores reemplazados por ? y las listas IN colapsadas"""
+    sql = _STRING.sub("?", statement)
+    sql = _PARAM.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    sql = _IN_LIST.sub("(...)", sql)
+    if len(sql) > _MAX_SQL_LENGTH:
+        sql = sql[:_MAX_SQL_LENGTH] + "..."
+    return sql
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_TIMES, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get(_START_TIMES)
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold and elapsed * 1000 >= threshold:
+        route = stats.route_name() if stats is not None else "fuera de request"
+        print(f"🐢 Consulta lenta ({elapsed * 1000:.1f} ms) en {route}: {normalize_sql(statement)}")
+
+
+def _handle_error(exception_context):
+    # La sentencia falló: after_cursor_execute no se ejecuta, descartar su inicio
+    conn = exception_context.connection
+    if conn is not None and conn.info.get(_START_TIMES):
+        conn.info[_START_TIMES].pop()
+
+
+def install_query_events() -> None:
+    """Registra los eventos en todos los engines (idempotente)"""
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+
+
+def server_timing(stats: RequestQueryStats) -> str:
+    total_ms = (time.perf_counter() - stats.started_at) * 1000
+    return (
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="SQL", '
+        f'db-queries;dur={stats.queries};desc="Sentencias SQL", '
+        f"app;dur={total_ms:.1f}"
+    )
+
+
+class QueryStatsMiddleware:
+    """Middleware ASGI: abre las estadísticas del request y agrega Server-Timing a la respuesta"""
+
+    def __init__(self, app, server_timing_enabled: bool = True):
+        self.app = app
+        self.server_timing_enabled = server_timing_enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(scope)
+        token = _current.set(stats)
+
+        async def send_with_timing(message):
+            # Los endpoints sync corren en otro hilo con una copia del contexto:
+            # comparten el mismo objeto stats, así que aquí ya está todo sumado
+            if message["type"] == "http.response.start" and self.server_timing_enabled:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(stats).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+
+
+def setup_query_stats(app) -> None:
+    """Instala los eventos de SQLAlchemy y el middleware en la aplicación"""
+    install_query_events()
+    app.add_middleware(QueryStatsMiddleware, server_timing_enabled=settings.SERVER_TIMING_ENABLED)
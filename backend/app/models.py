@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime, date
-from sqlalchemy import Column, String, Boolean, Integer, DateTime, Date, ForeignKey, Numeric, LargeBinary, BigInteger, Text, Enum
-from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Boolean, Integer, DateTime, Date, ForeignKey, Numeric, LargeBinary, BigInteger, Text, Enum, Index, UniqueConstraint, Computed, FetchedValue, func, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from app.database import Base
 
 # Define the ENUM for reminder_frequency
@@ -16,7 +16,15 @@ class ReminderFrequency(enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
-    __table_args__ = {'schema': 'petcare'}
+    __table_args__ = (
+        # Listado admin paginado por (created_at, id)
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Búsqueda por similitud / ILIKE '%...%' (pg_trgm)
+        Index("ix_users_username_trgm", "username", postgresql_using="gin", postgresql_ops={"username": "gin_trgm_ops"}),
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+        Index("ix_users_full_name_trgm", "full_name", postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"}),
+        {'schema': 'petcare'}
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     username = Column(String, unique=True, index=True)
@@ -34,8 +42,8 @@ class User(Base):
     refresh_token = Column(String)
     last_login_at = Column(DateTime(timezone=True))
     is_active = Column(Boolean, nullable=False, default=True)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now)
-    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now, onupdate=datetime.now)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
 
     pets = relationship("Pet", back_populates="owner")
     reminders = relationship("Reminder", back_populates="owner")
@@ -45,7 +53,14 @@ class User(Base):
 
 class Pet(Base):
     __tablename__ = "pets"
-    __table_args__ = {'schema': 'petcare'}
+    __table_args__ = (
+        # Listado por dueño ordenado por fecha de creación (keyset)
+        Index("ix_pets_owner_created_at", "owner_id", "created_at", "id"),
+        # Búsqueda full-text y por similitud del nombre (pg_trgm)
+        Index("ix_pets_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_pets_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        {'schema': 'petcare'}
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     owner_id = Column(UUID(as_uuid=True), ForeignKey("petcare.users.id", ondelete="CASCADE"), nullable=False)
@@ -57,10 +72,20 @@ class Pet(Base):
     weight_kg = Column(Numeric(5, 2))
     sex = Column(String)
     photo_url = Column(String)
-    photo_bytea = Column(LargeBinary)
+    # Foto en el blob store (digest SHA-256); photo_bytea queda solo para datos legados
+    photo_sha256 = Column(String(64))
+    # Binario grande: no se carga por defecto y acceder sin undefer() lanza error
+    photo_bytea = deferred(Column(LargeBinary), raiseload=True)
     notes = Column(Text)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now)
-    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now, onupdate=datetime.now)
+    # Columna generada por Postgres para la búsqueda full-text (app/services/search.py)
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('spanish', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('spanish', coalesce(species, '') || ' ' || coalesce(breed, '')), 'B') || "
+        "setweight(to_tsvector('spanish', coalesce(notes, '')), 'C')",
+        persisted=True
+    )))
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
 
     owner = relationship("User", back_populates="pets")
     photos = relationship("PetPhoto", back_populates="pet")
@@ -74,7 +99,11 @@ class Pet(Base):
 
 class PetPhoto(Base):
     __tablename__ = "pet_photos"
-    __table_args__ = {'schema': 'petcare'}
+    __table_args__ = (
+        # Conteo de referencias de un blob antes de borrarlo del store
+        Index("ix_pet_photos_sha256", "sha256"),
+        {'schema': 'petcare'}
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     pet_id = Column(UUID(as_uuid=True), ForeignKey("petcare.pets.id", ondelete="CASCADE"), nullable=False)
@@ -82,17 +111,45 @@ class PetPhoto(Base):
     file_size_bytes = Column(BigInteger)
     mime_type = Column(String)
     url = Column(String)
-    data = Column(LargeBinary)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now)
-    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now, onupdate=datetime.now)
+    # Contenido en el blob store: digest SHA-256 (el tamaño va en file_size_bytes)
+    sha256 = Column(String(64))
+    # Binario legado: solo se lee para fotos aún no migradas (migrate_blobs.py)
+    data = deferred(Column(LargeBinary), raiseload=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
 
     pet = relationship("Pet", back_populates="photos")
     vaccination_proofs = relationship("Vaccination", back_populates="proof_document")
     vet_visit_documents = relationship("VetVisit", back_populates="documents")
 
+class ImageVariant(Base):
+    """Versión redimensionada de un blob de imagen (thumb, small, ...), también en el blob store"""
+    __tablename__ = "image_variants"
+    __table_args__ = (
+        UniqueConstraint("source_sha256", "size", "format", name="uq_image_variants_source_size_format"),
+        {'schema': 'petcare'}
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Digest del original (PetPhoto.sha256 / Pet.photo_sha256): fotos idénticas comparten variantes
+    source_sha256 = Column(String(64), nullable=False)
+    size = Column(String, nullable=False)
+    format = Column(String, nullable=False)
+    width = Column(Integer)
+    height = Column(Integer)
+    sha256 = Column(String(64), nullable=False)
+    file_size_bytes = Column(BigInteger)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
+
 class Vaccination(Base):
     __tablename__ = "vaccinations"
-    __table_args__ = {'schema': 'petcare'}
+    __table_args__ = (
+        Index("ix_vaccinations_pet_date_administered", "pet_id", "date_administered", "id"),
+        # Vencimientos (get_pets_needing_attention): solo filas con next_due
+        Index("ix_vaccinations_pet_next_due", "pet_id", "next_due", postgresql_where=text("next_due IS NOT NULL")),
+        {'schema': 'petcare'}
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     pet_id = Column(UUID(as_uuid=True), ForeignKey("petcare.pets.id", ondelete="CASCADE"), nullable=False)
@@ -104,15 +161,20 @@ class Vaccination(Base):
     veterinarian = Column(String)
     notes = Column(Text)
     proof_document_id = Column(UUID(as_uuid=True), ForeignKey("petcare.pet_photos.id"))
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now)
-    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now, onupdate=datetime.now)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
 
     pet = relationship("Pet", back_populates="vaccinations")
     proof_document = relationship("PetPhoto", back_populates="vaccination_proofs")
 
 class Deworming(Base):
     __tablename__ = "dewormings"
-    __table_args__ = {'schema': 'petcare'}
+    __table_args__ = (
+        Index("ix_dewormings_pet_next_due", "pet_id", "next_due", postgresql_where=text("next_due IS NOT NULL")),
+        # Conteos por mascota (estadísticas) y última desparasitación
+        Index("ix_dewormings_pet_date_administered", "pet_id", "date_administered"),
+        {'schema': 'petcare'}
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     pet_id = Column(UUID(as_uuid=True), ForeignKey("petcare.pets.id", ondelete="CASCADE"), nullable=False)
@@ -121,14 +183,20 @@ class Deworming(Base):
     next_due = Column(Date)
     veterinarian = Column(String)
     notes = Column(Text)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now)
-    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now, onupdate=datetime.now)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
 
     pet = relationship("Pet", back_populates="dewormings")
 
 class VetVisit(Base):
     __tablename__ = "vet_visits"
-    __table_args__ = {'schema': 'petcare'}
+    __table_args__ = (
+        # Conteos por mascota (estadísticas) y última visita
+        Index("ix_vet_visits_pet_visit_date", "pet_id", "visit_date"),
+        # Búsqueda full-text
+        Index("ix_vet_visits_search_vector", "search_vector", postgresql_using="gin"),
+        {'schema': 'petcare'}
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     pet_id = Column(UUID(as_uuid=True), ForeignKey("petcare.pets.id", ondelete="CASCADE"), nullable=False)
@@ -139,8 +207,15 @@ class VetVisit(Base):
     follow_up_date = Column(DateTime(timezone=True))
     veterinarian = Column(String)
     documents_id = Column(UUID(as_uuid=True), ForeignKey("petcare.pet_photos.id"))
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now)
-    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now, onupdate=datetime.now)
+    # Columna generada por Postgres para la búsqueda full-text (app/services/search.py)
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('spanish', coalesce(reason, '')), 'A') || "
+        "setweight(to_tsvector('spanish', coalesce(diagnosis, '')), 'B') || "
+        "setweight(to_tsvector('spanish', coalesce(treatment, '')), 'C')",
+        persisted=True
+    )))
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
 
     pet = relationship("Pet", back_populates="vet_visits")
     documents = relationship("PetPhoto", back_populates="vet_visit_documents")
@@ -154,15 +229,18 @@ class NutritionPlan(Base):
     name = Column(String)
     description = Column(Text)
     calories_per_day = Column(Integer)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now)
-    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now, onupdate=datetime.now)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
 
     pet = relationship("Pet", back_populates="nutrition_plans")
     meals = relationship("Meal", back_populates="nutrition_plan")
 
 class Meal(Base):
     __tablename__ = "meals"
-    __table_args__ = {'schema': 'petcare'}
+    __table_args__ = (
+        Index("ix_meals_pet_meal_time", "pet_id", "meal_time", "id"),
+        {'schema': 'petcare'}
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     pet_id = Column(UUID(as_uuid=True), ForeignKey("petcare.pets.id", ondelete="CASCADE"), nullable=False)
@@ -170,15 +248,22 @@ class Meal(Base):
     meal_time = Column(DateTime(timezone=True), nullable=False)
     description = Column(Text)
     calories = Column(Integer)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now)
-    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now, onupdate=datetime.now)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
 
     pet = relationship("Pet", back_populates="meals")
     nutrition_plan = relationship("NutritionPlan", back_populates="meals")
 
 class Reminder(Base):
     __tablename__ = "reminders"
-    __table_args__ = {'schema': 'petcare'}
+    __table_args__ = (
+        Index("ix_reminders_owner_event_time", "owner_id", "event_time"),
+        # Recordatorios activos por mascota (estadísticas)
+        Index("ix_reminders_pet_active", "pet_id", postgresql_where=text("is_active")),
+        # Recordatorios vencidos: range scan sobre next_fire_at (app/services/reminder_scheduler.py)
+        Index("ix_reminders_next_fire_at", "next_fire_at", postgresql_where=text("is_active AND next_fire_at IS NOT NULL")),
+        {'schema': 'petcare'}
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     owner_id = Column(UUID(as_uuid=True), ForeignKey("petcare.users.id", ondelete="CASCADE"), nullable=False)
@@ -192,8 +277,11 @@ class Reminder(Base):
     is_active = Column(Boolean, nullable=False, default=True)
     notify_by_email = Column(Boolean, nullable=False, default=True)
     notify_in_app = Column(Boolean, nullable=False, default=True)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now)
-    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now, onupdate=datetime.now)
+    # Próxima ocurrencia a disparar (None = no hay más) y la última disparada
+    next_fire_at = Column(DateTime(timezone=True))
+    last_fired_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
 
     owner = relationship("User", back_populates="reminders")
     pet = relationship("Pet", back_populates="reminders")
@@ -201,7 +289,10 @@ class Reminder(Base):
 
 class Notification(Base):
     __tablename__ = "notifications"
-    __table_args__ = {'schema': 'petcare'}
+    __table_args__ = (
+        Index("ix_notifications_owner_sent_at", "owner_id", "sent_at", "id"),
+        {'schema': 'petcare'}
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     reminder_id = Column(UUID(as_uuid=True), ForeignKey("petcare.reminders.id", ondelete="SET NULL"))
@@ -211,8 +302,8 @@ class Notification(Base):
     method = Column(String)
     status = Column(String)
     provider_response = Column(JSONB)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now)
-    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now, onupdate=datetime.now)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
 
     reminder = relationship("Reminder", back_populates="notifications")
     owner = relationship("User", back_populates="notifications")
@@ -227,14 +318,46 @@ class PasswordReset(Base):
     token = Column(String, unique=True, nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     used = Column(Boolean, nullable=False, default=False)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now)
-    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now, onupdate=datetime.now)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
 
     user = relationship("User", back_populates="password_resets")
 
+class EmailOutbox(Base):
+    """
+    Emails pendientes de envío (outbox transaccional)
+    Se insertan en la misma transacción que el usuario / token que los origina
+    y los envía email_outbox_worker.py con reintentos
+    """
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Pendientes listos para enviar: range scan sobre next_attempt_at
+        Index("ix_email_outbox_pending", "next_attempt_at", postgresql_where=text("status = 'pending'")),
+        {'schema': 'petcare'}
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    to_email = Column(String, nullable=False)
+    # Plantilla (EMAIL_TEMPLATES) y sus parámetros; el contenido se arma al enviar
+    template = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+    status = Column(String, nullable=False, default="pending")  # pending | sent | failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now)
+    last_error = Column(Text)
+    provider_response = Column(JSONB)
+    sent_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
+
 class AuditLog(Base):
     __tablename__ = "audit_logs"
-    __table_args__ = {'schema': 'petcare'}
+    __table_args__ = (
+        Index("ix_audit_logs_actor_created_at", "actor_user_id", "created_at", "id"),
+        Index("ix_audit_logs_object_created_at", "object_type", "object_id", "created_at"),
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+        {'schema': 'petcare'}
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     actor_user_id = Column(UUID(as_uuid=True), ForeignKey("petcare.users.id"))
@@ -242,7 +365,7 @@ class AuditLog(Base):
     object_type = Column(String)
     object_id = Column(UUID(as_uuid=True))
     meta = Column(JSONB)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now)
-    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now, onupdate=datetime.now)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
 
     actor = relationship("User", back_populates="audit_logs")
\ No newline at end of file
@@ -1,12 +1,12 @@
 # ========================================
 # app/routes/audit_logs.py
 # ========================================
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from datetime import datetime
 from app.middleware.auth import get_db, get_current_active_user, require_role
-from app.controllers.audit_logs import AuditLogController
+from app.controllers.audit_logs import AuditLogController, AUDIT_LOG_KEYSET
 from app.schemas.audit_logs import (
     AuditLogResponse,
     AuditLogWithUser,
@@ -14,15 +14,21 @@ from app.schemas.audit_logs import (
     AuditLogCreate
 )
 from app.models import User
+from app.utils.pagination import set_next_cursor
+from app.utils.serialization import fields_of, list_response, row_to_dict
 
 router = APIRouter(prefix="/audit-logs", tags=["Logs de Auditoría"])
 
+# Listados serializados con orjson sin validar cada fila (el response_model queda para la documentación)
+AUDIT_LOG_RESPONSE_FIELDS = fields_of(AuditLogResponse)
+
 # ============================================
 # ENDPOINTS BÁSICOS
 # ============================================
 
 @router.get("/", response_model=List[AuditLogWithUser])
 def get_all_audit_logs(
+    response: Response,
     actor_user_id: Optional[str] = Query(None, description="Filtrar por usuario"),
     action: Optional[str] = Query(None, description="Filtrar por acción"),
     object_type: Optional[str] = Query(None, description="Filtrar por tipo de objeto"),
@@ -31,6 +37,7 @@ def get_all_audit_logs(
     date_to: Optional[datetime] = Query(None, description="Hasta fecha"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -48,6 +55,9 @@ def get_all_audit_logs(
     - `object_id`: ID específico del objeto
     - `date_from`: Logs desde esta fecha
     - `date_to`: Logs hasta esta fecha
+    
+    **Paginación:** usar `cursor` con el header `X-Next-Cursor` de la
+    respuesta anterior (el costo no crece con la profundidad, a diferencia de `skip`)
     """
     filters = AuditLogFilter(
         actor_user_id=actor_user_id,
@@ -58,32 +68,18 @@ def get_all_audit_logs(
         date_to=date_to
     )
     
-    logs = AuditLogController.get_all(
+    rows = AuditLogController.get_all_with_user_rows(
         db=db,
         current_user=current_user,
         filters=filters,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor
     )
+    set_next_cursor(response, AUDIT_LOG_KEYSET, rows, limit)
     
-    # Enriquecer con información del usuario
-    enriched_logs = []
-    for log in logs:
-        log_dict = AuditLogWithUser(
-            id=str(log.id),
-            actor_user_id=str(log.actor_user_id) if log.actor_user_id else None,
-            action=log.action,
-            object_type=log.object_type,
-            object_id=str(log.object_id) if log.object_id else None,
-            meta=log.meta,
-            created_at=log.created_at,
-            updated_at=log.updated_at,
-            actor_username=log.actor.username if log.actor else None,
-            actor_email=log.actor.email if log.actor else None
-        )
-        enriched_logs.append(log_dict)
-    
-    return enriched_logs
+    # Las filas (log + usuario actor) se serializan directo con orjson
+    return list_response(rows, response)
 
 @router.get("/my-activity", response_model=List[AuditLogResponse])
 def get_my_activity(
@@ -105,19 +101,7 @@ def get_my_activity(
         limit=limit
     )
     
-    return [
-        AuditLogResponse(
-            id=str(log.id),
-            actor_user_id=str(log.actor_user_id) if log.actor_user_id else None,
-            action=log.action,
-            object_type=log.object_type,
-            object_id=str(log.object_id) if log.object_id else None,
-            meta=log.meta,
-            created_at=log.created_at,
-            updated_at=log.updated_at
-        )
-        for log in logs
-    ]
+    return list_response(row_to_dict(log, AUDIT_LOG_RESPONSE_FIELDS) for log in logs)
 
 @router.get("/{audit_log_id}", response_model=AuditLogWithUser)
 def get_audit_log_by_id(
@@ -176,19 +160,7 @@ def get_user_activity(
         limit=limit
     )
     
-    return [
-        AuditLogResponse(
-            id=str(log.id),
-            actor_user_id=str(log.actor_user_id) if log.actor_user_id else None,
-            action=log.action,
-            object_type=log.object_type,
-            object_id=str(log.object_id) if log.object_id else None,
-            meta=log.meta,
-            created_at=log.created_at,
-            updated_at=log.updated_at
-        )
-        for log in logs
-    ]
+    return list_response(row_to_dict(log, AUDIT_LOG_RESPONSE_FIELDS) for log in logs)
 
 @router.get("/object/{object_type}/{object_id}/history", response_model=List[AuditLogWithUser])
 def get_object_history(
@@ -3,9 +3,10 @@
 # ========================================
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.middleware.auth import get_db, get_current_active_user
-from app.controllers.dewormings import DewormingController
+from app.middleware.auth import get_db, get_async_db, get_current_active_user, get_current_active_user_async
+from app.controllers.dewormings import DewormingController, AsyncDewormingController
 from app.schemas.dewormings import DewormingCreate, DewormingUpdate, DewormingResponse
 from app.models import User
 
@@ -43,4 +44,39 @@ def delete_deworming(deworming_id: str, current_user: User = Depends(get_current
     DewormingController.delete(db, deworming_id, current_user)
     return None
 
+# ============================================
+# ROUTER ASYNC (se activa con ASYNC_ROUTERS)
+# ============================================
+async_router = APIRouter(prefix="/dewormings", tags=["Desparasitaciones"])
 
+@async_router.get("/", response_model=list[DewormingResponse])
+async def get_all_dewormings_async(
+    pet_id: Optional[str] = Query(None, description="Filtrar por mascota"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtiene todas las desparasitaciones del usuario"""
+    return await AsyncDewormingController.get_all(db, current_user, pet_id, skip, limit)
+
+@async_router.get("/{deworming_id}", response_model=DewormingResponse)
+async def get_deworming_by_id_async(deworming_id: str, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Obtiene una desparasitación específica"""
+    return await AsyncDewormingController.get_by_id(db, deworming_id, current_user)
+
+@async_router.post("/", response_model=DewormingResponse, status_code=status.HTTP_201_CREATED)
+async def create_deworming_async(data: DewormingCreate, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Crea una nueva desparasitación"""
+    return await AsyncDewormingController.create(db, data, current_user)
+
+@async_router.put("/{deworming_id}", response_model=DewormingResponse)
+async def update_deworming_async(deworming_id: str, data: DewormingUpdate, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Actualiza una desparasitación existente"""
+    return await AsyncDewormingController.update(db, deworming_id, data, current_user)
+
+@async_router.delete("/{deworming_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_deworming_async(deworming_id: str, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Elimina una desparasitación"""
+    await AsyncDewormingController.delete(db, deworming_id, current_user)
+    return None
@@ -1,26 +1,31 @@
 # ========================================
 # app/routes/meals.py
 # ========================================
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.middleware.auth import get_db, get_current_active_user
-from app.controllers.meals import MealController
+from app.middleware.auth import get_db, get_async_db, get_current_active_user, get_current_active_user_async
+from app.controllers.meals import MealController, AsyncMealController, MEAL_KEYSET
 from app.schemas.meals import MealCreate, MealUpdate, MealResponse
 from app.models import User
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter(prefix="/meals", tags=["Comidas"])
 
 @router.get("/", response_model=list[MealResponse])
 def get_all_meals(
+    response: Response,
     pet_id: Optional[str] = Query(None, description="Filtrar por mascota"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Obtiene todas las comidas del usuario"""
-    return MealController.get_all(db, current_user, pet_id, skip, limit)
+    meals = MealController.get_all(db, current_user, pet_id, skip, limit, cursor)
+    return set_next_cursor(response, MEAL_KEYSET, meals, limit)
 
 @router.get("/{meal_id}", response_model=MealResponse)
 def get_meal_by_id(meal_id: str, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)):
@@ -43,4 +48,42 @@ def delete_meal(meal_id: str, current_user: User = Depends(get_current_active_us
     MealController.delete(db, meal_id, current_user)
     return None
 
+# ============================================
+# ROUTER ASYNC (se activa con ASYNC_ROUTERS)
+# ============================================
+async_router = APIRouter(prefix="/meals", tags=["Comidas"])
 
+@async_router.get("/", response_model=list[MealResponse])
+async def get_all_meals_async(
+    response: Response,
+    pet_id: Optional[str] = Query(None, description="Filtrar por mascota"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtiene todas las comidas del usuario"""
+    meals = await AsyncMealController.get_all(db, current_user, pet_id, skip, limit, cursor)
+    return set_next_cursor(response, MEAL_KEYSET, meals, limit)
+
+@async_router.get("/{meal_id}", response_model=MealResponse)
+async def get_meal_by_id_async(meal_id: str, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Obtiene una comida específica"""
+    return await AsyncMealController.get_by_id(db, meal_id, current_user)
+
+@async_router.post("/", response_model=MealResponse, status_code=status.HTTP_201_CREATED)
+async def create_meal_async(data: MealCreate, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Crea una nueva comida"""
+    return await AsyncMealController.create(db, data, current_user)
+
+@async_router.put("/{meal_id}", response_model=MealResponse)
+async def update_meal_async(meal_id: str, data: MealUpdate, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Actualiza una comida existente"""
+    return await AsyncMealController.update(db, meal_id, data, current_user)
+
+@async_router.delete("/{meal_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_meal_async(meal_id: str, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Elimina una comida"""
+    await AsyncMealController.delete(db, meal_id, current_user)
+    return None
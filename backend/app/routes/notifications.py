@@ -1,24 +1,30 @@
 # ========================================
 # app/routes/notifications.py
 # ========================================
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.orm import Session
-from app.middleware.auth import get_db, get_current_active_user
-from app.controllers.notifications import NotificationController
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.middleware.auth import get_db, get_async_db, get_current_active_user, get_current_active_user_async
+from app.controllers.notifications import NotificationController, AsyncNotificationController, NOTIFICATION_KEYSET
 from app.schemas.notifications import NotificationCreate, NotificationUpdate, NotificationResponse
 from app.models import User
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter(prefix="/notifications", tags=["Notificaciones"])
 
 @router.get("/", response_model=list[NotificationResponse])
 def get_all_notifications(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Obtiene todas las notificaciones del usuario"""
-    return NotificationController.get_all(db, current_user, skip, limit)
+    notifications = NotificationController.get_all(db, current_user, skip, limit, cursor)
+    return set_next_cursor(response, NOTIFICATION_KEYSET, notifications, limit)
 
 @router.get("/{notification_id}", response_model=NotificationResponse)
 def get_notification_by_id(notification_id: str, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)):
@@ -41,4 +47,41 @@ def delete_notification(notification_id: str, current_user: User = Depends(get_c
     NotificationController.delete(db, notification_id, current_user)
     return None
 
+# ============================================
+# ROUTER ASYNC (se activa con ASYNC_ROUTERS)
+# ============================================
+async_router = APIRouter(prefix="/notifications", tags=["Notificaciones"])
 
+@async_router.get("/", response_model=list[NotificationResponse])
+async def get_all_notifications_async(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtiene todas las notificaciones del usuario"""
+    notifications = await AsyncNotificationController.get_all(db, current_user, skip, limit, cursor)
+    return set_next_cursor(response, NOTIFICATION_KEYSET, notifications, limit)
+
+@async_router.get("/{notification_id}", response_model=NotificationResponse)
+async def get_notification_by_id_async(notification_id: str, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Obtiene una notificación específica"""
+    return await AsyncNotificationController.get_by_id(db, notification_id, current_user)
+
+@async_router.post("/", response_model=NotificationResponse, status_code=status.HTTP_201_CREATED)
+async def create_notification_async(data: NotificationCreate, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Crea una nueva notificación"""
+    return await AsyncNotificationController.create(db, data, current_user)
+
+@async_router.put("/{notification_id}", response_model=NotificationResponse)
+async def update_notification_async(notification_id: str, data: NotificationUpdate, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Actualiza una notificación existente"""
+    return await AsyncNotificationController.update(db, notification_id, data, current_user)
+
+@async_router.delete("/{notification_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_notification_async(notification_id: str, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Elimina una notificación"""
+    await AsyncNotificationController.delete(db, notification_id, current_user)
+    return None
@@ -125,7 +125,8 @@ def get_all_password_resets(
         user_id=user_id,
         is_used=is_used,
         skip=skip,
-        limit=limit
+        limit=limit,
+        with_user=True
     )
     
     # Enriquecer con información del usuario
@@ -1,12 +1,14 @@
 # ========================================
 # app/routes/pet_photos.py
 # ========================================
-from fastapi import APIRouter, Depends, Query, status
+from typing import Optional
+from fastapi import APIRouter, Depends, File, Form, Query, Request, Response, UploadFile, status
 from sqlalchemy.orm import Session
 from app.middleware.auth import get_db, get_current_active_user
 from app.controllers.pet_photos import PetPhotoController
 from app.schemas.pet_photos import PetPhotoCreate, PetPhotoUpdate, PetPhotoResponse
 from app.models import User
+from app.services.image_variants import image_variants, SIZE_PATTERN
 
 router = APIRouter(prefix="/pet-photos", tags=["Fotos de Mascotas"])
 
@@ -21,11 +23,47 @@ def get_all_pet_photos(
     """Obtiene todas las fotos de una mascota"""
     return PetPhotoController.get_all(db, current_user, pet_id, skip, limit)
 
+def _photo_content(db: Session, request: Request, photo_id: str, size: Optional[str], current_user: User) -> Response:
+    photo, legacy_data = PetPhotoController.get_content(db, photo_id, current_user)
+    if legacy_data is None:
+        return image_variants.response(db, request, photo.sha256, size, photo.mime_type, photo.file_name)
+    # Foto aún no migrada al blob store: sin variantes, se sirve el original
+    return Response(content=legacy_data, media_type=photo.mime_type or "application/octet-stream")
+
 @router.get("/{photo_id}", response_model=PetPhotoResponse)
-def get_pet_photo_by_id(photo_id: str, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)):
-    """Obtiene una foto específica"""
+def get_pet_photo_by_id(
+    photo_id: str,
+    request: Request,
+    size: Optional[str] = Query(None, pattern=SIZE_PATTERN, description="Descarga la variante redimensionada (thumb, small, medium)"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Obtiene una foto específica; con ?size= descarga la imagen en ese tamaño"""
+    if size:
+        return _photo_content(db, request, photo_id, size, current_user)
     return PetPhotoController.get_by_id(db, photo_id, current_user)
 
+@router.get("/{photo_id}/content")
+def get_pet_photo_content(
+    photo_id: str,
+    request: Request,
+    size: Optional[str] = Query(None, pattern=SIZE_PATTERN, description="Variante redimensionada (thumb, small, medium)"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Descarga el contenido de una foto (soporta Range y ETag / If-None-Match)"""
+    return _photo_content(db, request, photo_id, size, current_user)
+
+@router.post("/upload", response_model=PetPhotoResponse, status_code=status.HTTP_201_CREATED)
+def upload_pet_photo(
+    pet_id: str = Form(...),
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Sube una foto como multipart/form-data (sin cargar el archivo entero en memoria)"""
+    return PetPhotoController.upload(db, pet_id, file, current_user)
+
 @router.post("/", response_model=PetPhotoResponse, status_code=status.HTTP_201_CREATED)
 def create_pet_photo(data: PetPhotoCreate, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)):
     """Crea una nueva foto de mascota"""
@@ -1,28 +1,39 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from app.middleware.auth import get_db, get_current_active_user
-from app.controllers.pets import PetController
+from app.controllers.pets import PetController, PET_KEYSET
 from app.schemas.pets import (
     PetCreate,
     PetUpdate,
     PetResponse,
     PetWithStats,
-    PetSummary
+    PetSummary,
+    PetStats,
+    PetDashboardItem
 )
 from app.models import User
+from app.utils.pagination import set_next_cursor
+from app.utils.serialization import fields_of, list_response, row_to_dict
+from app.services.blob_store import blob_store, guess_image_type
+from app.services.image_variants import image_variants, SIZE_PATTERN
 
 router = APIRouter(prefix="/pets", tags=["Mascotas"])
 
+# Listados: dicts con los campos de PetResponse serializados con orjson (sin validar cada fila)
+PET_RESPONSE_FIELDS = fields_of(PetResponse)
+
 # ============================================
 # ENDPOINTS CRUD BÁSICOS
 # ============================================
 
 @router.get("/", response_model=List[PetResponse])
 def get_all_my_pets(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=100, description="Número máximo de registros"),
     species: Optional[str] = Query(None, description="Filtrar por especie"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -30,33 +41,21 @@ def get_all_my_pets(
     Obtiene todas las mascotas del usuario autenticado
     
     Permite filtrar por especie (perro, gato, ave, etc.)
+    
+    Si la página está completa, el header `X-Next-Cursor` trae el cursor
+    para pedir la siguiente con `?cursor=...` (más rápido que `skip`)
     """
     pets = PetController.get_all_pets(
         db=db,
         current_user=current_user,
         skip=skip,
         limit=limit,
-        species=species
+        species=species,
+        cursor=cursor
     )
+    set_next_cursor(response, PET_KEYSET, pets, limit)
     
-    return [
-        PetResponse(
-            id=str(pet.id),
-            owner_id=str(pet.owner_id),
-            name=pet.name,
-            species=pet.species,
-            breed=pet.breed,
-            birth_date=pet.birth_date,
-            age_years=pet.age_years,
-            weight_kg=pet.weight_kg,
-            sex=pet.sex,
-            photo_url=pet.photo_url,
-            notes=pet.notes,
-            created_at=pet.created_at.isoformat(),
-            updated_at=pet.updated_at.isoformat()
-        )
-        for pet in pets
-    ]
+    return list_response((row_to_dict(pet, PET_RESPONSE_FIELDS) for pet in pets), response)
 
 @router.get("/summary", response_model=List[PetSummary])
 def get_pets_summary(
@@ -87,6 +86,122 @@ def get_pets_summary(
         for pet in pets
     ]
 
+def _pet_with_stats(pet, stats: dict) -> PetWithStats:
+    return PetWithStats(
+        id=str(pet.id),
+        owner_id=str(pet.owner_id),
+        name=pet.name,
+        species=pet.species,
+        breed=pet.breed,
+        birth_date=pet.birth_date,
+        age_years=pet.age_years,
+        weight_kg=pet.weight_kg,
+        sex=pet.sex,
+        photo_url=pet.photo_url,
+        notes=pet.notes,
+        created_at=pet.created_at.isoformat(),
+        updated_at=pet.updated_at.isoformat(),
+        **stats
+    )
+
+@router.get("/stats", response_model=List[PetWithStats])
+def get_pets_with_statistics(
+    pet_ids: Optional[List[str]] = Query(None, description="IDs de mascotas (por defecto, todas)"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Obtiene varias mascotas con sus estadísticas en una sola consulta
+    
+    Pensado para dashboards: ?pet_ids=a&pet_ids=b o sin parámetros para todas
+    """
+    rows = PetController.get_pets_with_stats(
+        db=db,
+        current_user=current_user,
+        pet_ids=pet_ids
+    )
+    
+    return [_pet_with_stats(pet, stats) for pet, stats in rows]
+
+@router.get("/dashboard", response_model=List[PetDashboardItem])
+def get_pets_dashboard(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Dashboard de todas tus mascotas en una sola llamada
+    
+    Por mascota incluye el resumen, los contadores de /pets/{pet_id}/stats y el
+    resumen de salud de /pets/{pet_id}/health-summary. Se calcula con un número
+    fijo de consultas, sin importar cuántas mascotas tengas
+    """
+    items = PetController.get_dashboard(db=db, current_user=current_user)
+    
+    return [
+        PetDashboardItem(
+            pet=PetSummary(
+                id=str(item["pet"].id),
+                name=item["pet"].name,
+                species=item["pet"].species,
+                breed=item["pet"].breed,
+                age_years=item["pet"].age_years,
+                photo_url=item["pet"].photo_url
+            ),
+            stats=PetStats(**item["stats"]),
+            health_summary=item["health_summary"]
+        )
+        for item in items
+    ]
+
+@router.get("/needing-attention")
+def get_pets_needing_attention(
+    vaccine_days: int = Query(7, ge=0, le=365, description="Horizonte en días para vacunas próximas"),
+    deworming_days: int = Query(7, ge=0, le=365, description="Horizonte en días para desparasitaciones próximas"),
+    follow_up_days: int = Query(7, ge=0, le=365, description="Horizonte en días para controles veterinarios"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Obtiene mascotas que necesitan atención médica
+    
+    Incluye:
+    - Mascotas con vacunas vencidas o próximas
+    - Mascotas con desparasitaciones vencidas o próximas
+    - Mascotas con controles veterinarios (follow_up_date) vencidos o próximos
+    - Por mascota: banderas y la fecha más temprana de cada pendiente
+    """
+    return PetController.get_pets_needing_attention(
+        db,
+        current_user,
+        vaccine_days=vaccine_days,
+        deworming_days=deworming_days,
+        follow_up_days=follow_up_days
+    )
+
+@router.get("/search", response_model=List[PetResponse])
+def search_pets(
+    q: str = Query(..., min_length=1, description="Término de búsqueda"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Busca mascotas por nombre, especie, raza o notas, ordenadas por relevancia
+    
+    Ejemplo: `/pets/search?q=golden` encontrará mascotas con "golden" en nombre, especie o raza.
+    Para buscar también en visitas veterinarias usa `/search`
+    """
+    pets = PetController.search_pets(
+        db=db,
+        current_user=current_user,
+        search_term=q,
+        skip=skip,
+        limit=limit
+    )
+    
+    return list_response(row_to_dict(pet, PET_RESPONSE_FIELDS) for pet in pets)
+
 @router.get("/{pet_id}", response_model=PetResponse)
 def get_pet_by_id(
     pet_id: str,
@@ -245,103 +360,18 @@ def get_pet_with_statistics(
     - Total de comidas registradas
     - Recordatorios activos
     """
-    from app.models import (
-        Vaccination, Deworming, VetVisit, Meal, Reminder
-    )
-    
-    pet = PetController.get_pet_by_id(
+    pet, stats = PetController.get_pet_with_stats(
         db=db,
         pet_id=pet_id,
         current_user=current_user
     )
     
-    # Obtener estadísticas
-    total_vaccinations = db.query(Vaccination).filter(
-        Vaccination.pet_id == pet.id
-    ).count()
-    
-    total_dewormings = db.query(Deworming).filter(
-        Deworming.pet_id == pet.id
-    ).count()
-    
-    total_vet_visits = db.query(VetVisit).filter(
-        VetVisit.pet_id == pet.id
-    ).count()
-    
-    total_meals = db.query(Meal).filter(
-        Meal.pet_id == pet.id
-    ).count()
-    
-    active_reminders = db.query(Reminder).filter(
-        Reminder.pet_id == pet.id,
-        Reminder.is_active == True
-    ).count()
-    
-    return PetWithStats(
-        id=str(pet.id),
-        owner_id=str(pet.owner_id),
-        name=pet.name,
-        species=pet.species,
-        breed=pet.breed,
-        birth_date=pet.birth_date,
-        age_years=pet.age_years,
-        weight_kg=pet.weight_kg,
-        sex=pet.sex,
-        photo_url=pet.photo_url,
-        notes=pet.notes,
-        created_at=pet.created_at.isoformat(),
-        updated_at=pet.updated_at.isoformat(),
-        total_vaccinations=total_vaccinations,
-        total_dewormings=total_dewormings,
-        total_vet_visits=total_vet_visits,
-        total_meals=total_meals,
-        active_reminders=active_reminders
-    )
+    return _pet_with_stats(pet, stats)
 
 # ============================================
 # ENDPOINTS ADICIONALES ÚTILES
 # ============================================
 
-@router.get("/search", response_model=List[PetResponse])
-def search_pets(
-    q: str = Query(..., min_length=1, description="Término de búsqueda"),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Busca mascotas por nombre, especie o raza
-    
-    Ejemplo: `/pets/search?q=golden` encontrará mascotas con "golden" en nombre, especie o raza
-    """
-    pets = PetController.search_pets(
-        db=db,
-        current_user=current_user,
-        search_term=q,
-        skip=skip,
-        limit=limit
-    )
-    
-    return [
-        PetResponse(
-            id=str(pet.id),
-            owner_id=str(pet.owner_id),
-            name=pet.name,
-            species=pet.species,
-            breed=pet.breed,
-            birth_date=pet.birth_date,
-            age_years=pet.age_years,
-            weight_kg=pet.weight_kg,
-            sex=pet.sex,
-            photo_url=pet.photo_url,
-            notes=pet.notes,
-            created_at=pet.created_at.isoformat(),
-            updated_at=pet.updated_at.isoformat()
-        )
-        for pet in pets
-    ]
-
 @router.get("/by-species")
 def get_pets_grouped_by_species(
     current_user: User = Depends(get_current_active_user),
@@ -354,21 +384,6 @@ def get_pets_grouped_by_species(
     """
     return PetController.get_pets_by_species(db, current_user)
 
-@router.get("/needing-attention")
-def get_pets_needing_attention(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Obtiene mascotas que necesitan atención médica
-    
-    Incluye:
-    - Mascotas con vacunas vencidas
-    - Mascotas con vacunas próximas (próxima semana)
-    - Mascotas con desparasitaciones vencidas
-    """
-    return PetController.get_pets_needing_attention(db, current_user)
-
 # ============================================
 # ENDPOINTS PARA GESTIÓN DE SALUD
 # ============================================
@@ -389,73 +404,44 @@ def get_pet_health_summary(
     - Última visita veterinaria
     - Recordatorios activos próximos
     """
-    from app.models import Vaccination, Deworming, VetVisit, Reminder
-    from datetime import datetime
-    from sqlalchemy import desc
-    
-    pet = PetController.get_pet_by_id(
+    pet, health_summary = PetController.get_health_summary(
         db=db,
         pet_id=pet_id,
         current_user=current_user
     )
     
-    # Última vacunación
-    last_vaccination = db.query(Vaccination).filter(
-        Vaccination.pet_id == pet.id
-    ).order_by(desc(Vaccination.date_administered)).first()
-    
-    # Próxima vacunación pendiente
-    next_vaccination = db.query(Vaccination).filter(
-        Vaccination.pet_id == pet.id,
-        Vaccination.next_due != None,
-        Vaccination.next_due >= datetime.utcnow().date()
-    ).order_by(Vaccination.next_due).first()
-    
-    # Última desparasitación
-    last_deworming = db.query(Deworming).filter(
-        Deworming.pet_id == pet.id
-    ).order_by(desc(Deworming.date_administered)).first()
-    
-    # Última visita veterinaria
-    last_vet_visit = db.query(VetVisit).filter(
-        VetVisit.pet_id == pet.id
-    ).order_by(desc(VetVisit.visit_date)).first()
-    
-    # Próximos recordatorios (próximos 7 días)
-    from datetime import timedelta
-    next_week = datetime.utcnow() + timedelta(days=7)
-    upcoming_reminders = db.query(Reminder).filter(
-        Reminder.pet_id == pet.id,
-        Reminder.is_active == True,
-        Reminder.event_time >= datetime.utcnow(),
-        Reminder.event_time <= next_week
-    ).order_by(Reminder.event_time).all()
-    
     return {
         "pet_id": str(pet.id),
         "pet_name": pet.name,
-        "last_vaccination": {
-            "vaccine_name": last_vaccination.vaccine_name if last_vaccination else None,
-            "date": last_vaccination.date_administered.isoformat() if last_vaccination else None
-        } if last_vaccination else None,
-        "next_vaccination_due": {
-            "vaccine_name": next_vaccination.vaccine_name if next_vaccination else None,
-            "due_date": next_vaccination.next_due.isoformat() if next_vaccination else None
-        } if next_vaccination else None,
-        "last_deworming": {
-            "medication": last_deworming.medication if last_deworming else None,
-            "date": last_deworming.date_administered.isoformat() if last_deworming else None
-        } if last_deworming else None,
-        "last_vet_visit": {
-            "date": last_vet_visit.visit_date.isoformat() if last_vet_visit else None,
-            "reason": last_vet_visit.reason if last_vet_visit else None
-        } if last_vet_visit else None,
-        "upcoming_reminders": [
-            {
-                "id": str(reminder.id),
-                "title": reminder.title,
-                "event_time": reminder.event_time.isoformat()
-            }
-            for reminder in upcoming_reminders
-        ]
-    }
\ No newline at end of file
+        **health_summary
+    }
+
+
+@router.get("/{pet_id}/photo")
+def get_pet_photo(
+    pet_id: str,
+    request: Request,
+    size: Optional[str] = Query(None, pattern=SIZE_PATTERN, description="Variante redimensionada (thumb, small, medium)"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Descarga la foto principal de la mascota (con ?size=thumb para avatares en listados)
+    
+    Soporta Range y ETag / If-None-Match cuando la foto está en el blob store
+    """
+    pet, legacy_data = PetController.get_pet_photo(
+        db=db,
+        pet_id=pet_id,
+        current_user=current_user
+    )
+    
+    if legacy_data is None:
+        with blob_store.open(pet.photo_sha256) as blob:
+            media_type = guess_image_type(blob.read(16))
+        return image_variants.response(db, request, pet.photo_sha256, size, media_type)
+    
+    return Response(
+        content=legacy_data,
+        media_type=guess_image_type(legacy_data[:16]) or "application/octet-stream"
+    )
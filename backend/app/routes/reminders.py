@@ -3,9 +3,10 @@
 # ========================================
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.middleware.auth import get_db, get_current_active_user
-from app.controllers.reminders import ReminderController
+from app.middleware.auth import get_db, get_async_db, get_current_active_user, get_current_active_user_async
+from app.controllers.reminders import ReminderController, AsyncReminderController
 from app.schemas.reminders import ReminderCreate, ReminderUpdate, ReminderResponse
 from app.models import User
 
@@ -44,4 +45,40 @@ def delete_reminder(reminder_id: str, current_user: User = Depends(get_current_a
     ReminderController.delete(db, reminder_id, current_user)
     return None
 
+# ============================================
+# ROUTER ASYNC (se activa con ASYNC_ROUTERS)
+# ============================================
+async_router = APIRouter(prefix="/reminders", tags=["Recordatorios"])
 
+@async_router.get("/", response_model=list[ReminderResponse])
+async def get_all_reminders_async(
+    pet_id: Optional[str] = Query(None, description="Filtrar por mascota"),
+    is_active: Optional[bool] = Query(None, description="Filtrar por estado activo"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtiene todos los recordatorios del usuario"""
+    return await AsyncReminderController.get_all(db, current_user, pet_id, is_active, skip, limit)
+
+@async_router.get("/{reminder_id}", response_model=ReminderResponse)
+async def get_reminder_by_id_async(reminder_id: str, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Obtiene un recordatorio específico"""
+    return await AsyncReminderController.get_by_id(db, reminder_id, current_user)
+
+@async_router.post("/", response_model=ReminderResponse, status_code=status.HTTP_201_CREATED)
+async def create_reminder_async(data: ReminderCreate, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Crea un nuevo recordatorio"""
+    return await AsyncReminderController.create(db, data, current_user)
+
+@async_router.put("/{reminder_id}", response_model=ReminderResponse)
+async def update_reminder_async(reminder_id: str, data: ReminderUpdate, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Actualiza un recordatorio existente"""
+    return await AsyncReminderController.update(db, reminder_id, data, current_user)
+
+@async_router.delete("/{reminder_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_reminder_async(reminder_id: str, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Elimina un recordatorio"""
+    await AsyncReminderController.delete(db, reminder_id, current_user)
+    return None
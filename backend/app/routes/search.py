@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+from app.middleware.auth import get_db, get_current_active_user
+from app.controllers.search import SearchController
+from app.schemas.search import SearchResult
+from app.models import User
+
+router = APIRouter(prefix="/search", tags=["Búsqueda"])
+
+@router.get("", response_model=List[SearchResult])
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Término de búsqueda"),
+    types: Optional[List[Literal["pets", "vet_visits", "users"]]] = Query(
+        None,
+        description="Tipos a incluir (por defecto todos; users solo para admins)"
+    ),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Búsqueda unificada ordenada por relevancia
+    
+    - Mascotas: nombre, especie, raza y notas (tolera errores de tipeo en el nombre)
+    - Visitas veterinarias: motivo, diagnóstico y tratamiento
+    - Usuarios (solo admins): usuario, nombre y email
+    
+    Ejemplo: `/search?q=otitis&types=vet_visits`
+    """
+    return SearchController.search(
+        db=db,
+        current_user=current_user,
+        term=q,
+        types=types,
+        skip=skip,
+        limit=limit
+    )
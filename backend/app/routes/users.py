@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from app.middleware.auth import (
@@ -6,7 +6,7 @@ from app.middleware.auth import (
     get_current_active_user,
     require_role
 )
-from app.controllers.users import UserController
+from app.controllers.users import UserController, USER_KEYSET
 from app.schemas.users import (
     UserUpdate,
     UserChangePassword,
@@ -14,6 +14,7 @@ from app.schemas.users import (
     UserStatistics
 )
 from app.models import User
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter(prefix="/users", tags=["Usuarios"])
 
@@ -136,10 +137,12 @@ def get_my_statistics(
 
 @router.get("/", response_model=List[UserResponse])
 def get_all_users(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=100, description="Número máximo de registros"),
     search: Optional[str] = Query(None, description="Buscar por username, email o nombre"),
     is_active: Optional[bool] = Query(None, description="Filtrar por estado activo"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
     current_user: User = Depends(require_role("admin")),
     db: Session = Depends(get_db)
 ):
@@ -154,8 +157,10 @@ def get_all_users(
         skip=skip,
         limit=limit,
         search=search,
-        is_active=is_active
+        is_active=is_active,
+        cursor=cursor
     )
+    set_next_cursor(response, USER_KEYSET, users, limit)
     
     return [
         UserResponse(
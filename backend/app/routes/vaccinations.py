@@ -1,26 +1,31 @@
 # ========================================
 # app/routes/vaccinations.py
 # ========================================
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.middleware.auth import get_db, get_current_active_user
-from app.controllers.vaccinations import VaccinationController
+from app.middleware.auth import get_db, get_async_db, get_current_active_user, get_current_active_user_async
+from app.controllers.vaccinations import VaccinationController, AsyncVaccinationController, VACCINATION_KEYSET
 from app.schemas.vaccinations import VaccinationCreate, VaccinationUpdate, VaccinationResponse
 from app.models import User
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter(prefix="/vaccinations", tags=["Vacunaciones"])
 
 @router.get("/", response_model=list[VaccinationResponse])
 def get_all_vaccinations(
+    response: Response,
     pet_id: Optional[str] = Query(None, description="Filtrar por mascota"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Obtiene todas las vacunaciones del usuario (opcionalmente filtradas por mascota)"""
-    return VaccinationController.get_all_vaccinations(db, current_user, pet_id, skip, limit)
+    vaccinations = VaccinationController.get_all_vaccinations(db, current_user, pet_id, skip, limit, cursor)
+    return set_next_cursor(response, VACCINATION_KEYSET, vaccinations, limit)
 
 @router.get("/{vaccination_id}", response_model=VaccinationResponse)
 def get_vaccination_by_id(vaccination_id: str, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)):
@@ -43,4 +48,42 @@ def delete_vaccination(vaccination_id: str, current_user: User = Depends(get_cur
     VaccinationController.delete_vaccination(db, vaccination_id, current_user)
     return None
 
+# ============================================
+# ROUTER ASYNC (se activa con ASYNC_ROUTERS)
+# ============================================
+async_router = APIRouter(prefix="/vaccinations", tags=["Vacunaciones"])
 
+@async_router.get("/", response_model=list[VaccinationResponse])
+async def get_all_vaccinations_async(
+    response: Response,
+    pet_id: Optional[str] = Query(None, description="Filtrar por mascota"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtiene todas las vacunaciones del usuario (opcionalmente filtradas por mascota)"""
+    vaccinations = await AsyncVaccinationController.get_all_vaccinations(db, current_user, pet_id, skip, limit, cursor)
+    return set_next_cursor(response, VACCINATION_KEYSET, vaccinations, limit)
+
+@async_router.get("/{vaccination_id}", response_model=VaccinationResponse)
+async def get_vaccination_by_id_async(vaccination_id: str, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Obtiene una vacunación específica por ID"""
+    return await AsyncVaccinationController.get_vaccination_by_id(db, vaccination_id, current_user)
+
+@async_router.post("/", response_model=VaccinationResponse, status_code=status.HTTP_201_CREATED)
+async def create_vaccination_async(data: VaccinationCreate, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Crea una nueva vacunación"""
+    return await AsyncVaccinationController.create_vaccination(db, data, current_user)
+
+@async_router.put("/{vaccination_id}", response_model=VaccinationResponse)
+async def update_vaccination_async(vaccination_id: str, data: VaccinationUpdate, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Actualiza una vacunación existente"""
+    return await AsyncVaccinationController.update_vaccination(db, vaccination_id, data, current_user)
+
+@async_router.delete("/{vaccination_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_vaccination_async(vaccination_id: str, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Elimina una vacunación"""
+    await AsyncVaccinationController.delete_vaccination(db, vaccination_id, current_user)
+    return None
@@ -3,9 +3,10 @@
 # ========================================
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.middleware.auth import get_db, get_current_active_user
-from app.controllers.vet_visits import VetVisitController
+from app.middleware.auth import get_db, get_async_db, get_current_active_user, get_current_active_user_async
+from app.controllers.vet_visits import VetVisitController, AsyncVetVisitController
 from app.schemas.vet_visits import VetVisitCreate, VetVisitUpdate, VetVisitResponse
 from app.models import User
 
@@ -43,4 +44,39 @@ def delete_vet_visit(visit_id: str, current_user: User = Depends(get_current_act
     VetVisitController.delete(db, visit_id, current_user)
     return None
 
+# ============================================
+# ROUTER ASYNC (se activa con ASYNC_ROUTERS)
+# ============================================
+async_router = APIRouter(prefix="/vet-visits", tags=["Visitas Veterinarias"])
 
+@async_router.get("/", response_model=list[VetVisitResponse])
+async def get_all_vet_visits_async(
+    pet_id: Optional[str] = Query(None, description="Filtrar por mascota"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtiene todas las visitas veterinarias del usuario"""
+    return await AsyncVetVisitController.get_all(db, current_user, pet_id, skip, limit)
+
+@async_router.get("/{visit_id}", response_model=VetVisitResponse)
+async def get_vet_visit_by_id_async(visit_id: str, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Obtiene una visita veterinaria específica"""
+    return await AsyncVetVisitController.get_by_id(db, visit_id, current_user)
+
+@async_router.post("/", response_model=VetVisitResponse, status_code=status.HTTP_201_CREATED)
+async def create_vet_visit_async(data: VetVisitCreate, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Crea una nueva visita veterinaria"""
+    return await AsyncVetVisitController.create(db, data, current_user)
+
+@async_router.put("/{visit_id}", response_model=VetVisitResponse)
+async def update_vet_visit_async(visit_id: str, data: VetVisitUpdate, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Actualiza una visita veterinaria existente"""
+    return await AsyncVetVisitController.update(db, visit_id, data, current_user)
+
+@async_router.delete("/{visit_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_vet_visit_async(visit_id: str, current_user: User = Depends(get_current_active_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Elimina una visita veterinaria"""
+    await AsyncVetVisitController.delete(db, visit_id, current_user)
+    return None
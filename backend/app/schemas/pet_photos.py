@@ -13,7 +13,7 @@ class PetPhotoBase(BaseModel):
 
 class PetPhotoCreate(PetPhotoBase):
     pet_id: str
-    data: Optional[bytes] = None  # Para subir archivo directamente
+    data: Optional[bytes] = None  # Compatibilidad; preferir POST /pet-photos/upload (multipart)
 
 class PetPhotoUpdate(BaseModel):
     file_name: Optional[str] = Field(None, max_length=500)
@@ -22,6 +22,7 @@ class PetPhotoUpdate(BaseModel):
 class PetPhotoResponse(PetPhotoBase):
     id: str
     pet_id: str
+    sha256: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import Any, Dict, Optional
 from datetime import date, datetime
 from decimal import Decimal
 
@@ -104,4 +104,18 @@ class PetSummary(BaseModel):
     photo_url: Optional[str]
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class PetStats(BaseModel):
+    """Contadores de una mascota"""
+    total_vaccinations: int = 0
+    total_dewormings: int = 0
+    total_vet_visits: int = 0
+    total_meals: int = 0
+    active_reminders: int = 0
+
+class PetDashboardItem(BaseModel):
+    """Schema de una mascota en el dashboard: resumen, contadores y resumen de salud"""
+    pet: PetSummary
+    stats: PetStats
+    health_summary: Dict[str, Any]
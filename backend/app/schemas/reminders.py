@@ -5,6 +5,7 @@ from pydantic import BaseModel, Field, validator
 from typing import Optional
 from datetime import datetime
 from app.models import ReminderFrequency
+from app.utils.recurrence import validate_rrule
 
 class ReminderBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=200)
@@ -18,6 +19,11 @@ class ReminderBase(BaseModel):
     notify_in_app: bool = True
     pet_id: Optional[str] = None
 
+    @validator('rrule')
+    def check_rrule(cls, v):
+        # InvalidRecurrenceError es un ValueError: pydantic responde 422
+        return validate_rrule(v)
+
 class ReminderCreate(ReminderBase):
     pass
 
@@ -33,9 +39,16 @@ class ReminderUpdate(BaseModel):
     notify_in_app: Optional[bool] = None
     pet_id: Optional[str] = None
 
+    @validator('rrule')
+    def check_rrule(cls, v):
+        # InvalidRecurrenceError es un ValueError: pydantic responde 422
+        return validate_rrule(v)
+
 class ReminderResponse(ReminderBase):
     id: str
     owner_id: str
+    next_fire_at: Optional[datetime] = None
+    last_fired_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
     
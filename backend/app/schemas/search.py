@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class SearchResult(BaseModel):
+    """Schema de un resultado de la búsqueda unificada"""
+    type: str  # pet | vet_visit | user
+    id: str
+    title: Optional[str]
+    subtitle: Optional[str]
+    pet_id: Optional[str]
+    rank: float
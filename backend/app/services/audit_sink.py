@@ -0,0 +1,246 @@
+"""
+Escritor de auditoría en lotes
+Los controladores encolan eventos y un hilo en segundo plano los inserta
+con un INSERT multi-fila, fuera de la transacción del request
+"""
+import json
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from app.config import settings
+from app.database import get_engine
+from app.models import AuditLog
+
+
+class AuditSink:
+    """
+    Buffer acotado de eventos de auditoría
+
+    - mode="sync": deshabilitado; los controladores escriben el AuditLog en su
+      propia transacción (comportamiento original, usado en tests)
+    - mode="async": los eventos se encolan y un hilo los inserta cuando se
+      juntan `batch_size` eventos o pasan `flush_interval` segundos
+    - Backpressure: si la cola está llena, `offer` espera hasta
+      `enqueue_timeout` segundos; si sigue llena retorna False y el llamador
+      escribe el AuditLog de forma síncrona (nunca se descarta un evento)
+    - Si un lote no se puede escribir (base caída), el hilo lo conserva y lo
+      reintenta cada `retry_interval` segundos; mientras tanto el sink deja
+      de aceptar eventos y los controladores escriben de forma síncrona
+    - Un evento que la base rechaza por sus datos (IntegrityError/DataError)
+      no frena al resto del lote: se aísla y se registra completo en el log
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        max_queue: int,
+        batch_size: int,
+        flush_interval: float,
+        enqueue_timeout: float,
+        retry_interval: float = 5.0
+    ):
+        self.mode = mode
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.retry_interval = retry_interval
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Hay un lote sin escribir: no se aceptan eventos nuevos hasta que se escriba
+        self._degraded = threading.Event()
+        self._stats_lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.rejected = 0
+        self.failed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return (
+            self.mode == "async"
+            and self._thread is not None
+            and not self._stop.is_set()
+            and not self._degraded.is_set()
+        )
+
+    @staticmethod
+    def build_event(
+        actor_user_id,
+        action: str,
+        object_type: Optional[str] = None,
+        object_id=None,
+        meta: Optional[dict] = None
+    ) -> dict:
+        """Fila lista para INSERT; la fecha es la del evento, no la del flush"""
+        now = datetime.now()
+        return {
+            "id": uuid.uuid4(),
+            "actor_user_id": actor_user_id,
+            "action": action,
+            "object_type": object_type,
+            "object_id": object_id,
+            "meta": meta,
+            "created_at": now,
+            "updated_at": now
+        }
+
+    def offer(self, event: dict, block: bool = True) -> bool:
+        """
+        Encola un evento. Retorna False si la cola sigue llena tras esperar
+        (o de inmediato con block=False, p. ej. desde el event loop)
+        """
+        if not self.enabled:
+            return False
+        try:
+            self._queue.put(event, block=block, timeout=self.enqueue_timeout if block else None)
+        except queue.Full:
+            with self._stats_lock:
+                self.rejected += 1
+            return False
+        with self._stats_lock:
+            self.enqueued += 1
+        return True
+
+    def start(self) -> None:
+        """Inicia el hilo escritor (solo en modo async)"""
+        if self.mode != "async" or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+        self._thread.start()
+        print(f"📝 Audit sink async iniciado (lote={self.batch_size}, intervalo={self.flush_interval}s)")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Deja de aceptar eventos y espera a que se escriba todo lo encolado"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        print(f"📝 Audit sink detenido ({self.written} eventos escritos, {self._queue.qsize()} pendientes)")
+
+    def _collect_batch(self) -> List[dict]:
+        """Espera el primer evento y junta más hasta llenar el lote o vencer el intervalo"""
+        batch: List[dict] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain_batch(self) -> List[dict]:
+        batch: List[dict] = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._collect_batch()
+            if batch:
+                self._flush(batch)
+        # Drenar lo que quedó en la cola al cerrar
+        batch = self._drain_batch()
+        while batch:
+            self._flush(batch)
+            batch = self._drain_batch()
+
+    def _write(self, batch: List[dict], attempts: int = 3) -> Optional[Exception]:
+        """INSERT multi-fila (executemany con insertmanyvalues de SQLAlchemy 2.0); retorna el último error"""
+        error: Optional[Exception] = None
+        for attempt in range(1, attempts + 1):
+            try:
+                with get_engine().begin() as conn:
+                    conn.execute(insert(AuditLog), batch)
+                with self._stats_lock:
+                    self.written += len(batch)
+                    self.batches += 1
+                return None
+            except (IntegrityError, DataError) as e:
+                # Reintentar el mismo lote no cambia el resultado
+                return e
+            except Exception as e:
+                error = e
+                print(f"⚠️ Error escribiendo lote de auditoría (intento {attempt}/{attempts}): {str(e)}")
+                if attempt < attempts:
+                    time.sleep(0.2 * attempt)
+        return error
+
+    def _discard(self, event: dict, reason: str) -> None:
+        """Último recurso: el evento completo queda en el log para poder reponerlo a mano"""
+        with self._stats_lock:
+            self.failed += 1
+        print(f"❌ Evento de auditoría no escrito ({reason}): {json.dumps(event, default=str)}")
+
+    def _flush(self, batch: List[dict]) -> None:
+        """Escribe el lote; si la base no lo acepta, lo conserva y reintenta"""
+        while batch:
+            error = self._write(batch)
+            if error is None:
+                break
+            if isinstance(error, (IntegrityError, DataError)):
+                # Algún evento es inválido (ej. actor ya borrado): se escriben de a uno
+                pending = []
+                for event in batch:
+                    event_error = self._write([event], attempts=1)
+                    if isinstance(event_error, (IntegrityError, DataError)):
+                        self._discard(event, str(event_error.orig))
+                    elif event_error is not None:
+                        pending.append(event)
+                batch = pending
+                if not batch:
+                    break
+
+            if self._stop.is_set():
+                # Cerrando el proceso: no se puede esperar a que vuelva la base
+                for event in batch:
+                    self._discard(event, "la base no respondió al cerrar")
+                break
+            if not self._degraded.is_set():
+                self._degraded.set()
+                print(f"⚠️ La auditoría en lotes no se puede escribir; se escribe de forma síncrona hasta que la base responda ({len(batch)} eventos retenidos)")
+            self._stop.wait(self.retry_interval)
+
+        if self._degraded.is_set():
+            self._degraded.clear()
+            print("📝 Audit sink recuperado, vuelve a aceptar eventos")
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "mode": self.mode,
+                "enabled": self.enabled,
+                "degraded": self._degraded.is_set(),
+                "queued": self._queue.qsize(),
+                "max_queue": self._queue.maxsize,
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "batches": self.batches,
+                "rejected": self.rejected,
+                "failed": self.failed
+            }
+
+
+audit_sink = AuditSink(
+    mode=settings.AUDIT_SINK_MODE,
+    max_queue=settings.AUDIT_SINK_MAX_QUEUE,
+    batch_size=settings.AUDIT_SINK_BATCH_SIZE,
+    flush_interval=settings.AUDIT_SINK_FLUSH_INTERVAL_SECONDS,
+    enqueue_timeout=settings.AUDIT_SINK_ENQUEUE_TIMEOUT_SECONDS,
+    retry_interval=settings.AUDIT_SINK_RETRY_INTERVAL_SECONDS
+)
@@ -0,0 +1,154 @@
+"""
+Almacenamiento de binarios direccionado por contenido (SHA-256)
+Las fotos se guardan fuera de Postgres; en la base solo queda el digest
+y el tamaño. Archivos idénticos se guardan una sola vez (dedup).
+"""
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple
+from fastapi import Request, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy import func, select
+from app.config import settings
+
+CHUNK_SIZE = 1024 * 1024
+
+# Firmas de los formatos de imagen soportados (para uploads sin Content-Type)
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+class BlobTooLargeError(Exception):
+    """El contenido supera el tamaño máximo permitido"""
+    pass
+
+
+def guess_image_type(head: bytes) -> Optional[str]:
+    """Detecta el tipo de imagen por sus primeros bytes"""
+    for signature, mime_type in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return mime_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+class LocalBlobStore:
+    """
+    Backend en disco local
+    Ruta: <root>/<2 primeros hex>/<2 siguientes>/<digest completo>
+    """
+
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self._tmp_dir = os.path.join(self.root, ".incoming")
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self.path(digest))
+
+    def open(self, digest: str) -> BinaryIO:
+        return open(self.path(digest), "rb")
+
+    def save_stream(self, chunks: Iterable[bytes], max_bytes: Optional[int] = None) -> Tuple[str, int]:
+        """
+        Escribe el contenido en un archivo temporal calculando el SHA-256
+        en el mismo recorrido y lo mueve a su ruta final (rename atómico).
+        Si el digest ya existe, descarta la copia (dedup).
+
+        Returns:
+            (digest hex, tamaño en bytes)
+        """
+        os.makedirs(self._tmp_dir, exist_ok=True)
+        sha256 = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self._tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                for chunk in chunks:
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise BlobTooLargeError()
+                    sha256.update(chunk)
+                    tmp.write(chunk)
+            digest = sha256.hexdigest()
+            final_path = self.path(digest)
+            if os.path.exists(final_path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.replace(tmp_path, final_path)
+            return digest, size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def save_file(self, file: BinaryIO, max_bytes: Optional[int] = None) -> Tuple[str, int]:
+        """Guarda un archivo leyendo por bloques (nunca entero en memoria)"""
+        return self.save_stream(iter(lambda: file.read(CHUNK_SIZE), b""), max_bytes)
+
+    def save_bytes(self, data: bytes) -> Tuple[str, int]:
+        return self.save_stream([data])
+
+    def delete(self, digest: str) -> None:
+        try:
+            os.remove(self.path(digest))
+        except FileNotFoundError:
+            pass
+
+
+# Registro de backends (un backend S3-compatible se agrega aquí)
+BLOB_BACKENDS: Dict[str, type] = {
+    LocalBlobStore.name: LocalBlobStore,
+}
+
+
+def build_blob_store():
+    """Construye el backend configurado en BLOB_STORE_BACKEND"""
+    backend = BLOB_BACKENDS[settings.BLOB_STORE_BACKEND]
+    return backend(settings.BLOB_STORE_PATH)
+
+
+blob_store = build_blob_store()
+
+
+def lock_digest(db, digest: str) -> None:
+    """
+    Lock de la transacción en curso sobre un digest (pg_advisory_xact_lock)
+
+    Lo toman quien confirma una referencia a un blob y quien borra un blob
+    sin referencias: el que llega segundo espera al commit del primero y ve
+    su resultado (la referencia ya confirmada, o el blob ya borrado)
+    """
+    db.execute(select(func.pg_advisory_xact_lock(func.hashtextextended(digest, 0))))
+
+
+def blob_file_response(request: Request, digest: str, media_type: Optional[str], filename: Optional[str] = None) -> Response:
+    """
+    Respuesta de descarga para un blob
+
+    - FileResponse envía el archivo con sendfile y soporta Range / If-Range
+    - El ETag es el digest: el contenido de un digest nunca cambia, así que
+      If-None-Match responde 304 y el cliente puede cachear sin límite
+    """
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=31536000, immutable"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return FileResponse(
+        blob_store.path(digest),
+        media_type=media_type or "application/octet-stream",
+        filename=filename,
+        headers=headers,
+        content_disposition_type="inline"
+    )
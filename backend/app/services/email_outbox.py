@@ -0,0 +1,278 @@
+"""
+Outbox transaccional de emails
+Los controladores no envían emails en el request: `enqueue` agrega una fila
+a email_outbox en la misma transacción que el usuario o el token que la
+origina (si el commit falla, tampoco queda el email). email_outbox_worker.py
+toma lotes de pendientes con FOR UPDATE SKIP LOCKED y los envía por la API
+batch de Resend o por conexiones SMTP persistentes (smtp_pool). Un envío
+fallido se reintenta con backoff exponencial hasta EMAIL_OUTBOX_MAX_ATTEMPTS.
+
+Los avisos de recordatorios también pasan por aquí: el notification worker
+los encola con su Notification (payload["notification_id"]) y, cuando el
+email queda enviado o fallido, la Notification se actualiza en la misma
+transacción.
+"""
+import math
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import EmailOutbox, Notification
+from app.services.email_service import EmailService, smtp_pool
+
+# template -> función que arma (asunto, HTML, texto) a partir del payload
+EMAIL_TEMPLATES = {
+    "verification": lambda payload: EmailService.verification_email_content(payload["username"], payload["token"]),
+    "password_reset": lambda payload: EmailService.password_reset_email_content(payload["username"], payload["token"]),
+    "reminder": lambda payload: EmailService.reminder_email_content(
+        payload["email"],
+        payload.get("username"),
+        payload["title"],
+        payload.get("description"),
+        payload.get("pet_name"),
+        payload["when"]
+    ),
+}
+
+
+def enqueue(
+    db: Session,
+    to_email: str,
+    template: str,
+    not_before: Optional[datetime] = None,
+    **payload
+) -> EmailOutbox:
+    """
+    Agrega un email al outbox; se confirma con el próximo commit del llamador
+
+    Args:
+        db: Sesión de la transacción que origina el email
+        to_email: Email del destinatario
+        template: Clave de EMAIL_TEMPLATES
+        not_before: El worker del outbox no lo toma antes de esta fecha (quien
+            lo encoló lo envía primero y registra el intento con record_attempt)
+        **payload: Parámetros de la plantilla (serializables a JSON)
+    """
+    if template not in EMAIL_TEMPLATES:
+        raise ValueError(f"Plantilla de email desconocida: {template}")
+    email = EmailOutbox(
+        id=uuid.uuid4(),
+        to_email=to_email,
+        template=template,
+        payload=payload,
+        status="pending",
+        attempts=0,
+        next_attempt_at=not_before or datetime.now(timezone.utc)
+    )
+    db.add(email)
+    return email
+
+
+def render(email: EmailOutbox) -> dict:
+    """Mensaje listo para deliver(); lanza una excepción si la plantilla o el payload son inválidos"""
+    subject, html_content, text_content = EMAIL_TEMPLATES[email.template](email.payload)
+    return {
+        "to_email": email.to_email,
+        "subject": subject,
+        "html_content": html_content,
+        "text_content": text_content
+    }
+
+
+def backoff_seconds(attempts: int) -> float:
+    """
+    Espera antes del próximo intento: EMAIL_OUTBOX_BACKOFF_SECONDS * 2^(intentos-1),
+    con tope y jitter para que los reintentos de un lote fallido no lleguen juntos
+    """
+    delay = min(
+        settings.EMAIL_OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1),
+        settings.EMAIL_OUTBOX_MAX_BACKOFF_SECONDS
+    )
+    return delay * random.uniform(0.5, 1.0)
+
+
+def record_attempt(email: EmailOutbox, response: dict, now: datetime, max_attempts: int) -> str:
+    """Aplica el resultado de un intento; retorna "sent", "retry" o "failed" """
+    email.attempts += 1
+    email.provider_response = response
+    if response["status"] == "sent":
+        email.status = "sent"
+        email.sent_at = now
+        email.last_error = None
+        return "sent"
+    email.last_error = response.get("error")
+    if email.attempts >= max_attempts:
+        email.status = "failed"
+        return "failed"
+    email.next_attempt_at = now + timedelta(seconds=backoff_seconds(email.attempts))
+    return "retry"
+
+
+def sync_notifications(db: Session, emails: Iterable[EmailOutbox], now: datetime) -> None:
+    """Pasa el estado final (sent / failed) de los avisos de recordatorios a su Notification"""
+    updates = [
+        {
+            "id": uuid.UUID(email.payload["notification_id"]),
+            "status": email.status,
+            "provider_response": email.provider_response,
+            "sent_at": email.sent_at or now,
+            "updated_at": now
+        }
+        for email in emails
+        if email.status in ("sent", "failed") and email.payload.get("notification_id")
+    ]
+    if updates:
+        db.execute(update(Notification), updates)
+
+
+def send_timeout(messages: int, concurrency: int) -> float:
+    """Espera máxima para un lote: EMAIL_SEND_TIMEOUT_SECONDS por cada tanda de `concurrency` envíos"""
+    return settings.EMAIL_SEND_TIMEOUT_SECONDS * math.ceil(messages / max(concurrency, 1))
+
+
+def deliver(pool: ThreadPoolExecutor, concurrency: int, messages: List[dict]) -> List[dict]:
+    """
+    Envía los mensajes con el proveedor configurado, una respuesta por mensaje
+
+    - Resend: una llamada a la API batch por cada RESEND_BATCH_SIZE emails
+    - Otros proveedores: en `pool`, con la conexión SMTP persistente de cada hilo.
+      Los que no terminan a tiempo (send_timeout) cuentan como fallidos y se
+      reintentan; quien llama no queda esperando a un servidor colgado
+    """
+    if not messages:
+        return []
+    if settings.EMAIL_PROVIDER == "resend":
+        return EmailService.deliver_batch(messages)
+    futures = [pool.submit(EmailService.deliver, **message) for message in messages]
+    timeout = send_timeout(len(messages), concurrency)
+    wait(futures, timeout=timeout)
+    responses = []
+    for future in futures:
+        if future.done() and not future.cancelled():
+            responses.append(future.result())
+        else:
+            future.cancel()
+            responses.append({
+                "provider": settings.EMAIL_PROVIDER,
+                "status": "failed",
+                "error": f"Sin respuesta del proveedor en {timeout:.0f} s"
+            })
+    return responses
+
+
+def pending_query(now: datetime, limit: int):
+    """Pendientes listos para enviar (ix_email_outbox_pending), SKIP LOCKED entre workers"""
+    return (
+        select(EmailOutbox)
+        .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now)
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .execution_options(populate_existing=True)
+    )
+
+
+class EmailOutboxDispatcher:
+    """
+    Envía un lote de emails pendientes por transacción
+
+    - Resend: una llamada a la API batch por cada RESEND_BATCH_SIZE emails
+    - Otros proveedores: `concurrency` hilos, cada uno con su conexión SMTP persistente
+    """
+
+    def __init__(self, batch_size: int, concurrency: int, max_attempts: int):
+        self.batch_size = batch_size
+        self.concurrency = max(concurrency, 1)
+        self.max_attempts = max_attempts
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.last_batch_ms = 0.0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.concurrency,
+                thread_name_prefix="email-outbox"
+            )
+        return self._executor
+
+    def dispatch_batch(self, db: Session, now: Optional[datetime] = None) -> int:
+        """
+        Envía un lote de pendientes y registra el resultado en una transacción
+
+        Returns:
+            Cantidad de emails procesados (0 si no había pendientes)
+        """
+        now = now or datetime.now(timezone.utc)
+        started_at = time.perf_counter()
+        outcomes = {"sent": 0, "retry": 0, "failed": 0}
+        try:
+            emails = db.execute(pending_query(now, self.batch_size)).scalars().all()
+            if not emails:
+                db.rollback()
+                return 0
+
+            to_send, messages = [], []
+            for email in emails:
+                try:
+                    messages.append(render(email))
+                except Exception as e:
+                    # Plantilla o payload inválidos: reintentar no lo arregla
+                    email.status = "failed"
+                    email.last_error = f"No se pudo armar el email: {str(e)}"
+                    outcomes["failed"] += 1
+                    continue
+                to_send.append(email)
+
+            responses = deliver(self._pool(), self.concurrency, messages)
+            for email, response in zip(to_send, responses):
+                outcomes[record_attempt(email, response, now, self.max_attempts)] += 1
+            sync_notifications(db, emails, now)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        elapsed = time.perf_counter() - started_at
+        with self._stats_lock:
+            self.batches += 1
+            self.sent += outcomes["sent"]
+            self.retried += outcomes["retry"]
+            self.failed += outcomes["failed"]
+            self.busy_seconds += elapsed
+            self.last_batch_ms = elapsed * 1000
+        return len(emails)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "provider": settings.EMAIL_PROVIDER,
+                "batch_size": self.batch_size,
+                "concurrency": self.concurrency,
+                "batches": self.batches,
+                "sent": self.sent,
+                "retried": self.retried,
+                "failed": self.failed,
+                "last_batch_ms": round(self.last_batch_ms, 1),
+                "emails_per_second": round(
+                    (self.sent + self.retried + self.failed) / self.busy_seconds, 1
+                ) if self.busy_seconds else 0.0,
+                "smtp": smtp_pool.stats()
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        smtp_pool.close()
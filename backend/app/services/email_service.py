@@ -1,11 +1,15 @@
 """
 Servicio de envío de emails
-Soporta Resend, Gmail SMTP y modo desarrollo
+Soporta Resend, Gmail SMTP, un proveedor falso (pruebas de carga) y modo desarrollo
 """
+import random
+import threading
+import time
+import uuid
 import resend
-from typing import Optional
+from typing import List, Optional
 from app.config import settings
-from jinja2 import Template
+from app.services.email_templates import email_templates
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -14,13 +18,106 @@ from email.mime.multipart import MIMEMultipart
 if settings.EMAIL_PROVIDER == "resend" and settings.RESEND_API_KEY:
     resend.api_key = settings.RESEND_API_KEY
 
+# Máximo de emails por llamada a la API batch de Resend
+RESEND_BATCH_SIZE = 100
+
+
+class SmtpConnectionPool:
+    """
+    Conexiones SMTP persistentes, una por hilo
+
+    Abrir la conexión, STARTTLS y login cuesta más que enviar el mensaje, así
+    que cada hilo del worker reutiliza la suya. Si el servidor la cerró (o
+    estuvo inactiva más de `max_idle` segundos) se reconecta y reintenta una vez.
+    """
+
+    def __init__(self, host: str, port: int, user: str, password: str, max_idle: float, timeout: float):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[smtplib.SMTP] = []
+        self.connects = 0
+        self.sent = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        server.starttls()
+        server.login(self.user, self.password)
+        with self._lock:
+            self._connections.append(server)
+            self.connects += 1
+        return server
+
+    def _discard(self, server: smtplib.SMTP) -> None:
+        with self._lock:
+            if server in self._connections:
+                self._connections.remove(server)
+        try:
+            server.close()
+        except Exception:
+            pass
+
+    def _connection(self) -> smtplib.SMTP:
+        server = getattr(self._local, "server", None)
+        if server is not None and time.monotonic() - self._local.last_used > self.max_idle:
+            self._discard(server)
+            server = None
+        if server is None:
+            server = self._connect()
+            self._local.server = server
+            self._local.last_used = time.monotonic()
+        return server
+
+    def send(self, msg) -> dict:
+        """Envía el mensaje; retorna los destinatarios rechazados (como send_message)"""
+        server = self._connection()
+        try:
+            refused = server.send_message(msg)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            self._discard(server)
+            self._local.server = server = self._connect()
+            refused = server.send_message(msg)
+        self._local.last_used = time.monotonic()
+        with self._lock:
+            self.sent += 1
+        return refused
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"open": len(self._connections), "connects": self.connects, "sent": self.sent}
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for server in connections:
+            try:
+                server.quit()
+            except Exception:
+                pass
+
+
+smtp_pool = SmtpConnectionPool(
+    host=settings.SMTP_HOST,
+    port=settings.SMTP_PORT,
+    user=settings.SMTP_USER,
+    password=settings.SMTP_PASSWORD,
+    max_idle=settings.SMTP_MAX_IDLE_SECONDS,
+    timeout=settings.EMAIL_SEND_TIMEOUT_SECONDS
+)
+
 class EmailService:
     """Servicio para envío de emails con múltiples proveedores"""
     
     @staticmethod
     def send_verification_email(email: str, username: str, token: str) -> bool:
         """
-        Envía email de verificación
+        Envía email de verificación en el momento (los controladores lo
+        encolan en el outbox con app.services.email_outbox.enqueue)
         
         Args:
             email: Email del destinatario
@@ -30,131 +127,13 @@ class EmailService:
         Returns:
             bool: True si se envió correctamente
         """
-        verification_url = f"{settings.FRONTEND_URL}/verify-email?token={token}"
-        
-        subject = "Verifica tu email - Pet HealthCare"
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <style>
-                body {{
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .container {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    padding: 40px;
-                    border-radius: 10px;
-                    text-align: center;
-                }}
-                .content {{
-                    background: white;
-                    padding: 40px;
-                    border-radius: 8px;
-                    margin-top: 20px;
-                }}
-                .logo {{
-                    font-size: 40px;
-                    margin-bottom: 10px;
-                }}
-                h1 {{
-                    color: #667eea;
-                    margin-bottom: 20px;
-                }}
-                .button {{
-                    display: inline-block;
-                    padding: 14px 30px;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    font-weight: bold;
-                    margin: 20px 0;
-                }}
-                .footer {{
-                    margin-top: 30px;
-                    padding-top: 20px;
-                    border-top: 1px solid #eee;
-                    font-size: 12px;
-                    color: #666;
-                }}
-                .token {{
-                    background: #f5f5f5;
-                    padding: 10px;
-                    border-radius: 5px;
-                    font-family: monospace;
-                    word-break: break-all;
-                    margin: 10px 0;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="logo">🐾</div>
-                <h2 style="color: white; margin: 0;">Pet HealthCare</h2>
-            </div>
-            
-            <div class="content">
-                <h1>¡Bienvenido, {username}! 🎉</h1>
-                
-                <p>Gracias por registrarte en <strong>Pet HealthCare</strong>, tu plataforma para cuidar la salud de tus mascotas.</p>
-                
-                <p>Para completar tu registro, por favor verifica tu email haciendo clic en el botón:</p>
-                
-                <a href="{verification_url}" class="button">Verificar Email</a>
-                
-                <p style="margin-top: 30px; font-size: 14px; color: #666;">
-                    Si el botón no funciona, copia y pega este enlace en tu navegador:
-                </p>
-                <div class="token">{verification_url}</div>
-                
-                <div class="footer">
-                    <p>Este enlace expirará en {settings.EMAIL_VERIFICATION_EXPIRE_HOURS} horas.</p>
-                    <p>Si no creaste esta cuenta, puedes ignorar este email.</p>
-                    <p style="margin-top: 20px;">
-                        <strong>Pet HealthCare</strong><br>
-                        Cuidamos de quienes más amas 💚
-                    </p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        text_content = f"""
-        ¡Bienvenido a Pet HealthCare, {username}!
-        
-        Gracias por registrarte. Para completar tu registro, verifica tu email usando este enlace:
-        
-        {verification_url}
-        
-        Este enlace expirará en {settings.EMAIL_VERIFICATION_EXPIRE_HOURS} horas.
-        
-        Si no creaste esta cuenta, puedes ignorar este email.
-        
-        ---
-        Pet HealthCare - Cuidamos de quienes más amas
-        """
-        
-        return EmailService._send_email(
-            to_email=email,
-            subject=subject,
-            html_content=html_content,
-            text_content=text_content
-        )
+        subject, html_content, text_content = EmailService.verification_email_content(username, token)
+        return EmailService._send_email(email, subject, html_content, text_content)
     
     @staticmethod
     def send_password_reset_email(email: str, username: str, token: str) -> bool:
         """
-        Envía email de reseteo de contraseña
+        Envía email de reseteo de contraseña en el momento
         
         Args:
             email: Email del destinatario
@@ -164,141 +143,71 @@ class EmailService:
         Returns:
             bool: True si se envió correctamente
         """
-        reset_url = f"{settings.FRONTEND_URL}/reset-password?token={token}"
-        
-        subject = "Resetea tu contraseña - Pet HealthCare"
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <style>
-                body {{
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .container {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    padding: 40px;
-                    border-radius: 10px;
-                    text-align: center;
-                }}
-                .content {{
-                    background: white;
-                    padding: 40px;
-                    border-radius: 8px;
-                    margin-top: 20px;
-                }}
-                .logo {{
-                    font-size: 40px;
-                    margin-bottom: 10px;
-                }}
-                h1 {{
-                    color: #667eea;
-                    margin-bottom: 20px;
-                }}
-                .button {{
-                    display: inline-block;
-                    padding: 14px 30px;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    font-weight: bold;
-                    margin: 20px 0;
-                }}
-                .warning {{
-                    background: #fff3cd;
-                    border-left: 4px solid #ffc107;
-                    padding: 15px;
-                    margin: 20px 0;
-                }}
-                .footer {{
-                    margin-top: 30px;
-                    padding-top: 20px;
-                    border-top: 1px solid #eee;
-                    font-size: 12px;
-                    color: #666;
-                }}
-                .token {{
-                    background: #f5f5f5;
-                    padding: 10px;
-                    border-radius: 5px;
-                    font-family: monospace;
-                    word-break: break-all;
-                    margin: 10px 0;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="logo">🔐</div>
-                <h2 style="color: white; margin: 0;">Pet HealthCare</h2>
-            </div>
-            
-            <div class="content">
-                <h1>Reseteo de Contraseña</h1>
-                
-                <p>Hola <strong>{username}</strong>,</p>
-                
-                <p>Recibimos una solicitud para resetear la contraseña de tu cuenta en Pet HealthCare.</p>
-                
-                <a href="{reset_url}" class="button">Resetear Contraseña</a>
-                
-                <p style="margin-top: 30px; font-size: 14px; color: #666;">
-                    Si el botón no funciona, copia y pega este enlace en tu navegador:
-                </p>
-                <div class="token">{reset_url}</div>
-                
-                <div class="warning">
-                    <strong>⚠️ Importante:</strong><br>
-                    Este enlace expirará en <strong>{settings.PASSWORD_RESET_EXPIRE_HOURS} hora(s)</strong>.<br>
-                    Si no solicitaste este cambio, ignora este email y tu contraseña permanecerá sin cambios.
-                </div>
-                
-                <div class="footer">
-                    <p>Por tu seguridad, nunca compartas este enlace con nadie.</p>
-                    <p style="margin-top: 20px;">
-                        <strong>Pet HealthCare</strong><br>
-                        Cuidamos de quienes más amas 💚
-                    </p>
-                </div>
-            </div>
-        </body>
-        </html>
+        subject, html_content, text_content = EmailService.password_reset_email_content(username, token)
+        return EmailService._send_email(email, subject, html_content, text_content)
+    
+    @staticmethod
+    def verification_email_content(username: str, token: str) -> tuple:
         """
+        Arma el email de verificación
         
-        text_content = f"""
-        Reseteo de Contraseña - Pet HealthCare
-        
-        Hola {username},
-        
-        Recibimos una solicitud para resetear la contraseña de tu cuenta.
+        Args:
+            username: Nombre del usuario
+            token: Token de verificación
         
-        Usa este enlace para crear una nueva contraseña:
-        {reset_url}
+        Returns:
+            tuple: (asunto, HTML, texto plano)
+        """
+        return email_templates.render(
+            "verification",
+            username=username,
+            verification_url=f"{settings.FRONTEND_URL}/verify-email?token={token}"
+        )
+    
+    @staticmethod
+    def password_reset_email_content(username: str, token: str) -> tuple:
+        """
+        Arma el email de reseteo de contraseña
         
-        Este enlace expirará en {settings.PASSWORD_RESET_EXPIRE_HOURS} hora(s).
+        Args:
+            username: Nombre del usuario
+            token: Token de reseteo
         
-        Si no solicitaste este cambio, ignora este email.
+        Returns:
+            tuple: (asunto, HTML, texto plano)
+        """
+        return email_templates.render(
+            "password_reset",
+            username=username,
+            reset_url=f"{settings.FRONTEND_URL}/reset-password?token={token}"
+        )
+    
+    @staticmethod
+    def reminder_email_content(
+        email: str,
+        username: Optional[str],
+        title: str,
+        description: Optional[str],
+        pet_name: Optional[str],
+        when: str
+    ) -> tuple:
+        """
+        Arma el aviso de un recordatorio (lo encola el notification worker)
         
-        Por tu seguridad, nunca compartas este enlace con nadie.
+        Args:
+            when: Fecha de la ocurrencia ya formateada en la zona del recordatorio
         
-        ---
-        Pet HealthCare - Cuidamos de quienes más amas
+        Returns:
+            tuple: (asunto, HTML, texto plano)
         """
-        
-        return EmailService._send_email(
-            to_email=email,
-            subject=subject,
-            html_content=html_content,
-            text_content=text_content
+        return email_templates.render(
+            "reminder",
+            email=email,
+            username=username,
+            title=title,
+            description=description,
+            pet_name=pet_name,
+            when=when
         )
     
     @staticmethod
@@ -320,13 +229,33 @@ class EmailService:
         Returns:
             bool: True si se envió correctamente
         """
+        return EmailService.deliver(to_email, subject, html_content, text_content)["status"] == "sent"
+    
+    @staticmethod
+    def deliver(
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: str
+    ) -> dict:
+        """
+        Envía un email con el proveedor configurado (EMAIL_PROVIDER)
+        
+        Returns:
+            dict: {"provider", "status": "sent" | "failed", "id"?, "error"?}
+        """
+        provider = settings.EMAIL_PROVIDER
         try:
-            if settings.EMAIL_PROVIDER == "resend":
-                return EmailService._send_with_resend(
+            if provider == "resend":
+                response = EmailService._send_with_resend(
+                    to_email, subject, html_content, text_content
+                )
+            elif provider == "smtp":
+                response = EmailService._send_with_smtp(
                     to_email, subject, html_content, text_content
                 )
-            elif settings.EMAIL_PROVIDER == "smtp":
-                return EmailService._send_with_smtp(
+            elif provider == "fake":
+                response = EmailService._send_with_fake(
                     to_email, subject, html_content, text_content
                 )
             else:
@@ -338,10 +267,64 @@ class EmailService:
                 print(f"Asunto: {subject}")
                 print(f"Contenido:\n{text_content}")
                 print(f"{'='*60}\n")
-                return True
+                response = {}
+            return {"provider": provider, "status": "sent", **response}
         except Exception as e:
-            print(f"❌ Error enviando email: {str(e)}")
-            return False
+            print(f"❌ Error enviando email ({provider}): {str(e)}")
+            return {"provider": provider, "status": "failed", "error": str(e)}
+    
+    @staticmethod
+    def provider_status() -> dict:
+        """
+        Estado del proveedor configurado, para /health/ready
+        Solo revisa la configuración (sin llamadas de red al proveedor)
+        """
+        provider = settings.EMAIL_PROVIDER
+        if provider == "resend":
+            configured = bool(settings.RESEND_API_KEY)
+        elif provider == "smtp":
+            configured = bool(settings.SMTP_USER and settings.SMTP_PASSWORD)
+        else:
+            configured = True
+        status = {"provider": provider, "status": "ok" if configured else "not_configured"}
+        if provider == "smtp":
+            status["smtp"] = smtp_pool.stats()
+        return status
+    
+    @staticmethod
+    def deliver_batch(messages: List[dict]) -> List[dict]:
+        """
+        Envía varios emails con la API batch de Resend (RESEND_BATCH_SIZE por llamada)
+        
+        Args:
+            messages: Lista de {"to_email", "subject", "html_content", "text_content"}
+        
+        Returns:
+            List[dict]: Una respuesta por mensaje, en el mismo orden (ver deliver)
+        """
+        responses = []
+        for start in range(0, len(messages), RESEND_BATCH_SIZE):
+            chunk = messages[start:start + RESEND_BATCH_SIZE]
+            params = [
+                {
+                    "from": f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>",
+                    "to": [message["to_email"]],
+                    "subject": message["subject"],
+                    "html": message["html_content"],
+                    "text": message["text_content"]
+                }
+                for message in chunk
+            ]
+            try:
+                response = resend.Batch.send(params)
+                data = response.get("data", []) if isinstance(response, dict) else []
+                ids = [item.get("id") for item in data] + [None] * (len(chunk) - len(data))
+                responses.extend({"provider": "resend", "status": "sent", "id": email_id} for email_id in ids)
+                print(f"✅ {len(chunk)} emails enviados via Resend (batch)")
+            except Exception as e:
+                print(f"❌ Error con Resend (batch de {len(chunk)}): {str(e)}")
+                responses.extend({"provider": "resend", "status": "failed", "error": str(e)} for _ in chunk)
+        return responses
     
     @staticmethod
     def _send_with_resend(
@@ -349,23 +332,19 @@ class EmailService:
         subject: str,
         html_content: str,
         text_content: str
-    ) -> bool:
+    ) -> dict:
         """Envía email usando Resend"""
-        try:
-            params = {
-                "from": f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>",
-                "to": [to_email],
-                "subject": subject,
-                "html": html_content,
-                "text": text_content
-            }
-            
-            response = resend.Emails.send(params)
-            print(f"✅ Email enviado via Resend: {response}")
-            return True
-        except Exception as e:
-            print(f"❌ Error con Resend: {str(e)}")
-            return False
+        params = {
+            "from": f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>",
+            "to": [to_email],
+            "subject": subject,
+            "html": html_content,
+            "text": text_content
+        }
+        
+        response = resend.Emails.send(params)
+        print(f"✅ Email enviado via Resend: {response}")
+        return {"id": response.get("id") if isinstance(response, dict) else None}
     
     @staticmethod
     def _send_with_smtp(
@@ -373,28 +352,38 @@ class EmailService:
         subject: str,
         html_content: str,
         text_content: str
-    ) -> bool:
+    ) -> dict:
         """Envía email usando SMTP (Gmail u otro)"""
-        try:
-            msg = MIMEMultipart('alternative')
-            msg['From'] = f"{settings.EMAIL_FROM_NAME} <{settings.SMTP_USER}>"
-            msg['To'] = to_email
-            msg['Subject'] = subject
-            
-            # Agregar contenido texto y HTML
-            part1 = MIMEText(text_content, 'plain')
-            part2 = MIMEText(html_content, 'html')
-            msg.attach(part1)
-            msg.attach(part2)
-            
-            # Conectar y enviar
-            with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-                server.starttls()
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                server.send_message(msg)
-            
-            print(f"✅ Email enviado via SMTP a {to_email}")
-            return True
-        except Exception as e:
-            print(f"❌ Error con SMTP: {str(e)}")
-            return False
\ No newline at end of file
+        msg = MIMEMultipart('alternative')
+        msg['From'] = f"{settings.EMAIL_FROM_NAME} <{settings.SMTP_USER}>"
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        
+        # Agregar contenido texto y HTML
+        part1 = MIMEText(text_content, 'plain')
+        part2 = MIMEText(html_content, 'html')
+        msg.attach(part1)
+        msg.attach(part2)
+        
+        # Conexión persistente del hilo (STARTTLS + login solo al conectar)
+        refused = smtp_pool.send(msg)
+        
+        print(f"✅ Email enviado via SMTP a {to_email}")
+        return {"refused": list(refused)} if refused else {}
+    
+    @staticmethod
+    def _send_with_fake(
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: str
+    ) -> dict:
+        """
+        Proveedor falso para pruebas de carga sin red: no envía nada, solo
+        simula la latencia (FAKE_EMAIL_LATENCY_MS) y una tasa de fallos
+        (FAKE_EMAIL_FAILURE_RATE) de un proveedor real
+        """
+        time.sleep(settings.FAKE_EMAIL_LATENCY_MS / 1000)
+        if random.random() < settings.FAKE_EMAIL_FAILURE_RATE:
+            raise RuntimeError("fallo simulado por el proveedor fake")
+        return {"id": f"fake-{uuid.uuid4()}"}
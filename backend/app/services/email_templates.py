@@ -0,0 +1,159 @@
+"""
+Plantillas de email (Jinja2, app/templates/emails)
+- El CSS de styles.css se copia a atributos style="" una sola vez, al cargar
+  cada plantilla HTML (no en cada envío)
+- Las plantillas compiladas quedan en memoria y en un bytecode cache en disco
+  (EMAIL_TEMPLATE_CACHE_DIR), así que un worker nuevo no vuelve a compilarlas
+- Las constantes (marca, vencimientos de los enlaces) van en los globals del
+  Environment: al enviar solo se renderizan las variables del destinatario
+"""
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+from app.config import settings
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates" / "emails"
+STYLESHEET = "styles.css"
+
+# nombre -> asunto (plantilla de una línea); el cuerpo está en <nombre>.html y <nombre>.txt
+EMAIL_SUBJECTS = {
+    "verification": "Verifica tu email - {{ brand }}",
+    "password_reset": "Resetea tu contraseña - {{ brand }}",
+    "reminder": "Recordatorio{% if pet_name %} de {{ pet_name }}{% endif %}: {{ title }} - {{ brand }}",
+}
+
+_CSS_RULE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_TAG = re.compile(r"<([a-zA-Z][a-zA-Z0-9]*)(\s[^<>]*?)?(/?)>")
+_CLASS_ATTR = re.compile(r'\sclass="([^"]*)"')
+_STYLE_ATTR = re.compile(r'\sstyle="([^"]*)"')
+_SELECTOR = re.compile(r"^\.?[a-zA-Z][\w-]*$")
+
+
+def parse_css(css: str) -> Dict[str, str]:
+    """
+    Reglas de una hoja de estilos simple: {"h1": "color: #667eea", ".button": "..."}
+    Solo selectores de etiqueta o de una clase (los demás se ignoran)
+    """
+    rules: Dict[str, str] = {}
+    for selectors, body in _CSS_RULE.findall(_CSS_COMMENT.sub("", css)):
+        declarations = [part.strip() for part in body.split(";") if part.strip()]
+        declarations = [" ".join(part.split()) for part in declarations]
+        for selector in (s.strip() for s in selectors.split(",")):
+            if _SELECTOR.match(selector):
+                rules[selector] = "; ".join(filter(None, [rules.get(selector), *declarations]))
+    return rules
+
+
+def inline_css(html: str, rules: Dict[str, str]) -> str:
+    """
+    Copia las reglas a atributos style="" de cada etiqueta (etiqueta, luego
+    clases, luego el style propio, que tiene prioridad por ir al final)
+    """
+    def apply(match) -> str:
+        tag, attrs, closing = match.group(1), match.group(2) or "", match.group(3)
+        declarations = []
+        if tag.lower() in rules:
+            declarations.append(rules[tag.lower()])
+        classes = _CLASS_ATTR.search(attrs)
+        if classes:
+            declarations.extend(rules[f".{name}"] for name in classes.group(1).split() if f".{name}" in rules)
+        if not declarations:
+            return match.group(0)
+        own_style = _STYLE_ATTR.search(attrs)
+        if own_style:
+            declarations.append(own_style.group(1).strip().rstrip(";"))
+            attrs = attrs[:own_style.start()] + attrs[own_style.end():]
+        style = "; ".join(declarations) + ";"
+        return f'<{tag}{attrs.rstrip()} style="{style}"{closing}>'
+
+    return _TAG.sub(apply, html)
+
+
+class InlineCssLoader(FileSystemLoader):
+    """FileSystemLoader que entrega las plantillas .html con el CSS ya copiado a style="" """
+
+    def __init__(self, searchpath, stylesheet: str):
+        super().__init__(searchpath)
+        self.rules = parse_css((Path(searchpath) / stylesheet).read_text(encoding="utf-8"))
+
+    def get_source(self, environment, template):
+        source, filename, uptodate = super().get_source(environment, template)
+        if template.endswith(".html"):
+            source = inline_css(source, self.rules)
+        return source, filename, uptodate
+
+
+class EmailTemplates:
+    """Environment de Jinja2 (uno por proceso) y render de los emails"""
+
+    def __init__(self, directory: Path, cache_dir: Optional[str]):
+        self.directory = directory
+        self.cache_dir = cache_dir
+        self._env: Optional[Environment] = None
+        self._subjects: Dict[str, Template] = {}
+        self._lock = threading.Lock()
+
+    def _build_environment(self) -> Environment:
+        bytecode_cache = None
+        if self.cache_dir:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(self.cache_dir)
+            except OSError as e:
+                # Ej. sistema de archivos de solo lectura: se compila en memoria en cada proceso
+                print(f"⚠️ Sin bytecode cache de plantillas ({self.cache_dir}): {str(e)}")
+        env = Environment(
+            loader=InlineCssLoader(self.directory, STYLESHEET),
+            autoescape=select_autoescape(enabled_extensions=("html",), default_for_string=False),
+            bytecode_cache=bytecode_cache,
+            # Las plantillas no cambian con el proceso en marcha: no revisar el disco en cada get_template
+            auto_reload=False,
+            keep_trailing_newline=True
+        )
+        env.globals.update(
+            brand="Pet HealthCare",
+            tagline="Cuidamos de quienes más amas",
+            verification_expire_hours=settings.EMAIL_VERIFICATION_EXPIRE_HOURS,
+            reset_expire_hours=settings.PASSWORD_RESET_EXPIRE_HOURS
+        )
+        return env
+
+    @property
+    def env(self) -> Environment:
+        if self._env is None:
+            with self._lock:
+                if self._env is None:
+                    self._env = self._build_environment()
+        return self._env
+
+    def preload(self) -> None:
+        """Compila todas las plantillas (al iniciar un worker) para que el primer envío no pague la compilación"""
+        for name in EMAIL_SUBJECTS:
+            self._subject(name)
+            self.env.get_template(f"{name}.html")
+            self.env.get_template(f"{name}.txt")
+
+    def _subject(self, name: str) -> Template:
+        template = self._subjects.get(name)
+        if template is None:
+            template = self._subjects[name] = self.env.from_string(EMAIL_SUBJECTS[name])
+        return template
+
+    def render(self, name: str, **context) -> Tuple[str, str, str]:
+        """
+        Renderiza un email con las variables del destinatario
+
+        Returns:
+            tuple: (asunto, HTML, texto plano)
+        """
+        subject = self._subject(name).render(context).strip()
+        html_content = self.env.get_template(f"{name}.html").render(context)
+        text_content = self.env.get_template(f"{name}.txt").render(context)
+        return subject, html_content, text_content
+
+
+email_templates = EmailTemplates(TEMPLATES_DIR, settings.EMAIL_TEMPLATE_CACHE_DIR or None)
@@ -0,0 +1,100 @@
+"""
+Probes de salud para el balanceador
+- Liveness (/health/live): el proceso responde; no toca la base
+- Readiness (/health/ready): SELECT 1 a través del pool con un timeout
+  estricto, saturación del pool y estado del proveedor de email. El
+  resultado se cachea READINESS_CACHE_SECONDS y los probes concurrentes
+  esperan al chequeo en curso, así una ráfaga de probes hace un solo ping
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Optional
+from sqlalchemy import text
+from app.config import settings
+from app.database import get_engine
+from app.services.email_service import EmailService
+
+
+class ReadinessProbe:
+    """Chequeo de dependencias del worker, cacheado por unos segundos"""
+
+    def __init__(self, cache_seconds: float, db_timeout_ms: int, max_pool_saturation: float):
+        self.cache_seconds = cache_seconds
+        self.db_timeout_ms = db_timeout_ms
+        self.max_pool_saturation = max_pool_saturation
+        self._lock = threading.Lock()
+        self._result: Optional[dict] = None
+        self._checked_at = 0.0
+        # El ping corre en su propio hilo: si la base no responde, el probe
+        # no espera más que el timeout y el ping colgado no se duplica
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._ping: Optional[Future] = None
+
+    def _ping_database(self) -> float:
+        started_at = time.perf_counter()
+        with get_engine().connect() as conn:
+            # Dentro de la transacción de esta conexión; el rollback al cerrarla lo revierte
+            conn.execute(text(f"SET LOCAL statement_timeout = {int(self.db_timeout_ms)}"))
+            conn.execute(text("SELECT 1"))
+        return (time.perf_counter() - started_at) * 1000
+
+    def _check_database(self) -> dict:
+        if self._ping is None or self._ping.done():
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="readiness")
+            self._ping = self._executor.submit(self._ping_database)
+        try:
+            latency_ms = self._ping.result(timeout=self.db_timeout_ms / 1000)
+        except TimeoutError:
+            return {"status": "timeout", "timeout_ms": self.db_timeout_ms}
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+        return {"status": "ok", "latency_ms": round(latency_ms, 1)}
+
+    def _check_pool(self) -> dict:
+        pool = get_engine().pool
+        capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+        checked_out = pool.checkedout()
+        saturation = checked_out / capacity if capacity else 0.0
+        return {
+            "status": "ok" if saturation < self.max_pool_saturation else "saturated",
+            "checked_out": checked_out,
+            "capacity": capacity,
+            "saturation": round(saturation, 3)
+        }
+
+    def _run_checks(self) -> dict:
+        pool = self._check_pool()
+        if pool["status"] == "saturated":
+            # Sin conexiones libres el ping solo esperaría al timeout
+            database = {"status": "skipped", "reason": "pool saturado"}
+        else:
+            database = self._check_database()
+        email = EmailService.provider_status()
+        return {
+            # Los emails salen por el outbox: un proveedor mal configurado no saca al worker del balanceador
+            "ready": database["status"] == "ok" and pool["status"] == "ok",
+            "checks": {"database": database, "pool": pool, "email": email}
+        }
+
+    def check(self) -> dict:
+        """Resultado del último chequeo, o uno nuevo si venció el cache"""
+        with self._lock:
+            now = time.monotonic()
+            if self._result is None or now - self._checked_at >= self.cache_seconds:
+                self._result = self._run_checks()
+                self._checked_at = time.monotonic()
+            return {**self._result, "age_seconds": round(time.monotonic() - self._checked_at, 2)}
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+readiness_probe = ReadinessProbe(
+    cache_seconds=settings.READINESS_CACHE_SECONDS,
+    db_timeout_ms=settings.READINESS_DB_TIMEOUT_MS,
+    max_pool_saturation=settings.READINESS_MAX_POOL_SATURATION
+)
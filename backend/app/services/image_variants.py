@@ -0,0 +1,332 @@
+"""
+Variantes redimensionadas de fotos (thumb, small, medium)
+El original se decodifica una sola vez en un pool de procesos y de esa
+imagen salen todos los tamaños. Las variantes van al blob store y quedan
+registradas en image_variants por digest del original, así que cada una
+se genera una sola vez (al subir la foto o en el primer request que la pide)
+"""
+import io
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Tuple
+from fastapi import Request, Response
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models import ImageVariant
+from app.services.blob_store import blob_store, blob_file_response, lock_digest
+
+# Caja máxima (ancho, alto) de cada variante; se conserva la proporción
+VARIANT_SIZES = {
+    "thumb": (160, 160),
+    "small": (480, 480),
+    "medium": (1024, 1024),
+}
+
+# formato -> (formato de Pillow, media type)
+VARIANT_FORMATS = {
+    "webp": ("WEBP", "image/webp"),
+    "jpeg": ("JPEG", "image/jpeg"),
+}
+
+DEFAULT_FORMAT = "webp"
+
+# Originales que fallaron recordados a la vez (los más viejos se olvidan primero)
+FAILURE_CACHE_MAX_ENTRIES = 1024
+
+# Para validar ?size= en las rutas
+SIZE_PATTERN = "^(" + "|".join(VARIANT_SIZES) + ")$"
+
+
+def negotiate_format(accept: str) -> str:
+    """WebP si el cliente lo acepta, si no JPEG"""
+    return "webp" if "image/webp" in accept else "jpeg"
+
+
+def render_variants(source_path: str, fmt: str, quality: int) -> Dict[str, Tuple[bytes, int, int]]:
+    """
+    Se ejecuta en el proceso worker: decodifica el original una vez y
+    genera todos los tamaños, del más grande al más chico
+
+    Returns:
+        {tamaño: (contenido, ancho, alto)}
+    """
+    from PIL import Image, ImageOps
+
+    pil_format = VARIANT_FORMATS[fmt][0]
+    with Image.open(source_path) as original:
+        # En JPEG decodifica directamente a una escala reducida (mucho más rápido)
+        original.draft("RGB", max(VARIANT_SIZES.values()))
+        image = ImageOps.exif_transpose(original)
+    has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+    image = image.convert("RGBA" if has_alpha and fmt == "webp" else "RGB")
+
+    rendered = {}
+    for size, box in sorted(VARIANT_SIZES.items(), key=lambda item: item[1], reverse=True):
+        image.thumbnail(box, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, pil_format, quality=quality)
+        rendered[size] = (buffer.getvalue(), image.width, image.height)
+    return rendered
+
+
+class ImageVariantService:
+    """
+    Genera y cachea variantes en un ProcessPoolExecutor
+
+    - `max_workers` procesos (0 = generar en el hilo que llama)
+    - Una sola generación en vuelo por (original, formato): los requests
+      concurrentes que piden la misma variante esperan el mismo Future
+    - Cada generación corre en un hilo propio del servicio que espera al
+      proceso y guarda el resultado con su propia sesión (nunca en el hilo
+      de callbacks del pool)
+    - Si el original no se puede decodificar, el fallo se recuerda
+      `failure_ttl` segundos: los requests siguientes sirven el original
+      sin volver a mandar la imagen al pool
+    - Si la generación falla o tarda más de `timeout`, el llamador sirve
+      el original (nunca se rompe la descarga por una variante)
+    """
+
+    def __init__(self, max_workers: int, quality: int, timeout: float, failure_ttl: float):
+        self.max_workers = max_workers
+        self.quality = quality
+        self.timeout = timeout
+        self.failure_ttl = failure_ttl
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pipelines: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        # (original, formato) -> momento (monotonic) en que vence el fallo
+        self._failures: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._in_flight_lock = threading.Lock()
+        self.generated = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Crea el pool de forma perezosa en la primera llamada"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    # spawn evita heredar locks de hilos al hacer fork de un proceso con threads
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+        return self._executor
+
+    def _get_pipelines(self) -> ThreadPoolExecutor:
+        """Hilos que esperan a los procesos y guardan las variantes (uno por proceso)"""
+        if self._pipelines is None:
+            with self._executor_lock:
+                if self._pipelines is None:
+                    self._pipelines = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="image-variants"
+                    )
+        return self._pipelines
+
+    @staticmethod
+    def _store(source_sha256: str, fmt: str, rendered: Dict[str, Tuple[bytes, int, int]]) -> Dict[str, str]:
+        """Guarda las variantes en el blob store y las registra (idempotente)"""
+        contents = {}
+        rows = []
+        for size, (content, width, height) in rendered.items():
+            digest, file_size = blob_store.save_bytes(content)
+            contents[digest] = content
+            rows.append({
+                "id": uuid.uuid4(),
+                "source_sha256": source_sha256,
+                "size": size,
+                "format": fmt,
+                "width": width,
+                "height": height,
+                "sha256": digest,
+                "file_size_bytes": file_size
+            })
+
+        db = SessionLocal()
+        try:
+            # Mismo lock que release_blob: si otra foto liberó el mismo
+            # digest entre el save y el lock, el blob se vuelve a escribir.
+            # Orden fijo para que dos generaciones no se bloqueen entre sí
+            for digest in sorted(contents):
+                lock_digest(db, digest)
+                if not blob_store.exists(digest):
+                    blob_store.save_bytes(contents[digest])
+            db.execute(
+                insert(ImageVariant).values(rows).on_conflict_do_nothing(
+                    constraint="uq_image_variants_source_size_format"
+                )
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        return {row["size"]: row["sha256"] for row in rows}
+
+    def _render(self, source_sha256: str, fmt: str) -> Dict[str, Tuple[bytes, int, int]]:
+        if self.max_workers <= 0:
+            return render_variants(blob_store.path(source_sha256), fmt, self.quality)
+        executor = self._get_executor()
+        try:
+            return executor.submit(render_variants, blob_store.path(source_sha256), fmt, self.quality).result()
+        except BrokenProcessPool:
+            # El proceso murió decodificando (ej. sin memoria): el próximo pedido usa un pool nuevo
+            with self._executor_lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def _run(self, key: Tuple[str, str]) -> Dict[str, str]:
+        """Decodifica, guarda y saca la generación de _in_flight (en el hilo del servicio o en el que llama)"""
+        try:
+            try:
+                rendered = self._render(*key)
+            except Exception as e:
+                with self._in_flight_lock:
+                    self._failures[key] = time.monotonic() + self.failure_ttl
+                    self._failures.move_to_end(key)
+                    while len(self._failures) > FAILURE_CACHE_MAX_ENTRIES:
+                        self._failures.popitem(last=False)
+                    self.failed += 1
+                print(f"⚠️ No se pudo decodificar {key[0][:12]} ({key[1]}), se sirve el original por {self.failure_ttl:.0f}s: {str(e)}")
+                raise
+            try:
+                digests = self._store(key[0], key[1], rendered)
+            except Exception as e:
+                # Error de base o de disco: no se recuerda, el próximo request reintenta
+                with self._in_flight_lock:
+                    self.failed += 1
+                print(f"⚠️ Error guardando variantes de {key[0][:12]} ({key[1]}): {str(e)}")
+                raise
+            with self._in_flight_lock:
+                self.generated += len(digests)
+            return digests
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.pop(key, None)
+
+    def _known_failure(self, key: Tuple[str, str]) -> bool:
+        """True si el original falló hace menos de failure_ttl (llamar con _in_flight_lock)"""
+        expires_at = self._failures.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._failures[key]
+            return False
+        return True
+
+    def _generate(self, source_sha256: str, fmt: str) -> Optional[Future]:
+        """
+        Future con {tamaño: digest} de todas las variantes del original en ese formato
+
+        None si el original falló hace poco (no se vuelve a intentar hasta que venza)
+        """
+        key = (source_sha256, fmt)
+        with self._in_flight_lock:
+            stored = self._in_flight.get(key)
+            if stored is not None:
+                return stored
+            if self._known_failure(key):
+                self.skipped += 1
+                return None
+            if self.max_workers > 0:
+                stored = self._get_pipelines().submit(self._run, key)
+                self._in_flight[key] = stored
+                return stored
+            stored = Future()
+            self._in_flight[key] = stored
+
+        try:
+            stored.set_result(self._run(key))
+        except Exception as e:
+            stored.set_exception(e)
+        return stored
+
+    def schedule(self, source_sha256: Optional[str]) -> None:
+        """Genera en segundo plano las variantes de una foto recién subida (no bloquea el request)"""
+        if source_sha256 and self.max_workers > 0:
+            self._generate(source_sha256, DEFAULT_FORMAT)
+
+    def get(self, db: Session, source_sha256: str, size: str, fmt: str) -> Optional[str]:
+        """
+        Digest de la variante pedida; si no existe todavía la genera ahora
+
+        Returns:
+            Digest de la variante, o None si no se pudo generar
+        """
+        digest = db.query(ImageVariant.sha256).filter(
+            ImageVariant.source_sha256 == source_sha256,
+            ImageVariant.size == size,
+            ImageVariant.format == fmt
+        ).scalar()
+        if digest and blob_store.exists(digest):
+            return digest
+        generating = self._generate(source_sha256, fmt)
+        if generating is None:
+            return None
+        try:
+            return generating.result(timeout=self.timeout)[size]
+        except TimeoutError:
+            print(f"⚠️ Variante {size} de {source_sha256[:12]} tardó más de {self.timeout}s, se sirve el original")
+        except Exception:
+            pass
+        return None
+
+    def response(
+        self,
+        db: Session,
+        request: Request,
+        source_sha256: str,
+        size: Optional[str],
+        media_type: Optional[str],
+        filename: Optional[str] = None
+    ) -> Response:
+        """Descarga de la variante `size` (o del original si no se pide o no se pudo generar)"""
+        if size:
+            fmt = negotiate_format(request.headers.get("accept", ""))
+            digest = self.get(db, source_sha256, size, fmt)
+            if digest:
+                response = blob_file_response(request, digest, VARIANT_FORMATS[fmt][1])
+                response.headers["Vary"] = "Accept"
+                return response
+        return blob_file_response(request, source_sha256, media_type, filename)
+
+    def stats(self) -> dict:
+        with self._in_flight_lock:
+            return {
+                "workers": self.max_workers,
+                "in_flight": len(self._in_flight),
+                "generated": self.generated,
+                "failed": self.failed,
+                "failures_cached": len(self._failures),
+                "skipped": self.skipped
+            }
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._pipelines is not None:
+                # Sin esperar: los hilos terminan cuando el pool de procesos cancela lo pendiente
+                self._pipelines.shutdown(wait=False, cancel_futures=True)
+                self._pipelines = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+image_variants = ImageVariantService(
+    max_workers=settings.IMAGE_VARIANT_WORKERS,
+    quality=settings.IMAGE_VARIANT_QUALITY,
+    timeout=settings.IMAGE_VARIANT_TIMEOUT_SECONDS,
+    failure_ttl=settings.IMAGE_VARIANT_FAILURE_TTL_SECONDS
+)
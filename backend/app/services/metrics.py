@@ -0,0 +1,162 @@
+"""
+Métricas Prometheus (GET /metrics, formato de texto)
+- HTTP: latencia por plantilla de ruta, requests en curso y por status
+- Pool de SQLAlchemy: conexiones en uso / overflow y espera por una conexión
+- Pool de bcrypt, cola de auditoría y cachés en memoria (aciertos y tasa)
+
+Multiproceso: con PROMETHEUS_MULTIPROC_DIR definido cada worker de
+uvicorn/gunicorn escribe sus métricas en archivos mmap de ese directorio y
+/metrics agrega las de todos los procesos. El directorio debe existir y
+estar vacío al iniciar el servidor (lo vacía el comando web del Procfile);
+al cerrar, cada worker se marca como muerto para que sus gauges dejen de
+sumarse. Los gauges usan "livesum": la suma de los procesos vivos (ej.
+conexiones en uso en todos los workers). Los acumulados (rechazos, aciertos
+de caché) son Counters: siguen sumando los de workers ya reciclados.
+
+Este módulo solo define las métricas (no importa la base ni los servicios):
+database.py lo usa para medir la espera del pool.
+"""
+import os
+import threading
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+# ============================================
+# HTTP
+# ============================================
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Requests HTTP atendidos",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Latencia de los requests HTTP por plantilla de ruta",
+    ["method", "route"]
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests HTTP en curso",
+    ["method"],
+    multiprocess_mode="livesum"
+)
+
+# ============================================
+# POOL DE CONEXIONES (engine="sync" | "async")
+# ============================================
+DB_POOL_SIZE = Gauge("db_pool_size", "Tamaño configurado del pool", ["engine"], multiprocess_mode="livesum")
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Conexiones en uso", ["engine"], multiprocess_mode="livesum")
+DB_POOL_CHECKED_IN = Gauge("db_pool_checked_in", "Conexiones libres en el pool", ["engine"], multiprocess_mode="livesum")
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Conexiones abiertas por encima de pool_size", ["engine"], multiprocess_mode="livesum")
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Espera para obtener una conexión del pool (incluye abrir una nueva)",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+DB_POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Requests que no obtuvieron conexión a tiempo", ["engine"])
+
+# ============================================
+# SERVICIOS EN SEGUNDO PLANO
+# ============================================
+PASSWORD_HASH_IN_FLIGHT = Gauge("password_hash_in_flight", "Hashes de contraseña en el pool (corriendo o en cola)", multiprocess_mode="livesum")
+PASSWORD_HASH_QUEUE_DEPTH = Gauge("password_hash_queue_depth", "Hashes de contraseña esperando un proceso libre", multiprocess_mode="livesum")
+PASSWORD_HASH_REJECTED = Counter("password_hash_rejected_total", "Hashes rechazados por cola llena")
+AUDIT_SINK_QUEUE_DEPTH = Gauge("audit_sink_queue_depth", "Eventos de auditoría en cola", multiprocess_mode="livesum")
+IMAGE_VARIANTS_IN_FLIGHT = Gauge("image_variants_in_flight", "Fotos con variantes generándose", multiprocess_mode="livesum")
+
+# ============================================
+# CACHÉS EN MEMORIA
+# ============================================
+CACHE_HITS = Counter("app_cache_hits_total", "Aciertos de la caché", ["cache"])
+CACHE_MISSES = Counter("app_cache_misses_total", "Fallos de la caché", ["cache"])
+CACHE_ENTRIES = Gauge("app_cache_entries", "Entradas en la caché", ["cache"], multiprocess_mode="livesum")
+CACHE_HIT_RATIO = Gauge("app_cache_hit_ratio", "Tasa de aciertos de la caché por proceso", ["cache"], multiprocess_mode="liveall")
+
+
+class _TimedCheckout:
+    """Mide en DB_POOL_WAIT cuánto tarda el pool en entregar una conexión"""
+
+    metrics_engine = "sync"
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.labels(self.metrics_engine).inc()
+            raise
+        finally:
+            DB_POOL_WAIT.labels(self.metrics_engine).observe(time.perf_counter() - started_at)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    metrics_engine = "sync"
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    metrics_engine = "async"
+
+
+def set_pool_gauges(label: str, pool) -> None:
+    DB_POOL_SIZE.labels(label).set(pool.size())
+    DB_POOL_CHECKED_OUT.labels(label).set(pool.checkedout())
+    DB_POOL_CHECKED_IN.labels(label).set(pool.checkedin())
+    # QueuePool.overflow() arranca en -pool_size: solo cuenta lo que excede pool_size
+    DB_POOL_OVERFLOW.labels(label).set(max(pool.overflow(), 0))
+
+
+# Último acumulado copiado a cada Counter: los servicios cuentan por su cuenta
+# y acá se suma solo la diferencia
+_copied_totals: dict = {}
+_copied_totals_lock = threading.Lock()
+
+
+def inc_to_total(counter: Counter, total: float, *labels: str) -> None:
+    """Incrementa `counter` hasta el acumulado `total` del servicio"""
+    key = (id(counter), labels)
+    with _copied_totals_lock:
+        previous = _copied_totals.get(key, 0)
+        # Si el servicio reinició su contador, todo lo nuevo es incremento
+        increment = total - previous if total >= previous else total
+        _copied_totals[key] = total
+        if increment > 0:
+            (counter.labels(*labels) if labels else counter).inc(increment)
+
+
+def set_cache_gauges(name: str, stats: dict) -> None:
+    inc_to_total(CACHE_HITS, stats["hits"], name)
+    inc_to_total(CACHE_MISSES, stats["misses"], name)
+    CACHE_ENTRIES.labels(name).set(stats.get("size", 0))
+    CACHE_HIT_RATIO.labels(name).set(stats["hit_rate"])
+
+
+def render_metrics() -> bytes:
+    """Texto de /metrics: el registro del proceso o el agregado de todos los workers"""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead() -> None:
+    """Al cerrar un worker: sus gauges "live" dejan de contarse"""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
@@ -0,0 +1,250 @@
+"""
+Despacho de notificaciones de recordatorios
+El worker (notification_worker.py) procesa lotes de recordatorios vencidos
+en dos transacciones cortas, sin tener filas bloqueadas mientras envía:
+
+1. Toma el lote con FOR UPDATE SKIP LOCKED, avanza next_fire_at, inserta
+   las Notification (un solo INSERT multi-fila) y encola cada email en el
+   outbox (app/services/email_outbox.py), y hace commit.
+2. Envía los emails del lote en paralelo (concurrencia acotada, con
+   EMAIL_SEND_TIMEOUT_SECONDS por envío) y registra cada intento en su fila
+   del outbox y en su Notification.
+
+Varios workers pueden correr a la vez: cada uno bloquea su lote y los demás
+lo saltan. Un envío fallido o sin respuesta queda pendiente en el outbox y
+lo reintenta email_outbox_worker.py con backoff, hasta
+EMAIL_OUTBOX_MAX_ATTEMPTS. Si el worker muere entre los dos pasos, el outbox
+envía esos emails cuando vence su espera (entrega "al menos una vez").
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import EmailOutbox, Notification, Pet, Reminder, User
+from app.services.email_outbox import deliver, enqueue, record_attempt, render, send_timeout, sync_notifications
+from app.services.email_service import smtp_pool
+from app.services.reminder_scheduler import advance, due_query
+from app.utils.recurrence import to_local
+
+
+class NotificationDispatcher:
+    """
+    Envía las notificaciones de un lote de recordatorios vencidos
+
+    - batch_size: recordatorios bloqueados por transacción
+    - concurrency: emails en vuelo a la vez (hilos; el envío es I/O)
+    - max_attempts: intentos de un email antes de darlo por fallido (el
+      primero es el de este worker, el resto los hace el outbox)
+    """
+
+    def __init__(self, batch_size: int, concurrency: int, max_attempts: int = settings.EMAIL_OUTBOX_MAX_ATTEMPTS):
+        self.batch_size = batch_size
+        self.concurrency = max(concurrency, 1)
+        self.max_attempts = max_attempts
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats_lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self.batches = 0
+        self.reminders = 0
+        self.unscheduled = 0
+        self.emails_sent = 0
+        self.emails_retried = 0
+        self.emails_failed = 0
+        self.in_app = 0
+        self.busy_seconds = 0.0
+        self.last_batch_ms = 0.0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.concurrency,
+                thread_name_prefix="notification-email"
+            )
+        return self._executor
+
+    @staticmethod
+    def _recipients(db: Session, reminders: List[Reminder]) -> tuple:
+        """Email/usuario de los dueños y nombre de las mascotas del lote (dos consultas)"""
+        owner_ids = {reminder.owner_id for reminder in reminders}
+        pet_ids = {reminder.pet_id for reminder in reminders if reminder.pet_id}
+        owners = {
+            row.id: row
+            for row in db.execute(
+                select(User.id, User.email, User.username).where(User.id.in_(owner_ids))
+            )
+        }
+        pets = {}
+        if pet_ids:
+            pets = dict(db.execute(select(Pet.id, Pet.name).where(Pet.id.in_(pet_ids))).all())
+        return owners, pets
+
+    @staticmethod
+    def _row(reminder: Reminder, method: str, status: str, provider_response: Optional[dict], sent_at: datetime) -> dict:
+        return {
+            "id": uuid.uuid4(),
+            "reminder_id": reminder.id,
+            "owner_id": reminder.owner_id,
+            "pet_id": reminder.pet_id,
+            "sent_at": sent_at,
+            "method": method,
+            "status": status,
+            "provider_response": provider_response,
+            "created_at": sent_at,
+            "updated_at": sent_at
+        }
+
+    def _claim(self, db: Session, now: datetime) -> tuple:
+        """
+        Paso 1: toma el lote, avanza los recordatorios, registra las
+        notificaciones y encola los emails, en una transacción
+
+        Returns:
+            (recordatorios, ids de los emails encolados, mensajes a enviar,
+            notificaciones in-app, recordatorios que quedaron sin programar)
+        """
+        try:
+            reminders = db.execute(due_query(now, self.batch_size)).scalars().all()
+            if not reminders:
+                db.rollback()
+                return 0, [], [], 0, 0
+            owners, pets = self._recipients(db, reminders)
+            # El outbox no los toma mientras este worker los envía
+            hold_until = now + timedelta(seconds=2 * send_timeout(len(reminders), self.concurrency))
+
+            rows, emails, messages = [], [], []
+            in_app = unscheduled = 0
+            for reminder in reminders:
+                if reminder.notify_in_app:
+                    rows.append(self._row(reminder, "in_app", "sent", None, now))
+                    in_app += 1
+                owner = owners.get(reminder.owner_id)
+                if reminder.notify_by_email and owner is not None and owner.email:
+                    notification = self._row(reminder, "email", "pending", None, now)
+                    rows.append(notification)
+                    email = enqueue(
+                        db,
+                        owner.email,
+                        "reminder",
+                        not_before=hold_until,
+                        notification_id=str(notification["id"]),
+                        email=owner.email,
+                        username=owner.username,
+                        title=reminder.title,
+                        description=reminder.description,
+                        pet_name=pets.get(reminder.pet_id),
+                        when=to_local(reminder.next_fire_at, reminder.timezone).strftime("%d/%m/%Y %H:%M")
+                    )
+                    try:
+                        messages.append(render(email))
+                        emails.append(email.id)
+                    except Exception as e:
+                        # Queda para el outbox, que lo marca como fallido
+                        email.next_attempt_at = now
+                        print(f"⚠️ No se pudo armar el aviso del recordatorio {reminder.id}: {str(e)}")
+                try:
+                    advance(reminder, now)
+                except Exception as e:
+                    # Una regla que no se puede evaluar no debe trabar el lote entero
+                    reminder.last_fired_at = reminder.next_fire_at
+                    reminder.next_fire_at = None
+                    unscheduled += 1
+                    print(f"⚠️ Recordatorio {reminder.id} queda sin programar: {str(e)}")
+
+            if rows:
+                db.execute(insert(Notification), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return len(reminders), emails, messages, in_app, unscheduled
+
+    def _record(self, db: Session, email_ids: List[uuid.UUID], responses: List[dict]) -> dict:
+        """Paso 3: registra el resultado de cada envío en el outbox y en su Notification"""
+        outcomes = {"sent": 0, "retry": 0, "failed": 0}
+        now = datetime.now(timezone.utc)
+        try:
+            # Los que el outbox ya tomó (si la espera venció) los registra él
+            emails = {
+                email.id: email
+                for email in db.execute(
+                    select(EmailOutbox)
+                    .where(EmailOutbox.id.in_(email_ids), EmailOutbox.status == "pending")
+                    .with_for_update(skip_locked=True)
+                    .execution_options(populate_existing=True)
+                ).scalars()
+            }
+            for email_id, response in zip(email_ids, responses):
+                email = emails.get(email_id)
+                if email is not None:
+                    outcomes[record_attempt(email, response, now, self.max_attempts)] += 1
+            sync_notifications(db, emails.values(), now)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return outcomes
+
+    def dispatch_batch(self, db: Session, now: Optional[datetime] = None) -> int:
+        """
+        Procesa un lote de recordatorios vencidos
+
+        Los emails se envían después del commit que avanza los recordatorios;
+        un envío fallido queda en el outbox para reintentarse.
+
+        Returns:
+            Cantidad de recordatorios procesados (0 si no había vencidos)
+        """
+        now = now or datetime.now(timezone.utc)
+        started_at = time.perf_counter()
+        processed, email_ids, messages, in_app, unscheduled = self._claim(db, now)
+        if not processed:
+            return 0
+
+        outcomes = {"sent": 0, "retry": 0, "failed": 0}
+        if email_ids:
+            responses = deliver(self._pool(), self.concurrency, messages)
+            outcomes = self._record(db, email_ids, responses)
+
+        elapsed = time.perf_counter() - started_at
+        with self._stats_lock:
+            self.batches += 1
+            self.reminders += processed
+            self.unscheduled += unscheduled
+            self.emails_sent += outcomes["sent"]
+            self.emails_retried += outcomes["retry"]
+            self.emails_failed += outcomes["failed"]
+            self.in_app += in_app
+            self.busy_seconds += elapsed
+            self.last_batch_ms = elapsed * 1000
+        return processed
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            notifications = self.emails_sent + self.emails_retried + self.emails_failed + self.in_app
+            return {
+                "batch_size": self.batch_size,
+                "concurrency": self.concurrency,
+                "batches": self.batches,
+                "reminders": self.reminders,
+                "unscheduled": self.unscheduled,
+                "emails_sent": self.emails_sent,
+                "emails_retried": self.emails_retried,
+                "emails_failed": self.emails_failed,
+                "in_app": self.in_app,
+                "last_batch_ms": round(self.last_batch_ms, 1),
+                # Throughput durante los lotes (sin contar la espera entre ciclos)
+                "reminders_per_second": round(self.reminders / self.busy_seconds, 1) if self.busy_seconds else 0.0,
+                "notifications_per_second": round(notifications / self.busy_seconds, 1) if self.busy_seconds else 0.0,
+                "uptime_seconds": round(time.monotonic() - self._started_at, 1)
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        smtp_pool.close()
@@ -0,0 +1,164 @@
+"""
+Servicio de hashing de contraseñas en un pool de procesos acotado
+Saca bcrypt del threadpool de FastAPI para que no compita por el GIL
+"""
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Tuple
+from app.config import settings
+from app.utils.exceptions import ServiceBusyException
+
+
+class PasswordHashingService:
+    """
+    Ejecuta funciones de hashing/verificación en un ProcessPoolExecutor
+
+    - `max_workers` procesos (0 = ejecutar en el hilo que llama)
+    - `max_pending` llamadas en vuelo como máximo; por encima de ese
+      límite se responde 503 inmediatamente en lugar de encolar
+    - Si un proceso muere (ej. lo mata el OOM killer) el pool queda roto:
+      se descarta, se crea uno nuevo y la llamada se reintenta una vez
+    - Registra la latencia de cada llamada (espera en cola + cómputo)
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._stats_lock = threading.Lock()
+        self.in_flight = 0
+        self.calls = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Crea el pool de forma perezosa en la primera llamada"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    # spawn evita heredar locks de hilos al hacer fork de un proceso con threads
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+        return self._executor
+
+    def _acquire_slot(self) -> float:
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self.rejected += 1
+            raise ServiceBusyException()
+        with self._stats_lock:
+            self.in_flight += 1
+        return time.perf_counter()
+
+    def _release_slot(self, started_at: float) -> None:
+        elapsed = time.perf_counter() - started_at
+        with self._stats_lock:
+            self.in_flight -= 1
+            self.calls += 1
+            self.total_seconds += elapsed
+            if elapsed > self.max_seconds:
+                self.max_seconds = elapsed
+        self._slots.release()
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Descarta un pool roto; la próxima llamada crea uno nuevo"""
+        with self._executor_lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        with self._stats_lock:
+            self.restarts += 1
+        print("⚠️ El pool de hashing quedó roto (murió un proceso), se recrea")
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, fn: Callable, *args) -> Tuple[ProcessPoolExecutor, Future]:
+        started_at = self._acquire_slot()
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._release_slot(started_at)
+            self._discard_executor(executor)
+            raise
+        except Exception:
+            self._release_slot(started_at)
+            raise
+        future.add_done_callback(lambda _: self._release_slot(started_at))
+        return executor, future
+
+    def _run_once(self, fn: Callable, *args) -> Any:
+        executor, future = self._submit(fn, *args)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            raise
+
+    async def _run_once_async(self, fn: Callable, *args) -> Any:
+        executor, future = self._submit(fn, *args)
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            raise
+
+    def run(self, fn: Callable, *args) -> Any:
+        """
+        Ejecuta `fn(*args)` y bloquea hasta tener el resultado.
+        Pensado para los endpoints sync: el hilo del threadpool solo espera,
+        el trabajo de CPU ocurre en otro proceso.
+        """
+        if self.max_workers <= 0:
+            started_at = self._acquire_slot()
+            try:
+                return fn(*args)
+            finally:
+                self._release_slot(started_at)
+        try:
+            return self._run_once(fn, *args)
+        except BrokenProcessPool:
+            return self._run_once(fn, *args)
+
+    async def run_async(self, fn: Callable, *args) -> Any:
+        """Versión awaitable de `run` para endpoints async"""
+        if self.max_workers <= 0:
+            return self.run(fn, *args)
+        try:
+            return await self._run_once_async(fn, *args)
+        except BrokenProcessPool:
+            return await self._run_once_async(fn, *args)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "in_flight": self.in_flight,
+                "calls": self.calls,
+                "rejected": self.rejected,
+                "restarts": self.restarts,
+                "avg_ms": round(self.total_seconds / self.calls * 1000, 2) if self.calls else 0.0,
+                "max_ms": round(self.max_seconds * 1000, 2)
+            }
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHashingService(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
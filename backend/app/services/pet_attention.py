@@ -0,0 +1,121 @@
+"""
+Mascotas que necesitan atención en una sola consulta
+Un CTE por tipo de pendiente (vacunas, desparasitaciones, controles
+veterinarios) agrega por pet_id la fecha vencida más antigua y la próxima
+dentro del horizonte; la consulta final une los CTEs a pets y trae solo
+las columnas necesarias (nunca el Pet completo ni sus binarios)
+"""
+from datetime import date, timedelta
+from typing import List
+from sqlalchemy import exists, func, or_, select
+from sqlalchemy.orm import Session, aliased
+from app.models import Deworming, Pet, Vaccination, VetVisit
+
+DEFAULT_HORIZON_DAYS = 7
+
+
+def _due_cte(model, due_column, owner_id, today, horizon_days: int, name: str, *criteria):
+    """Por mascota: vencimiento más antiguo (< hoy) y próximo (hoy .. hoy+horizonte)"""
+    return (
+        select(
+            model.pet_id.label("pet_id"),
+            func.min(due_column).filter(due_column < today).label("overdue_since"),
+            func.min(due_column).filter(due_column >= today).label("next_due")
+        )
+        .join(Pet, Pet.id == model.pet_id)
+        .where(
+            Pet.owner_id == owner_id,
+            due_column.isnot(None),
+            due_column <= today + timedelta(days=horizon_days),
+            *criteria
+        )
+        .group_by(model.pet_id)
+        .cte(name)
+    )
+
+
+def attention_query(
+    owner_id,
+    today: date,
+    vaccine_days: int = DEFAULT_HORIZON_DAYS,
+    deworming_days: int = DEFAULT_HORIZON_DAYS,
+    follow_up_days: int = DEFAULT_HORIZON_DAYS
+):
+    """
+    SELECT por mascota con algún pendiente: id, nombre, especie y las
+    fechas vencida / próxima de vacunas, desparasitaciones y controles
+    """
+    vaccines = _due_cte(Vaccination, Vaccination.next_due, owner_id, today, vaccine_days, "vaccine_due")
+    dewormings = _due_cte(Deworming, Deworming.next_due, owner_id, today, deworming_days, "deworming_due")
+
+    # Un control está pendiente si no hubo otra visita después de la que lo indicó
+    later_visit = aliased(VetVisit)
+    follow_up_day = func.date(VetVisit.follow_up_date)
+    follow_ups = _due_cte(
+        VetVisit, follow_up_day, owner_id, today, follow_up_days, "follow_up_due",
+        ~exists().where(
+            later_visit.pet_id == VetVisit.pet_id,
+            later_visit.visit_date > VetVisit.visit_date
+        )
+    )
+
+    return (
+        select(
+            Pet.id,
+            Pet.name,
+            Pet.species,
+            vaccines.c.overdue_since.label("vaccine_overdue_since"),
+            vaccines.c.next_due.label("vaccine_next_due"),
+            dewormings.c.overdue_since.label("deworming_overdue_since"),
+            dewormings.c.next_due.label("deworming_next_due"),
+            follow_ups.c.overdue_since.label("follow_up_overdue_since"),
+            follow_ups.c.next_due.label("follow_up_next_due")
+        )
+        .outerjoin(vaccines, vaccines.c.pet_id == Pet.id)
+        .outerjoin(dewormings, dewormings.c.pet_id == Pet.id)
+        .outerjoin(follow_ups, follow_ups.c.pet_id == Pet.id)
+        .where(
+            Pet.owner_id == owner_id,
+            or_(
+                vaccines.c.pet_id.isnot(None),
+                dewormings.c.pet_id.isnot(None),
+                follow_ups.c.pet_id.isnot(None)
+            )
+        )
+        .order_by(Pet.name, Pet.id)
+    )
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def get_pets_needing_attention(
+    db: Session,
+    owner_id,
+    vaccine_days: int = DEFAULT_HORIZON_DAYS,
+    deworming_days: int = DEFAULT_HORIZON_DAYS,
+    follow_up_days: int = DEFAULT_HORIZON_DAYS
+) -> List[dict]:
+    """
+    Pendientes por mascota
+
+    Returns:
+        Lista de dicts con pet_id, pet_name, species, una bandera por pendiente
+        (vaccine_overdue, vaccine_upcoming, ...) y la fecha más temprana de cada uno
+    """
+    rows = db.execute(attention_query(
+        owner_id, date.today(), vaccine_days, deworming_days, follow_up_days
+    )).all()
+    pets = []
+    for row in rows:
+        item = {"pet_id": str(row.id), "pet_name": row.name, "species": row.species}
+        for kind in ("vaccine", "deworming", "follow_up"):
+            overdue_since = getattr(row, f"{kind}_overdue_since")
+            next_due = getattr(row, f"{kind}_next_due")
+            item[f"{kind}_overdue"] = overdue_since is not None
+            item[f"{kind}_overdue_since"] = _iso(overdue_since)
+            item[f"{kind}_upcoming"] = next_due is not None
+            item[f"{kind}_next_due"] = _iso(next_due)
+        pets.append(item)
+    return pets
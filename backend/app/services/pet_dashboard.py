@@ -0,0 +1,151 @@
+"""
+Dashboard de mascotas con un número fijo de consultas
+Cada sección es una consulta por conjunto para todas las mascotas del dueño
+(DISTINCT ON pet_id para "la última / la próxima"), no una por mascota.
+Total: DASHBOARD_QUERIES consultas, sin importar cuántas mascotas haya.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import desc, select
+from sqlalchemy.orm import Session
+from app.models import Deworming, Pet, Reminder, Vaccination, VetVisit
+from app.services.pet_stats import get_pets_with_stats
+
+# mascotas+contadores, última vacuna, próxima vacuna, última desparasitación,
+# última visita, próximos recordatorios
+DASHBOARD_QUERIES = 6
+
+UPCOMING_REMINDER_DAYS = 7
+
+
+def _latest_per_pet(owner_id, pet_ids, columns, pet_column, order_by, *criteria):
+    """Una fila por mascota: la primera según `order_by` (DISTINCT ON pet_id)"""
+    query = (
+        select(*columns)
+        .join(Pet, Pet.id == pet_column)
+        .where(Pet.owner_id == owner_id, *criteria)
+        .distinct(pet_column)
+        .order_by(pet_column, order_by)
+    )
+    if pet_ids is not None:
+        query = query.where(pet_column.in_(list(pet_ids)))
+    return query
+
+
+def summary_queries(owner_id, pet_ids: Optional[List[str]], now: datetime) -> Dict[str, object]:
+    """Las 5 consultas del resumen de salud (por conjunto, para todas las mascotas del dueño)"""
+    today = now.date()
+    reminders_query = select(
+        Reminder.pet_id, Reminder.id, Reminder.title, Reminder.event_time
+    ).where(
+        Reminder.owner_id == owner_id,
+        Reminder.pet_id.isnot(None),
+        Reminder.is_active == True,
+        Reminder.event_time >= now,
+        Reminder.event_time <= now + timedelta(days=UPCOMING_REMINDER_DAYS)
+    ).order_by(Reminder.event_time)
+    if pet_ids is not None:
+        reminders_query = reminders_query.where(Reminder.pet_id.in_(pet_ids))
+    return {
+        "last_vaccinations": _latest_per_pet(
+            owner_id, pet_ids,
+            (Vaccination.pet_id, Vaccination.vaccine_name, Vaccination.date_administered),
+            Vaccination.pet_id, desc(Vaccination.date_administered)
+        ),
+        "next_vaccinations": _latest_per_pet(
+            owner_id, pet_ids,
+            (Vaccination.pet_id, Vaccination.vaccine_name, Vaccination.next_due),
+            Vaccination.pet_id, Vaccination.next_due,
+            Vaccination.next_due.isnot(None), Vaccination.next_due >= today
+        ),
+        "last_dewormings": _latest_per_pet(
+            owner_id, pet_ids,
+            (Deworming.pet_id, Deworming.medication, Deworming.date_administered),
+            Deworming.pet_id, desc(Deworming.date_administered)
+        ),
+        "last_vet_visits": _latest_per_pet(
+            owner_id, pet_ids,
+            (VetVisit.pet_id, VetVisit.visit_date, VetVisit.reason),
+            VetVisit.pet_id, desc(VetVisit.visit_date)
+        ),
+        "upcoming_reminders": reminders_query,
+    }
+
+
+def get_health_summaries(
+    db: Session,
+    owner_id,
+    pet_ids: Optional[Iterable[str]] = None
+) -> Dict[str, dict]:
+    """
+    Resumen de salud de las mascotas del dueño (mismo formato que /pets/{pet_id}/health-summary
+    sin pet_id/pet_name), en 5 consultas
+
+    Returns:
+        {pet_id: resumen}; las mascotas sin registros tienen sus secciones en None
+    """
+    if pet_ids is not None:
+        pet_ids = list(pet_ids)
+    queries = summary_queries(owner_id, pet_ids, datetime.utcnow())
+
+    last_vaccinations = db.execute(queries["last_vaccinations"]).all()
+    next_vaccinations = db.execute(queries["next_vaccinations"]).all()
+    last_dewormings = db.execute(queries["last_dewormings"]).all()
+    last_vet_visits = db.execute(queries["last_vet_visits"]).all()
+
+    upcoming_reminders = defaultdict(list)
+    for row in db.execute(queries["upcoming_reminders"]):
+        upcoming_reminders[str(row.pet_id)].append({
+            "id": str(row.id),
+            "title": row.title,
+            "event_time": row.event_time.isoformat()
+        })
+
+    summaries: Dict[str, dict] = defaultdict(lambda: {
+        "last_vaccination": None,
+        "next_vaccination_due": None,
+        "last_deworming": None,
+        "last_vet_visit": None,
+        "upcoming_reminders": []
+    })
+    for row in last_vaccinations:
+        summaries[str(row.pet_id)]["last_vaccination"] = {
+            "vaccine_name": row.vaccine_name,
+            "date": row.date_administered.isoformat()
+        }
+    for row in next_vaccinations:
+        summaries[str(row.pet_id)]["next_vaccination_due"] = {
+            "vaccine_name": row.vaccine_name,
+            "due_date": row.next_due.isoformat()
+        }
+    for row in last_dewormings:
+        summaries[str(row.pet_id)]["last_deworming"] = {
+            "medication": row.medication,
+            "date": row.date_administered.isoformat()
+        }
+    for row in last_vet_visits:
+        summaries[str(row.pet_id)]["last_vet_visit"] = {
+            "date": row.visit_date.isoformat(),
+            "reason": row.reason
+        }
+    for pet_id, reminders in upcoming_reminders.items():
+        summaries[pet_id]["upcoming_reminders"] = reminders
+    return summaries
+
+
+def get_dashboard(db: Session, owner_id) -> List[dict]:
+    """
+    Todas las mascotas del dueño con resumen, contadores y resumen de salud
+
+    Returns:
+        Lista de {"pet", "stats", "health_summary"} en orden de creación
+    """
+    pets = get_pets_with_stats(db, owner_id)
+    if not pets:
+        return []
+    summaries = get_health_summaries(db, owner_id)
+    return [
+        {"pet": pet, "stats": stats, "health_summary": summaries[str(pet.id)]}
+        for pet, stats in pets
+    ]
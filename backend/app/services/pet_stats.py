@@ -0,0 +1,63 @@
+"""
+Estadísticas de mascotas en una sola consulta
+Cada contador es una subconsulta escalar correlacionada por pet_id, así que
+la mascota y todos sus contadores llegan en una sola fila (un round trip),
+y para N mascotas en N filas de la misma consulta
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.models import Deworming, Meal, Pet, Reminder, Vaccination, VetVisit
+
+# contador -> (modelo, condiciones extra); los nombres son los campos de PetWithStats
+STAT_COUNTERS = {
+    "total_vaccinations": (Vaccination, ()),
+    "total_dewormings": (Deworming, ()),
+    "total_vet_visits": (VetVisit, ()),
+    "total_meals": (Meal, ()),
+    "active_reminders": (Reminder, (Reminder.is_active == True,)),
+}
+
+
+def _count(model, criteria: tuple):
+    return (
+        select(func.count())
+        .select_from(model)
+        .where(model.pet_id == Pet.id, *criteria)
+        .correlate(Pet)
+        .scalar_subquery()
+    )
+
+
+def stats_query(owner_id, pet_ids: Optional[Iterable[str]] = None):
+    """SELECT pet, contadores... de las mascotas del dueño (todas o solo `pet_ids`)"""
+    query = select(
+        Pet,
+        *[_count(model, criteria).label(name) for name, (model, criteria) in STAT_COUNTERS.items()]
+    ).where(Pet.owner_id == owner_id)
+    if pet_ids is not None:
+        query = query.where(Pet.id.in_(list(pet_ids)))
+    return query.order_by(Pet.created_at, Pet.id)
+
+
+def get_pets_with_stats(
+    db: Session,
+    owner_id,
+    pet_ids: Optional[Iterable[str]] = None
+) -> List[Tuple[Pet, Dict[str, int]]]:
+    """
+    Mascotas del dueño con sus contadores
+
+    Args:
+        db: Sesión de base de datos
+        owner_id: Dueño (las mascotas de otros usuarios nunca se incluyen)
+        pet_ids: Mascotas a incluir (None = todas las del dueño)
+
+    Returns:
+        Lista de (mascota, {contador: valor}) en orden de creación
+    """
+    rows = db.execute(stats_query(owner_id, pet_ids)).all()
+    return [
+        (row[0], {name: getattr(row, name) for name in STAT_COUNTERS})
+        for row in rows
+    ]
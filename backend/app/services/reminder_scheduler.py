@@ -0,0 +1,103 @@
+"""
+Programación de recordatorios
+Cada recordatorio activo guarda su próxima ocurrencia en next_fire_at
+(índice parcial ix_reminders_next_fire_at). Los vencidos se obtienen con
+un solo range scan sobre ese índice, así que el costo de cada ciclo depende
+de cuántos vencen y no del total de recordatorios. Tras dispararlos,
+next_fire_at avanza a la ocurrencia siguiente según frequency / rrule.
+"""
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models import Reminder, ReminderFrequency
+from app.utils.recurrence import first_fire_at, next_fire_after
+
+# Campos que cambian la programación de un recordatorio
+SCHEDULE_FIELDS = {"event_time", "timezone", "frequency", "rrule", "is_active"}
+
+
+def _frequency(value) -> Optional[str]:
+    return value.value if isinstance(value, ReminderFrequency) else value
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def schedule(reminder: Reminder, now: Optional[datetime] = None) -> None:
+    """Recalcula next_fire_at (al crear un recordatorio o cambiar su programación)"""
+    if not reminder.is_active:
+        reminder.next_fire_at = None
+        return
+    reminder.next_fire_at = first_fire_at(
+        reminder.event_time,
+        _frequency(reminder.frequency),
+        reminder.rrule,
+        reminder.timezone,
+        now or _now()
+    )
+
+
+def advance(reminder: Reminder, now: Optional[datetime] = None) -> None:
+    """Marca la ocurrencia actual como disparada y programa la siguiente"""
+    fired_at = reminder.next_fire_at
+    reminder.last_fired_at = fired_at
+    reminder.next_fire_at = next_fire_after(
+        reminder.event_time,
+        _frequency(reminder.frequency),
+        reminder.rrule,
+        reminder.timezone,
+        fired_at,
+        now or _now()
+    )
+
+
+def due_query(now: datetime, limit: int):
+    """
+    Recordatorios vencidos, los más atrasados primero
+    FOR UPDATE SKIP LOCKED: varios workers pueden procesar en paralelo
+    sin tomar el mismo recordatorio. populate_existing: una sesión de larga
+    duración (el worker) recarga los recordatorios que ya tenía en memoria
+    """
+    return (
+        select(Reminder)
+        .where(
+            Reminder.is_active == True,
+            Reminder.next_fire_at.isnot(None),
+            Reminder.next_fire_at <= now
+        )
+        .order_by(Reminder.next_fire_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .execution_options(populate_existing=True)
+    )
+
+
+def fire_due(
+    db: Session,
+    fire: Callable[[Reminder, datetime], None],
+    now: Optional[datetime] = None,
+    limit: int = 100
+) -> int:
+    """
+    Dispara un lote de recordatorios vencidos en una transacción
+
+    Para cada uno llama `fire(reminder, ocurrencia)` y avanza next_fire_at;
+    el commit confirma los disparos y la nueva programación juntos. Si `fire`
+    lanza una excepción se hace rollback y el lote se reintenta en el próximo ciclo.
+
+    Returns:
+        Cantidad de recordatorios disparados
+    """
+    now = now or _now()
+    try:
+        reminders = db.execute(due_query(now, limit)).scalars().all()
+        for reminder in reminders:
+            fire(reminder, reminder.next_fire_at)
+            advance(reminder, now)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(reminders)
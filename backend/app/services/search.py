@@ -0,0 +1,161 @@
+"""
+Búsqueda full-text (tsvector + GIN) y por similitud (pg_trgm)
+- pets.search_vector: nombre (A), especie/raza (B), notas (C)
+- vet_visits.search_vector: motivo (A), diagnóstico (B), tratamiento (C)
+- pets.name, users.username/full_name/email: índices trigram, toleran typos
+  ("firulays" encuentra "Firulais") y sirven a ILIKE '%...%'
+Los términos se buscan como prefijos ("gold" encuentra "Golden"), así que
+sirve para buscar mientras se escribe.
+"""
+import re
+from typing import Iterable, List
+from sqlalchemy import cast, desc, func, literal, null, or_, select, union_all
+from sqlalchemy.orm import Session
+from app.models import Pet, User, VetVisit
+
+SEARCH_CONFIG = "spanish"
+
+SEARCH_TYPES = ("pets", "vet_visits", "users")
+
+
+def prefix_tsquery(term: str):
+    """
+    tsquery con cada palabra como prefijo ('golden ret' -> 'golden:* & ret:*')
+    Solo se usan caracteres de palabra, así que la entrada nunca rompe la sintaxis
+
+    Returns:
+        Expresión tsquery, o None si el término no tiene palabras
+    """
+    words = re.findall(r"\w+", term)
+    if not words:
+        return None
+    return func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{word}:*" for word in words))
+
+
+def pet_match(term: str):
+    """Condición de búsqueda de mascotas (usa ix_pets_search_vector / ix_pets_name_trgm)"""
+    tsquery = prefix_tsquery(term)
+    similar_name = Pet.name.op("%")(term)
+    if tsquery is None:
+        return similar_name
+    return or_(Pet.search_vector.op("@@")(tsquery), similar_name)
+
+
+def pet_rank(term: str):
+    tsquery = prefix_tsquery(term)
+    similarity = func.similarity(Pet.name, term)
+    if tsquery is None:
+        return similarity
+    return func.ts_rank_cd(Pet.search_vector, tsquery) + similarity
+
+
+def _pets(owner_id, term: str):
+    return select(
+        literal("pet").label("type"),
+        Pet.id.label("id"),
+        Pet.name.label("title"),
+        func.concat_ws(" · ", Pet.species, Pet.breed).label("subtitle"),
+        Pet.id.label("pet_id"),
+        pet_rank(term).label("rank")
+    ).where(Pet.owner_id == owner_id, pet_match(term))
+
+
+def _vet_visits(owner_id, term: str):
+    tsquery = prefix_tsquery(term)
+    if tsquery is None:
+        return None
+    return select(
+        literal("vet_visit").label("type"),
+        VetVisit.id.label("id"),
+        VetVisit.reason.label("title"),
+        Pet.name.label("subtitle"),
+        VetVisit.pet_id.label("pet_id"),
+        func.ts_rank_cd(VetVisit.search_vector, tsquery).label("rank")
+    ).join(Pet, Pet.id == VetVisit.pet_id).where(
+        Pet.owner_id == owner_id,
+        VetVisit.search_vector.op("@@")(tsquery)
+    )
+
+
+def _users(term: str):
+    return select(
+        literal("user").label("type"),
+        User.id.label("id"),
+        func.coalesce(User.full_name, User.username).label("title"),
+        User.email.label("subtitle"),
+        cast(null(), Pet.id.type).label("pet_id"),
+        func.greatest(
+            func.similarity(User.username, term),
+            func.similarity(User.full_name, term),
+            func.similarity(User.email, term)
+        ).label("rank")
+    ).where(or_(
+        User.username.op("%")(term),
+        User.full_name.op("%")(term),
+        User.email.ilike(f"%{term}%")
+    ))
+
+
+def search_query(
+    owner_id,
+    term: str,
+    types: Iterable[str] = SEARCH_TYPES,
+    skip: int = 0,
+    limit: int = 20
+):
+    """UNION ALL de los tipos pedidos ordenado por relevancia, o None si no hay nada que buscar"""
+    builders = {
+        "pets": lambda: _pets(owner_id, term),
+        "vet_visits": lambda: _vet_visits(owner_id, term),
+        "users": lambda: _users(term),
+    }
+    selects = [query for query in (builders[name]() for name in types) if query is not None]
+    if not selects:
+        return None
+    results = union_all(*selects).subquery("results")
+    return (
+        select(results)
+        .order_by(desc(results.c.rank), results.c.id)
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def search(
+    db: Session,
+    owner_id,
+    term: str,
+    types: Iterable[str] = SEARCH_TYPES,
+    skip: int = 0,
+    limit: int = 20
+) -> List[dict]:
+    """
+    Búsqueda unificada ordenada por relevancia
+
+    Args:
+        db: Sesión de base de datos
+        owner_id: Mascotas y visitas se limitan a las de este usuario
+        term: Texto a buscar
+        types: Subconjunto de SEARCH_TYPES ("users" busca en todos los usuarios:
+            el llamador debe verificar que sea admin)
+        skip: Número de resultados a omitir
+        limit: Número máximo de resultados
+
+    Returns:
+        Lista de {"type", "id", "title", "subtitle", "pet_id", "rank"}
+    """
+    query = search_query(owner_id, term, types, skip, limit)
+    if query is None:
+        return []
+    rows = db.execute(query).all()
+    return [
+        {
+            "type": row.type,
+            "id": str(row.id),
+            "title": row.title,
+            "subtitle": row.subtitle,
+            "pet_id": str(row.pet_id) if row.pet_id else None,
+            "rank": float(row.rank)
+        }
+        for row in rows
+    ]
@@ -0,0 +1,120 @@
+"""
+Caché en proceso de usuarios autenticados
+Evita consultar la tabla users en cada request protegido
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+from app.config import settings
+
+
+class UserPrincipal:
+    """Snapshot liviano del usuario con lo necesario para autorizar un request"""
+
+    __slots__ = ("id", "role", "is_active", "locked_until")
+
+    def __init__(self, id, role: str, is_active: bool, locked_until: Optional[datetime]):
+        self.id = id
+        self.role = role
+        self.is_active = is_active
+        self.locked_until = locked_until
+
+    @classmethod
+    def from_user(cls, user) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            role=user.role,
+            is_active=user.is_active,
+            locked_until=user.locked_until
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "role": self.role,
+            "is_active": self.is_active,
+            "locked_until": self.locked_until
+        }
+
+
+class UserPrincipalCache:
+    """
+    Caché LRU con TTL de snapshots de usuario, indexada por user_id
+
+    Es por proceso: cada worker de uvicorn tiene la suya. La invalidación
+    explícita solo afecta al proceso actual, el TTL corto acota cuánto
+    puede tardar otro worker en ver un cambio.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple[float, UserPrincipal]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id) -> Optional[UserPrincipal]:
+        """Retorna el snapshot si existe y no ha expirado"""
+        if self.ttl_seconds <= 0:
+            return None
+
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return principal
+
+    def set(self, user) -> None:
+        """Guarda (o reemplaza) el snapshot del usuario"""
+        if self.ttl_seconds <= 0:
+            return
+
+        key = str(user.id)
+        principal = UserPrincipal.from_user(user)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id) -> None:
+        """Elimina el snapshot de un usuario (llamar después de db.commit())"""
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Contadores de aciertos/fallos para verificar que la caché compensa"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
+
+
+user_cache = UserPrincipalCache(
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    max_size=settings.USER_CACHE_MAX_SIZE
+)
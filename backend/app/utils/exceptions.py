@@ -68,4 +68,26 @@ class InsufficientPermissionsException(HTTPException):
         super().__init__(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes permisos suficientes para realizar esta acción"
-        )
\ No newline at end of file
+        )
+
+class ServiceBusyException(HTTPException):
+    def __init__(self, retry_after_seconds: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="El servidor está ocupado. Intenta nuevamente en unos segundos",
+            headers={"Retry-After": str(retry_after_seconds)}
+        )
+
+class InvalidCursorException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginación inválido"
+        )
+
+class PayloadTooLargeException(HTTPException):
+    def __init__(self, max_mb: int):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"El archivo supera el tamaño máximo permitido ({max_mb} MB)"
+        )
@@ -0,0 +1,186 @@
+"""
+Registro de algoritmos de hashing de contraseñas
+Permite reconocer el esquema y el costo de un hash guardado y decidir
+si debe re-hashearse con la política actual
+"""
+import base64
+import hashlib
+import hmac
+import os
+from typing import Dict, Optional
+import bcrypt
+from app.config import settings
+
+
+class BcryptHasher:
+    """bcrypt con número de rondas configurable"""
+
+    scheme = "bcrypt"
+    prefixes = ("$2a$", "$2b$", "$2y$")
+
+    def __init__(self, rounds: int = 12):
+        self.rounds = rounds
+
+    @staticmethod
+    def _prepare(password: str) -> bytes:
+        # bcrypt solo usa los primeros 72 bytes: si se excede, usar el SHA-256 en hex
+        password_bytes = password.encode('utf-8')
+        if len(password_bytes) > 72:
+            password_bytes = hashlib.sha256(password_bytes).hexdigest().encode('utf-8')
+        return password_bytes
+
+    def identifies(self, hashed: str) -> bool:
+        return hashed.startswith(self.prefixes)
+
+    def hash(self, password: str) -> str:
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return bcrypt.hashpw(self._prepare(password), salt).decode('utf-8')
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return bcrypt.checkpw(self._prepare(password), hashed.encode('utf-8'))
+
+    def cost(self, hashed: str) -> Optional[dict]:
+        # Formato: $2b$12$<salt+hash>
+        try:
+            return {"rounds": int(hashed.split("$")[2])}
+        except (IndexError, ValueError):
+            return None
+
+    def policy(self) -> dict:
+        return {"rounds": self.rounds}
+
+
+class ScryptHasher:
+    """
+    scrypt (memory-hard) de hashlib
+    Formato: $scrypt$ln=14,r=8,p=1$<salt base64>$<hash base64>
+    """
+
+    scheme = "scrypt"
+    prefixes = ("$scrypt$",)
+    salt_bytes = 16
+    key_bytes = 32
+
+    def __init__(self, log_n: int = 14, r: int = 8, p: int = 1):
+        self.log_n = log_n
+        self.r = r
+        self.p = p
+
+    @staticmethod
+    def _b64encode(data: bytes) -> str:
+        return base64.b64encode(data).decode('ascii').rstrip("=")
+
+    @staticmethod
+    def _b64decode(data: str) -> bytes:
+        return base64.b64decode(data + "=" * (-len(data) % 4))
+
+    @staticmethod
+    def _derive(password: str, salt: bytes, log_n: int, r: int, p: int, length: int) -> bytes:
+        n = 2 ** log_n
+        return hashlib.scrypt(
+            password.encode('utf-8'),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * n * r * p,
+            dklen=length
+        )
+
+    def _parse(self, hashed: str) -> Optional[dict]:
+        try:
+            _, _, params, salt, key = hashed.split("$")
+            values = dict(item.split("=") for item in params.split(","))
+            return {
+                "log_n": int(values["ln"]),
+                "r": int(values["r"]),
+                "p": int(values["p"]),
+                "salt": self._b64decode(salt),
+                "key": self._b64decode(key)
+            }
+        except (ValueError, KeyError):
+            return None
+
+    def identifies(self, hashed: str) -> bool:
+        return hashed.startswith(self.prefixes)
+
+    def hash(self, password: str) -> str:
+        salt = os.urandom(self.salt_bytes)
+        key = self._derive(password, salt, self.log_n, self.r, self.p, self.key_bytes)
+        return (
+            f"$scrypt$ln={self.log_n},r={self.r},p={self.p}"
+            f"${self._b64encode(salt)}${self._b64encode(key)}"
+        )
+
+    def verify(self, password: str, hashed: str) -> bool:
+        parsed = self._parse(hashed)
+        if not parsed:
+            return False
+        key = self._derive(
+            password, parsed["salt"], parsed["log_n"], parsed["r"], parsed["p"], len(parsed["key"])
+        )
+        return hmac.compare_digest(key, parsed["key"])
+
+    def cost(self, hashed: str) -> Optional[dict]:
+        parsed = self._parse(hashed)
+        if not parsed:
+            return None
+        return {"log_n": parsed["log_n"], "r": parsed["r"], "p": parsed["p"]}
+
+    def policy(self) -> dict:
+        return {"log_n": self.log_n, "r": self.r, "p": self.p}
+
+
+def build_hashers() -> Dict[str, object]:
+    """Construye el registro de hashers con los parámetros de la configuración"""
+    return {
+        BcryptHasher.scheme: BcryptHasher(rounds=settings.BCRYPT_ROUNDS),
+        ScryptHasher.scheme: ScryptHasher(
+            log_n=settings.SCRYPT_LOG_N,
+            r=settings.SCRYPT_R,
+            p=settings.SCRYPT_P
+        )
+    }
+
+
+HASHERS = build_hashers()
+
+
+def validate_scheme() -> None:
+    """Falla al arrancar si PASSWORD_HASH_SCHEME no es un esquema conocido (y no en cada login)"""
+    if settings.PASSWORD_HASH_SCHEME not in HASHERS:
+        raise ValueError(
+            f"PASSWORD_HASH_SCHEME={settings.PASSWORD_HASH_SCHEME!r} no es válido; "
+            f"usa uno de: {', '.join(HASHERS)}"
+        )
+
+
+# Al importar: la API, los workers y los procesos del pool de hashing no arrancan con un esquema inválido
+validate_scheme()
+
+
+def get_default_hasher():
+    """Hasher de la política actual (PASSWORD_HASH_SCHEME)"""
+    return HASHERS[settings.PASSWORD_HASH_SCHEME]
+
+
+def identify_hasher(hashed: str):
+    """Retorna el hasher que reconoce el hash guardado, o None si es desconocido"""
+    for hasher in HASHERS.values():
+        if hasher.identifies(hashed):
+            return hasher
+    return None
+
+
+def needs_rehash(hashed: str) -> bool:
+    """
+    Indica si el hash no corresponde a la política actual
+    (otro esquema, o el mismo esquema con distinto costo, más alto o más bajo)
+    """
+    hasher = identify_hasher(hashed)
+    if hasher is None:
+        return False
+    default = get_default_hasher()
+    if hasher.scheme != default.scheme:
+        return True
+    return hasher.cost(hashed) != default.policy()
@@ -0,0 +1,122 @@
+"""
+Paginación por cursor (keyset)
+El cursor es un token opaco firmado con (clave de orden, id) de la última fila;
+la página siguiente filtra con (clave, id) < (cursor) en lugar de OFFSET,
+así la página N cuesta lo mismo que la primera
+"""
+import base64
+import hashlib
+import hmac
+import json
+import uuid
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from fastapi import Response
+from sqlalchemy import desc, tuple_
+from app.config import settings
+from app.utils.exceptions import InvalidCursorException
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: bytes) -> str:
+    digest = hmac.new(settings.SECRET_KEY.encode('utf-8'), payload, hashlib.sha256).digest()
+    return _b64encode(digest[:16])
+
+
+def _dump_value(value: Any) -> list:
+    # datetime antes que date: datetime es subclase de date
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    return ["s", value]
+
+
+def _load_value(tagged: list) -> Any:
+    kind, value = tagged
+    if kind == "dt":
+        return datetime.fromisoformat(value)
+    if kind == "d":
+        return date.fromisoformat(value)
+    return value
+
+
+class Keyset:
+    """
+    Orden descendente por `sort_column` con `id_column` como desempate
+
+    El `scope` se firma dentro del cursor para que un cursor de /meals no
+    pueda usarse en /audit-logs
+    """
+
+    def __init__(self, scope: str, sort_column, id_column):
+        self.scope = scope
+        self.sort_column = sort_column
+        self.id_column = id_column
+
+    def encode(self, row) -> str:
+        sort_value = getattr(row, self.sort_column.key)
+        row_id = getattr(row, self.id_column.key)
+        payload = json.dumps(
+            [self.scope, _dump_value(sort_value), str(row_id)],
+            separators=(",", ":")
+        ).encode('utf-8')
+        return f"{_b64encode(payload)}.{_sign(payload)}"
+
+    def decode(self, cursor: str) -> Tuple[Any, uuid.UUID]:
+        try:
+            encoded, signature = cursor.split(".")
+            payload = _b64decode(encoded)
+            if not hmac.compare_digest(signature, _sign(payload)):
+                raise InvalidCursorException()
+            scope, sort_value, row_id = json.loads(payload)
+            if scope != self.scope:
+                raise InvalidCursorException()
+            return _load_value(sort_value), uuid.UUID(row_id)
+        except InvalidCursorException:
+            raise
+        except (ValueError, TypeError):
+            raise InvalidCursorException()
+
+    def order(self, query):
+        """Orden estable: sin el id como desempate el cursor podría saltar filas"""
+        return query.order_by(desc(self.sort_column), desc(self.id_column))
+
+    def paginate(self, query, cursor: Optional[str], skip: int, limit: int):
+        """
+        Aplica orden + límite. Con cursor usa keyset (ignora skip);
+        sin cursor mantiene el comportamiento skip/limit de siempre.
+        Funciona tanto con Query (sync) como con select() (async).
+        """
+        query = self.order(query)
+        if cursor:
+            sort_value, row_id = self.decode(cursor)
+            query = query.filter(
+                tuple_(self.sort_column, self.id_column) < tuple_(sort_value, row_id)
+            )
+        else:
+            query = query.offset(skip)
+        return query.limit(limit)
+
+    def next_cursor(self, rows: Sequence, limit: int) -> Optional[str]:
+        """Cursor de la página siguiente, o None si esta es la última"""
+        if not rows or len(rows) < limit:
+            return None
+        return self.encode(rows[-1])
+
+
+def set_next_cursor(response: Response, keyset: Keyset, rows: List, limit: int) -> List:
+    """Agrega el header X-Next-Cursor a la respuesta (si hay más páginas)"""
+    cursor = keyset.next_cursor(rows, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return rows
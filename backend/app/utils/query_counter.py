@@ -0,0 +1,29 @@
+"""
+Conteo de sentencias SQL
+Escucha before_cursor_execute en un Engine o Connection y junta las
+sentencias que llegan al driver (los chequeos de benchmarks/ lo usan para
+detectar consultas N+1)
+"""
+from contextlib import contextmanager
+from typing import Iterator, List
+from sqlalchemy import event
+
+
+@contextmanager
+def count_statements(bind) -> Iterator[List[str]]:
+    """
+    Uso:
+        with count_statements(conn) as statements:
+            ...
+        print(len(statements))
+    """
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,115 @@
+"""
+Cálculo de ocurrencias de recordatorios (frequency / rrule)
+Las reglas se evalúan en la zona horaria del recordatorio, así que un
+recordatorio diario a las 09:00 sigue a las 09:00 locales después de un
+cambio de horario (DST)
+"""
+from datetime import datetime, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from dateutil.rrule import DAILY, MONTHLY, WEEKLY, YEARLY, rrule, rrulestr
+
+# frequency (ReminderFrequency.value) -> frecuencia de dateutil; "once" no se repite
+FREQUENCIES = {
+    "daily": DAILY,
+    "weekly": WEEKLY,
+    "monthly": MONTHLY,
+    "yearly": YEARLY,
+}
+
+
+class InvalidRecurrenceError(ValueError):
+    """rrule con sintaxis inválida"""
+    pass
+
+
+def _zone(tz_name: Optional[str]):
+    try:
+        return ZoneInfo(tz_name) if tz_name else timezone.utc
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
+
+
+def _aware(value: datetime) -> datetime:
+    """Fechas naive se interpretan como UTC (igual que datetime.utcnow() en el resto de la app)"""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def to_local(value: datetime, tz_name: Optional[str]) -> datetime:
+    """Fecha en la zona horaria del recordatorio (para mostrarla al usuario)"""
+    return _aware(value).astimezone(_zone(tz_name))
+
+
+def build_rule(event_time: datetime, frequency: Optional[str], rule: Optional[str], tz_name: Optional[str] = None):
+    """
+    Regla de repetición del recordatorio, o None si es de una sola vez
+
+    `rule` (RFC 5545, con o sin prefijo "RRULE:") tiene prioridad sobre `frequency`
+
+    Raises:
+        InvalidRecurrenceError: Si `rule` no se puede interpretar
+    """
+    dtstart = _aware(event_time).astimezone(_zone(tz_name))
+    if rule:
+        try:
+            recurrence = rrulestr(rule, dtstart=dtstart)
+            # Una regla con su propio DTSTART/UNTIL naive se construye bien pero
+            # falla al comparar con fechas aware: se evalúa una vez para detectarlo
+            recurrence.after(dtstart, inc=True)
+        except (ValueError, TypeError) as e:
+            raise InvalidRecurrenceError(f"rrule inválida: {str(e)}")
+        return recurrence
+    if frequency in FREQUENCIES:
+        return rrule(FREQUENCIES[frequency], dtstart=dtstart)
+    return None
+
+
+def validate_rrule(rule: Optional[str]) -> Optional[str]:
+    """Valida la sintaxis de una rrule (para los schemas)"""
+    if rule:
+        build_rule(datetime.now(timezone.utc), None, rule)
+    return rule
+
+
+def first_fire_at(
+    event_time: datetime,
+    frequency: Optional[str],
+    rule: Optional[str],
+    tz_name: Optional[str],
+    now: datetime
+) -> Optional[datetime]:
+    """
+    Primera ocurrencia a programar para un recordatorio nuevo o modificado
+
+    - De una sola vez: event_time (aunque ya haya pasado, se dispara en el próximo ciclo)
+    - Recurrente: la primera ocurrencia >= now (no se recuperan las ocurrencias pasadas)
+    """
+    recurrence = build_rule(event_time, frequency, rule, tz_name)
+    if recurrence is None:
+        return _aware(event_time)
+    occurrence = recurrence.after(max(_aware(event_time), _aware(now)), inc=True)
+    return occurrence.astimezone(timezone.utc) if occurrence else None
+
+
+def next_fire_after(
+    event_time: datetime,
+    frequency: Optional[str],
+    rule: Optional[str],
+    tz_name: Optional[str],
+    fired_at: datetime,
+    now: datetime
+) -> Optional[datetime]:
+    """
+    Ocurrencia siguiente después de disparar la de `fired_at`
+
+    Se busca después de max(fired_at, now): si el disparo se atrasó (p. ej. el
+    worker estuvo caído) no se dispara una ráfaga con las ocurrencias perdidas.
+
+    Returns:
+        Próxima ocurrencia en UTC, o None si la regla terminó (o era de una sola vez)
+    """
+    recurrence = build_rule(event_time, frequency, rule, tz_name)
+    if recurrence is None:
+        return None
+    occurrence = recurrence.after(max(_aware(fired_at), _aware(now)), inc=False)
+    return occurrence.astimezone(timezone.utc) if occurrence else None
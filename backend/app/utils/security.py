@@ -1,43 +1,50 @@
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import secrets
-import hashlib
 from jose import JWTError, jwt
-import bcrypt
 from app.config import settings
+from app.services.password_hasher import password_hasher
+from app.utils.hashers import get_default_hasher, identify_hasher, needs_rehash
+
+def _hash_password_sync(password: str) -> str:
+    """Hashea con el esquema de la política actual (lo ejecuta el pool de procesos)"""
+    return get_default_hasher().hash(password)
+
+def _verify_password_sync(plain_password: str, hashed_password: str) -> bool:
+    """Verifica con el esquema del hash guardado (lo ejecuta el pool de procesos)"""
+    try:
+        hasher = identify_hasher(hashed_password)
+        if hasher is None:
+            return False
+        return hasher.verify(plain_password, hashed_password)
+    except Exception:
+        return False
 
 def hash_password(password: str) -> str:
     """
-    Encripta una contraseña usando bcrypt.
-    Trunca la contraseña a 72 bytes si es necesario (límite de bcrypt).
+    Encripta una contraseña con el esquema configurado (bcrypt o scrypt).
+    El cómputo se delega al pool de procesos de hashing.
     """
-    # Convertir a bytes y truncar a 72 bytes si es necesario
-    password_bytes = password.encode('utf-8')
-    if len(password_bytes) > 72:
-        # Hash la contraseña primero si excede 72 bytes
-        password_bytes = hashlib.sha256(password_bytes).hexdigest().encode('utf-8')
-    
-    # Generar salt y hashear
-    salt = bcrypt.gensalt(rounds=12)
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    return hashed.decode('utf-8')
+    return password_hasher.run(_hash_password_sync, password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifica una contraseña contra su hash.
-    Maneja el límite de 72 bytes de bcrypt.
+    El cómputo se delega al pool de procesos de hashing.
     """
-    try:
-        # Convertir a bytes y truncar si es necesario
-        password_bytes = plain_password.encode('utf-8')
-        if len(password_bytes) > 72:
-            # Hash la contraseña primero si excede 72 bytes
-            password_bytes = hashlib.sha256(password_bytes).hexdigest().encode('utf-8')
-        
-        hashed_bytes = hashed_password.encode('utf-8')
-        return bcrypt.checkpw(password_bytes, hashed_bytes)
-    except Exception:
-        return False
+    return password_hasher.run(_verify_password_sync, plain_password, hashed_password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Indica si el hash debe regenerarse con la política actual (esquema o costo)"""
+    return needs_rehash(hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    """Versión awaitable de hash_password"""
+    return await password_hasher.run_async(_hash_password_sync, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Versión awaitable de verify_password"""
+    return await password_hasher.run_async(_verify_password_sync, plain_password, hashed_password)
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Crea un token de acceso JWT"""
@@ -0,0 +1,71 @@
+"""
+Serialización JSON con orjson
+- ORJSONResponse: response_class por defecto de la app. Además de los tipos
+  que orjson ya maneja (UUID, datetime, date, Enum, dataclasses) convierte
+  Decimal, Row / RowMapping de SQLAlchemy y modelos Pydantic
+- list_response: para listados. Los endpoints arman dicts (o devuelven Row
+  de una consulta por columnas) y retornan la respuesta directamente, así
+  FastAPI no vuelve a validar cada fila contra el response_model, que queda
+  solo para la documentación OpenAPI
+"""
+from decimal import Decimal
+from typing import Any, Iterable, List, Optional, Sequence, Type
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.engine import Row, RowMapping
+
+
+def _default(value: Any) -> Any:
+    """Tipos que orjson no serializa por su cuenta"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Row):
+        return value._asdict()
+    if isinstance(value, RowMapping):
+        return dict(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Tipo no serializable a JSON: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def fields_of(schema: Type[BaseModel]) -> List[str]:
+    """Campos de un schema de respuesta (para que row_to_dict siga al schema)"""
+    return list(schema.model_fields)
+
+
+def row_to_dict(obj: Any, fields: Sequence[str]) -> dict:
+    """Dict con los atributos `fields` de un modelo ORM (o de cualquier objeto)"""
+    return {field: getattr(obj, field) for field in fields}
+
+
+def list_response(items: Iterable[Any], response: Optional[Response] = None) -> ORJSONResponse:
+    """
+    Respuesta de un listado, sin validación de Pydantic
+
+    Args:
+        items: dicts, Row de SQLAlchemy o cualquier valor serializable
+        response: Response inyectado del endpoint: se copian los headers que
+            se le agregaron (ej. X-Next-Cursor), que FastAPI no fusiona cuando
+            el endpoint retorna su propia respuesta
+    """
+    result = ORJSONResponse(list(items))
+    if response is not None:
+        for key, value in response.headers.items():
+            if key not in ("content-length", "content-type"):
+                result.headers.append(key, value)
+    return result
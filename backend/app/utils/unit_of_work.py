@@ -0,0 +1,104 @@
+"""
+Unit of work para escrituras con auditoría
+Escribe la entidad y su AuditLog en una sola transacción (un solo commit),
+o delega el AuditLog al audit sink cuando AUDIT_SINK_MODE=async
+"""
+import uuid
+from typing import Any, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import AuditLog
+from app.services.audit_sink import audit_sink
+
+
+def _stage_entity(db, entity, object_id, delete: bool):
+    """Agrega la entidad (si no se elimina) a la sesión y retorna el object_id del audit"""
+    if entity is not None:
+        if not delete:
+            # El id se genera en Python para que el audit lo referencie sin un flush previo
+            if entity.id is None:
+                entity.id = uuid.uuid4()
+            db.add(entity)
+        if object_id is None:
+            object_id = entity.id
+    return object_id
+
+
+def commit_with_audit(
+    db: Session,
+    entity: Any = None,
+    *,
+    actor_user_id,
+    action: str,
+    object_type: Optional[str] = None,
+    object_id=None,
+    meta: Optional[dict] = None,
+    delete: bool = False
+) -> Any:
+    """
+    Persiste `entity` (alta, cambios o borrado) junto con su registro de auditoría
+
+    Reemplaza el patrón commit → refresh → add(audit) → commit: ambos
+    INSERT/UPDATE/DELETE viajan en el mismo flush y se confirman con un
+    único commit, así que un fallo no puede dejar la entidad sin su audit.
+    Con el audit sink habilitado solo se confirma la entidad y el evento se
+    encola para el escritor en lotes (si la cola está llena, se escribe aquí).
+    No hace db.refresh(): los valores que genera la base (created_at,
+    updated_at del trigger) vuelven con RETURNING en el mismo flush
+    (eager_defaults) y la sesión no expira los objetos al hacer commit.
+
+    Args:
+        db: Sesión de base de datos
+        entity: Entidad a guardar o eliminar (None para acciones masivas)
+        actor_user_id: Usuario que realiza la acción
+        action: Nombre de la acción (ej. "PET_CREATED")
+        object_type: Tipo de objeto afectado
+        object_id: ID del objeto (por defecto entity.id)
+        meta: Metadatos adicionales
+        delete: Si True, elimina la entidad
+
+    Returns:
+        La misma entidad
+    """
+    object_id = _stage_entity(db, entity, object_id, delete)
+    event = audit_sink.build_event(actor_user_id, action, object_type, object_id, meta)
+    use_sink = audit_sink.enabled
+    if not use_sink:
+        db.add(AuditLog(**event))
+    if entity is not None and delete:
+        db.delete(entity)
+    db.commit()
+
+    # Cola llena (o sink detenido): escribir el audit de forma síncrona
+    if use_sink and not audit_sink.offer(event):
+        db.add(AuditLog(**event))
+        db.commit()
+    return entity
+
+
+async def commit_with_audit_async(
+    db: AsyncSession,
+    entity: Any = None,
+    *,
+    actor_user_id,
+    action: str,
+    object_type: Optional[str] = None,
+    object_id=None,
+    meta: Optional[dict] = None,
+    delete: bool = False
+) -> Any:
+    """Versión async de commit_with_audit (AsyncSession)"""
+    object_id = _stage_entity(db, entity, object_id, delete)
+    event = audit_sink.build_event(actor_user_id, action, object_type, object_id, meta)
+    use_sink = audit_sink.enabled
+    if not use_sink:
+        db.add(AuditLog(**event))
+    if entity is not None and delete:
+        await db.delete(entity)
+    await db.commit()
+
+    # Sin bloquear el event loop: si la cola está llena se escribe en línea
+    if use_sink and not audit_sink.offer(event, block=False):
+        db.add(AuditLog(**event))
+        await db.commit()
+    return entity
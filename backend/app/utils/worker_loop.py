@@ -0,0 +1,50 @@
+"""
+Bucle común de los workers en segundo plano (notification_worker.py,
+email_outbox_worker.py): procesa lotes mientras haya trabajo, espera
+`interval` segundos cuando el lote sale incompleto y termina limpio con
+SIGTERM / Ctrl+C
+"""
+import signal
+import threading
+from typing import Callable
+from app.database import SessionLocal
+
+
+def run_batches(
+    dispatcher,
+    batch_size: int,
+    interval: float,
+    once: bool,
+    report: Callable[[int, dict], str]
+) -> None:
+    """
+    Args:
+        dispatcher: Objeto con dispatch_batch(db) -> int, stats() y shutdown()
+        batch_size: Tamaño de lote del dispatcher (un lote incompleto = no hay más trabajo)
+        interval: Segundos de espera entre consultas cuando no hay trabajo
+        once: Si True, termina en cuanto no queda trabajo
+        report: Arma la línea de log de un lote a partir de (procesados, stats)
+    """
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    db = SessionLocal()
+    try:
+        while not stop.is_set():
+            try:
+                processed = dispatcher.dispatch_batch(db)
+            except Exception as e:
+                print(f"❌ Error procesando lote: {str(e)}")
+                stop.wait(interval)
+                continue
+            if processed:
+                print(report(processed, dispatcher.stats()))
+            if processed < batch_size:
+                if once:
+                    break
+                stop.wait(interval)
+    finally:
+        db.close()
+        dispatcher.shutdown()
+        print(f"🛑 Worker detenido: {dispatcher.stats()}")
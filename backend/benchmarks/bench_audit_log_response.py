@@ -0,0 +1,118 @@
+"""
+Benchmark de la respuesta de /audit-logs/ con 1000 filas
+Ejecutar con: python -m benchmarks.bench_audit_log_response
+
+Carga USERS usuarios y LOGS logs de auditoría dentro de una transacción y
+compara, para una página de LIMIT filas (consulta + serialización):
+- "antes": AuditLog ORM + actor lazy, un AuditLogWithUser por fila y el
+  camino de FastAPI con response_model (model_dump, validación de la lista,
+  dump en modo JSON) más json.dumps de la stdlib
+- "ahora": filas por columnas con el actor en el mismo JOIN
+  (get_all_with_user_rows) serializadas directo con orjson (list_response)
+Al final hace ROLLBACK: no deja datos en la base.
+"""
+import json
+import statistics
+import time
+from typing import List
+from pydantic import TypeAdapter
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.controllers.audit_logs import AuditLogController
+from app.database import engine
+from app.models import User
+from app.schemas.audit_logs import AuditLogWithUser
+from app.utils.serialization import list_response
+
+USERS = 50
+LOGS = 5000
+LIMIT = 1000
+ITERATIONS = 20
+
+SEED_SQL = [
+    """
+    INSERT INTO petcare.users (id, username, email, hashed_password, role, is_active, created_at, updated_at)
+    SELECT gen_random_uuid(), 'audit_bench_' || g, 'audit_bench_' || g || '@example.test', 'x',
+           CASE WHEN g = 1 THEN 'admin' ELSE 'user' END, TRUE, now(), now()
+    FROM generate_series(1, :users) g
+    """,
+    """
+    INSERT INTO petcare.audit_logs (id, actor_user_id, action, object_type, object_id, meta, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id,
+           (ARRAY['PET_CREATED', 'PET_UPDATED', 'VACCINATION_CREATED', 'USER_LOGIN'])[1 + g % 4],
+           'Pet', gen_random_uuid(),
+           jsonb_build_object('name', 'Firulais ' || g, 'changes', jsonb_build_array('weight_kg', 'notes')),
+           now() - g * interval '1 minute', now()
+    FROM generate_series(1, :logs) g
+    JOIN petcare.users u ON u.email = 'audit_bench_' || (1 + g % :users) || '@example.test'
+    """,
+]
+
+RESPONSE_ADAPTER = TypeAdapter(List[AuditLogWithUser])
+
+
+def seed(conn):
+    conn.execute(text(SEED_SQL[0]), {"users": USERS})
+    conn.execute(text(SEED_SQL[1]), {"logs": LOGS, "users": USERS})
+    conn.execute(text("ANALYZE petcare.audit_logs"))
+
+
+def previous_implementation(db: Session, admin: User) -> bytes:
+    """Ruta anterior: objetos ORM + un schema por fila + validación/serialización de FastAPI + json"""
+    logs = AuditLogController.get_all(db=db, current_user=admin, limit=LIMIT)
+    enriched_logs = [
+        AuditLogWithUser(
+            id=str(log.id),
+            actor_user_id=str(log.actor_user_id) if log.actor_user_id else None,
+            action=log.action,
+            object_type=log.object_type,
+            object_id=str(log.object_id) if log.object_id else None,
+            meta=log.meta,
+            created_at=log.created_at,
+            updated_at=log.updated_at,
+            actor_username=log.actor.username if log.actor else None,
+            actor_email=log.actor.email if log.actor else None
+        )
+        for log in logs
+    ]
+    content = [log.model_dump(by_alias=True) for log in enriched_logs]
+    validated = RESPONSE_ADAPTER.validate_python(content)
+    serialized = RESPONSE_ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(serialized, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def current_implementation(db: Session, admin: User) -> bytes:
+    rows = AuditLogController.get_all_with_user_rows(db=db, current_user=admin, limit=LIMIT)
+    return list_response(rows).body
+
+
+def measure(db: Session, fn) -> tuple:
+    samples = []
+    body = b""
+    for _ in range(ITERATIONS):
+        db.expunge_all()
+        started_at = time.perf_counter()
+        body = fn()
+        samples.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(samples), max(samples), len(body)
+
+
+def main():
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            seed(conn)
+            db = Session(bind=conn)
+            admin = db.query(User).filter(User.email == "audit_bench_1@example.test").one()
+            print(f"{LOGS} logs de {USERS} usuarios, página de {LIMIT} filas\n")
+            print(f"{'implementación':<34}{'mediana (ms)':>14}{'máx (ms)':>12}{'bytes':>10}")
+            before = measure(db, lambda: previous_implementation(db, admin))
+            print(f"{'antes (Pydantic + json)':<34}{before[0]:>14.1f}{before[1]:>12.1f}{before[2]:>10}")
+            after = measure(db, lambda: current_implementation(db, admin))
+            print(f"{'ahora (filas + orjson)':<34}{after[0]:>14.1f}{after[1]:>12.1f}{after[2]:>10}")
+        finally:
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
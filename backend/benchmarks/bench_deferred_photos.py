@@ -0,0 +1,85 @@
+"""
+Benchmark de listados con fotos binarias (Pet.photo_bytea / PetPhoto.data)
+Ejecutar con: python -m benchmarks.bench_deferred_photos
+
+Carga mascotas y fotos con binarios de PHOTO_KB dentro de una transacción
+y compara la latencia y el pico de memoria del listado:
+- "antes": forzando la carga del binario con undefer() (comportamiento previo)
+- "ahora": mapeo por defecto (deferred + raiseload)
+Al final hace ROLLBACK: no deja datos en la base.
+"""
+import os
+import statistics
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from sqlalchemy.orm import Session, undefer
+from app.database import engine
+from app.models import Pet, PetPhoto, User
+
+PETS = 50
+PHOTOS_PER_PET = 4
+PHOTO_KB = 512
+ITERATIONS = 5
+
+
+def seed(db: Session) -> User:
+    now = datetime.now()
+    owner = User(
+        id=uuid.uuid4(),
+        username=f"bench_{uuid.uuid4().hex[:8]}",
+        email=f"bench_{uuid.uuid4().hex[:8]}@example.test",
+        hashed_password="x",
+        created_at=now,
+        updated_at=now
+    )
+    db.add(owner)
+    payload = os.urandom(PHOTO_KB * 1024)
+    for i in range(PETS):
+        pet = Pet(id=uuid.uuid4(), owner_id=owner.id, name=f"pet {i}", species="perro", photo_bytea=payload)
+        db.add(pet)
+        for _ in range(PHOTOS_PER_PET):
+            db.add(PetPhoto(pet_id=pet.id, file_name="foto.jpg", mime_type="image/jpeg", data=payload))
+    db.flush()
+    return owner
+
+
+def _measure(db: Session, build_query) -> tuple:
+    samples = []
+    peaks = []
+    for _ in range(ITERATIONS):
+        db.expunge_all()
+        tracemalloc.start()
+        started_at = time.perf_counter()
+        rows = build_query().all()
+        samples.append((time.perf_counter() - started_at) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1] / (1024 * 1024))
+        tracemalloc.stop()
+        del rows
+    return statistics.median(samples), max(peaks)
+
+
+def bench(db: Session, owner: User) -> None:
+    cases = [
+        ("pets (antes)", lambda: db.query(Pet).options(undefer(Pet.photo_bytea)).filter(Pet.owner_id == owner.id)),
+        ("pets (ahora)", lambda: db.query(Pet).filter(Pet.owner_id == owner.id)),
+        ("pet_photos (antes)", lambda: db.query(PetPhoto).options(undefer(PetPhoto.data)).join(Pet).filter(Pet.owner_id == owner.id)),
+        ("pet_photos (ahora)", lambda: db.query(PetPhoto).join(Pet).filter(Pet.owner_id == owner.id)),
+    ]
+    print(f"{PETS} mascotas, {PETS * PHOTOS_PER_PET} fotos, {PHOTO_KB} KB por binario\n")
+    print(f"{'consulta':<22}{'latencia (ms)':>16}{'pico memoria (MB)':>20}")
+    for name, build_query in cases:
+        latency_ms, peak_mb = _measure(db, build_query)
+        print(f"{name:<22}{latency_ms:>16.1f}{peak_mb:>20.1f}")
+
+
+if __name__ == "__main__":
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            db = Session(bind=conn)
+            owner = seed(db)
+            bench(db, owner)
+        finally:
+            transaction.rollback()
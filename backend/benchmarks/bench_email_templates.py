@@ -0,0 +1,91 @@
+"""
+Benchmark de render de emails (plantillas Jinja2 de app/templates/emails)
+Ejecutar con: python -m benchmarks.bench_email_templates
+
+Mide:
+- compilar las plantillas sin bytecode cache y con el cache ya escrito
+  (lo que paga un worker al arrancar)
+- renderizar RENDERS emails de recordatorio y de verificación con las
+  plantillas precompiladas (lo que paga el dispatcher por lote)
+- como referencia, compilar e inlinear el CSS en cada envío (sin Environment)
+No usa la base de datos.
+"""
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from jinja2 import Template
+from app.services.email_templates import STYLESHEET, TEMPLATES_DIR, EmailTemplates, inline_css, parse_css
+
+RENDERS = 10000
+NAIVE_RENDERS = 500
+
+
+def reminder_context(i: int) -> dict:
+    return {
+        "email": f"owner{i}@example.test",
+        "username": f"owner{i}",
+        "title": "Vacuna antirrábica",
+        "description": "Llevar la libreta de vacunación",
+        "pet_name": f"Firulais {i}",
+        "when": datetime(2026, 10, 17, 9, 0).strftime("%d/%m/%Y %H:%M"),
+    }
+
+
+def verification_context(i: int) -> dict:
+    return {"username": f"user{i}", "verification_url": f"https://app.example.test/verify-email?token={i:032x}"}
+
+
+def time_preload(cache_dir) -> float:
+    templates = EmailTemplates(TEMPLATES_DIR, cache_dir)
+    started_at = time.perf_counter()
+    templates.preload()
+    return (time.perf_counter() - started_at) * 1000
+
+
+def time_renders(templates: EmailTemplates, name: str, context_fn, count: int) -> tuple:
+    samples = []
+    started_at = time.perf_counter()
+    for i in range(count):
+        render_started_at = time.perf_counter()
+        templates.render(name, **context_fn(i))
+        samples.append((time.perf_counter() - render_started_at) * 1_000_000)
+    elapsed = time.perf_counter() - started_at
+    return elapsed, statistics.median(samples), sorted(samples)[int(len(samples) * 0.99) - 1]
+
+
+def naive_render(i: int, rules: dict, html_source: str) -> str:
+    """Referencia: inlinear el CSS y compilar la plantilla en cada envío"""
+    return Template(inline_css(html_source, rules)).render(**reminder_context(i), brand="Pet HealthCare", tagline="")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold_ms = time_preload(cache_dir)
+        warm_ms = time_preload(cache_dir)
+        print(f"compilar plantillas sin bytecode cache: {cold_ms:8.1f} ms")
+        print(f"compilar plantillas con bytecode cache: {warm_ms:8.1f} ms\n")
+
+        templates = EmailTemplates(TEMPLATES_DIR, cache_dir)
+        templates.preload()
+        print(f"{'email':<16}{'renders':>9}{'total (s)':>11}{'emails/s':>11}{'mediana (µs)':>14}{'p99 (µs)':>10}")
+        for name, context_fn in (("reminder", reminder_context), ("verification", verification_context)):
+            elapsed, median_us, p99_us = time_renders(templates, name, context_fn, RENDERS)
+            print(f"{name:<16}{RENDERS:>9}{elapsed:>11.2f}{RENDERS / elapsed:>11.0f}{median_us:>14.1f}{p99_us:>10.1f}")
+
+    # Referencia: sin precompilar (el contenido de reminder.html sin herencia)
+    rules = parse_css((TEMPLATES_DIR / STYLESHEET).read_text(encoding="utf-8"))
+    html_source = (TEMPLATES_DIR / "base.html").read_text(encoding="utf-8")
+    samples = []
+    for i in range(NAIVE_RENDERS):
+        render_started_at = time.perf_counter()
+        naive_render(i, rules, html_source)
+        samples.append((time.perf_counter() - render_started_at) * 1_000_000)
+    elapsed = sum(samples) / 1_000_000
+    print(
+        f"{'sin precompilar':<16}{NAIVE_RENDERS:>9}{elapsed:>11.2f}{NAIVE_RENDERS / elapsed:>11.0f}"
+        f"{statistics.median(samples):>14.1f}{sorted(samples)[int(len(samples) * 0.99) - 1]:>10.1f}"
+    )
+
+if __name__ == "__main__":
+    main()
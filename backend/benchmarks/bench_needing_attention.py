@@ -0,0 +1,135 @@
+"""
+Benchmark de /pets/needing-attention
+Ejecutar con: python -m benchmarks.bench_needing_attention
+
+Carga un usuario con PETS mascotas y miles de vacunas, desparasitaciones
+y visitas dentro de una transacción y compara:
+- "antes": las tres consultas JOIN ... DISTINCT que materializaban Pet completos
+- "ahora": la consulta única con CTEs de app/services/pet_attention.py
+Al final hace ROLLBACK: no deja datos en la base.
+"""
+import statistics
+import time
+from datetime import date, timedelta
+from sqlalchemy import and_, text
+from sqlalchemy.orm import Session
+from app.database import engine
+from app.models import Deworming, Pet, Vaccination
+from app.services.pet_attention import get_pets_needing_attention
+
+PETS = 500
+VACCINATIONS_PER_PET = 12
+DEWORMINGS_PER_PET = 8
+VET_VISITS_PER_PET = 6
+ITERATIONS = 20
+
+SEED_SQL = [
+    """
+    INSERT INTO petcare.users (id, username, email, hashed_password, role, is_active, created_at, updated_at)
+    VALUES (gen_random_uuid(), 'attention_bench', 'attention_bench@example.test', 'x', 'user', TRUE, now(), now())
+    """,
+    """
+    INSERT INTO petcare.pets (id, owner_id, name, species, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id, 'pet ' || g, 'perro', now(), now()
+    FROM petcare.users u CROSS JOIN generate_series(1, :pets) g
+    WHERE u.email = 'attention_bench@example.test'
+    """,
+    """
+    INSERT INTO petcare.vaccinations (id, pet_id, vaccine_name, date_administered, next_due, created_at, updated_at)
+    SELECT gen_random_uuid(), p.id, 'vacuna', current_date - (random() * 1000)::int,
+           CASE WHEN random() < 0.5 THEN current_date + (random() * 120 - 60)::int END, now(), now()
+    FROM petcare.pets p JOIN petcare.users u ON u.id = p.owner_id
+    CROSS JOIN generate_series(1, :vaccinations_per_pet)
+    WHERE u.email = 'attention_bench@example.test'
+    """,
+    """
+    INSERT INTO petcare.dewormings (id, pet_id, medication, date_administered, next_due, created_at, updated_at)
+    SELECT gen_random_uuid(), p.id, 'antiparasitario', current_date - (random() * 1000)::int,
+           CASE WHEN random() < 0.5 THEN current_date + (random() * 120 - 60)::int END, now(), now()
+    FROM petcare.pets p JOIN petcare.users u ON u.id = p.owner_id
+    CROSS JOIN generate_series(1, :dewormings_per_pet)
+    WHERE u.email = 'attention_bench@example.test'
+    """,
+    """
+    INSERT INTO petcare.vet_visits (id, pet_id, visit_date, reason, follow_up_date, created_at, updated_at)
+    SELECT gen_random_uuid(), p.id, now() - random() * interval '700 days', 'control',
+           CASE WHEN random() < 0.4 THEN now() + (random() * 60 - 30) * interval '1 day' END, now(), now()
+    FROM petcare.pets p JOIN petcare.users u ON u.id = p.owner_id
+    CROSS JOIN generate_series(1, :vet_visits_per_pet)
+    WHERE u.email = 'attention_bench@example.test'
+    """,
+]
+
+
+def seed(conn):
+    params = {
+        "pets": PETS,
+        "vaccinations_per_pet": VACCINATIONS_PER_PET,
+        "dewormings_per_pet": DEWORMINGS_PER_PET,
+        "vet_visits_per_pet": VET_VISITS_PER_PET,
+    }
+    for statement in SEED_SQL:
+        conn.execute(text(statement), params)
+    for table in ("users", "pets", "vaccinations", "dewormings", "vet_visits"):
+        conn.execute(text(f"ANALYZE petcare.{table}"))
+    return conn.execute(text(
+        "SELECT id FROM petcare.users WHERE email = 'attention_bench@example.test'"
+    )).scalar()
+
+
+def previous_implementation(db: Session, owner_id) -> int:
+    """Las tres consultas de la versión anterior (Pet completos, sin controles)"""
+    today = date.today()
+    next_week = today + timedelta(days=7)
+    overdue_vaccines = db.query(Pet).join(
+        Vaccination,
+        and_(Vaccination.pet_id == Pet.id, Vaccination.next_due < today, Vaccination.next_due.isnot(None))
+    ).filter(Pet.owner_id == owner_id).distinct().all()
+    upcoming_vaccines = db.query(Pet).join(
+        Vaccination,
+        and_(
+            Vaccination.pet_id == Pet.id,
+            Vaccination.next_due >= today,
+            Vaccination.next_due <= next_week,
+            Vaccination.next_due.isnot(None)
+        )
+    ).filter(Pet.owner_id == owner_id).distinct().all()
+    overdue_deworming = db.query(Pet).join(
+        Deworming,
+        and_(Deworming.pet_id == Pet.id, Deworming.next_due < today, Deworming.next_due.isnot(None))
+    ).filter(Pet.owner_id == owner_id).distinct().all()
+    return len(overdue_vaccines) + len(upcoming_vaccines) + len(overdue_deworming)
+
+
+def measure(db: Session, fn) -> tuple:
+    samples = []
+    result = None
+    for _ in range(ITERATIONS):
+        db.expunge_all()
+        started_at = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(samples), max(samples), result
+
+
+def main():
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            owner_id = seed(conn)
+            db = Session(bind=conn)
+            print(
+                f"{PETS} mascotas, {PETS * VACCINATIONS_PER_PET} vacunas, "
+                f"{PETS * DEWORMINGS_PER_PET} desparasitaciones, {PETS * VET_VISITS_PER_PET} visitas\n"
+            )
+            print(f"{'implementación':<22}{'mediana (ms)':>14}{'máx (ms)':>12}{'filas':>8}")
+            before = measure(db, lambda: previous_implementation(db, owner_id))
+            print(f"{'antes (3 consultas)':<22}{before[0]:>14.1f}{before[1]:>12.1f}{before[2]:>8}")
+            after = measure(db, lambda: len(get_pets_needing_attention(db, owner_id)))
+            print(f"{'ahora (CTE única)':<22}{after[0]:>14.1f}{after[1]:>12.1f}{after[2]:>8}")
+        finally:
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
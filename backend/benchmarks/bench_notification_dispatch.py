@@ -0,0 +1,92 @@
+"""
+Prueba de carga del worker de notificaciones, sin red
+Ejecutar con: python -m benchmarks.bench_notification_dispatch
+
+Usa el proveedor de email falso (EMAIL_PROVIDER=fake, FAKE_EMAIL_LATENCY_MS
+de latencia por envío). Para cada nivel de concurrencia carga REMINDERS
+recordatorios vencidos dentro de un savepoint, los despacha con
+NotificationDispatcher hasta vaciar la cola y mide el throughput.
+Los emails quedan en email_outbox (enviados o a reintentar).
+Requiere las revisiones e5b1f9c3a824 y f3a6d2c8b519. Al final hace ROLLBACK.
+
+Para probar varios workers a la vez contra datos reales, levantar varias
+instancias de `EMAIL_PROVIDER=fake python notification_worker.py` y comparar
+el total de notificaciones con el de recordatorios disparados.
+"""
+import time
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import engine
+from app.services.notification_dispatcher import NotificationDispatcher
+
+USERS = 200
+REMINDERS = 2000
+BATCH_SIZE = 100
+CONCURRENCY_LEVELS = [1, 10, 50]
+
+SEED_SQL = [
+    """
+    INSERT INTO petcare.users (id, username, email, hashed_password, role, is_active, created_at, updated_at)
+    SELECT gen_random_uuid(), 'notify_bench_' || g, 'notify_bench_' || g || '@example.test', 'x', 'user', TRUE, now(), now()
+    FROM generate_series(1, :users) g
+    """,
+    """
+    INSERT INTO petcare.reminders (id, owner_id, title, event_time, frequency, is_active,
+                                   notify_by_email, notify_in_app, next_fire_at, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id, 'Vacuna anual', now() - interval '1 hour', 'once', TRUE,
+           TRUE, TRUE, now() - random() * interval '1 hour', now(), now()
+    FROM petcare.users u CROSS JOIN generate_series(1, :reminders_per_user)
+    WHERE u.email LIKE 'notify_bench_%@example.test'
+    """,
+]
+
+
+def seed(conn):
+    conn.execute(text(SEED_SQL[0]), {"users": USERS})
+    conn.execute(text(SEED_SQL[1]), {"reminders_per_user": max(REMINDERS // USERS, 1)})
+    conn.execute(text("ANALYZE petcare.reminders"))
+
+
+def run(conn, concurrency: int) -> dict:
+    savepoint = conn.begin_nested()
+    try:
+        seed(conn)
+        # Cada commit del dispatcher libera un savepoint dentro de la transacción del benchmark
+        db = Session(bind=conn, join_transaction_mode="create_savepoint")
+        dispatcher = NotificationDispatcher(batch_size=BATCH_SIZE, concurrency=concurrency)
+        started_at = time.perf_counter()
+        while dispatcher.dispatch_batch(db):
+            pass
+        elapsed = time.perf_counter() - started_at
+        dispatcher.shutdown()
+        db.close()
+        stats = dispatcher.stats()
+        stats["elapsed_seconds"] = elapsed
+        return stats
+    finally:
+        savepoint.rollback()
+
+
+def main():
+    settings.EMAIL_PROVIDER = "fake"
+    print(
+        f"{REMINDERS} recordatorios vencidos, lotes de {BATCH_SIZE}, "
+        f"latencia del proveedor falso {settings.FAKE_EMAIL_LATENCY_MS:.0f} ms\n"
+    )
+    print(f"{'concurrencia':<14}{'total (s)':>10}{'recordatorios/s':>17}{'notificaciones/s':>18}{'lote (ms)':>11}{'a reintentar':>14}")
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            for concurrency in CONCURRENCY_LEVELS:
+                stats = run(conn, concurrency)
+                print(
+                    f"{concurrency:<14}{stats['elapsed_seconds']:>10.2f}{stats['reminders_per_second']:>17.1f}"
+                    f"{stats['notifications_per_second']:>18.1f}{stats['last_batch_ms']:>11.1f}{stats['emails_retried'] + stats['emails_failed']:>14}"
+                )
+        finally:
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
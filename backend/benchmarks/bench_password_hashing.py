@@ -0,0 +1,55 @@
+"""
+Benchmark del costo de CPU del login por esquema de hashing
+Ejecutar con: python -m benchmarks.bench_password_hashing
+
+Mide el tiempo de hash y verificación para distintos costos de bcrypt y
+scrypt, y el throughput de verificaciones concurrentes a través del pool
+de procesos. Sirve para elegir BCRYPT_ROUNDS / SCRYPT_LOG_N según el hardware.
+"""
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.utils.hashers import BcryptHasher, ScryptHasher
+from app.utils.security import hash_password, verify_password
+from app.services.password_hasher import password_hasher
+
+PASSWORD = "SecurePass123"
+ITERATIONS = 5
+CONCURRENT_LOGINS = 32
+
+
+def _measure(fn, *args) -> float:
+    samples = []
+    for _ in range(ITERATIONS):
+        started_at = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(samples)
+
+
+def bench_hashers():
+    print(f"{'esquema':<10}{'costo':<22}{'hash (ms)':>12}{'verify (ms)':>14}")
+    candidates = [BcryptHasher(rounds) for rounds in (10, 11, 12, 13)]
+    candidates += [ScryptHasher(log_n) for log_n in (14, 15, 16)]
+    for hasher in candidates:
+        hashed = hasher.hash(PASSWORD)
+        hash_ms = _measure(hasher.hash, PASSWORD)
+        verify_ms = _measure(hasher.verify, PASSWORD, hashed)
+        print(f"{hasher.scheme:<10}{str(hasher.policy()):<22}{hash_ms:>12.1f}{verify_ms:>14.1f}")
+
+
+def bench_pool_throughput():
+    hashed = hash_password(PASSWORD)
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENT_LOGINS) as threads:
+        results = list(threads.map(lambda _: verify_password(PASSWORD, hashed), range(CONCURRENT_LOGINS)))
+    elapsed = time.perf_counter() - started_at
+    print(f"\n{CONCURRENT_LOGINS} verificaciones concurrentes en {elapsed:.2f}s "
+          f"({CONCURRENT_LOGINS / elapsed:.1f} logins/s), ok={all(results)}")
+    print(f"Pool: {password_hasher.stats()}")
+
+
+if __name__ == "__main__":
+    bench_hashers()
+    bench_pool_throughput()
+    password_hasher.shutdown()
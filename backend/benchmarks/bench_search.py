@@ -0,0 +1,146 @@
+"""
+Benchmark de búsqueda: ILIKE '%...%' vs tsvector/GIN + pg_trgm
+Ejecutar con: python -m benchmarks.bench_search
+
+Carga USERS usuarios y un dueño con PETS mascotas y VET_VISITS visitas
+dentro de una transacción y compara la latencia de:
+- mascotas: ILIKE sobre nombre/especie/raza (antes) vs pet_match (ahora)
+- visitas: ILIKE sobre motivo/diagnóstico/tratamiento vs search_vector
+- usuarios: ILIKE sin índice (antes, forzando seq scan) vs índices trigram
+Requiere la revisión c2d84f1a6e37. Al final hace ROLLBACK.
+"""
+import statistics
+import time
+from sqlalchemy import or_, select, text
+from sqlalchemy.orm import Session
+from app.database import engine
+from app.models import Pet, User, VetVisit
+from app.services.search import pet_match, search
+
+USERS = 50000
+PETS = 5000
+VET_VISITS = 20000
+ITERATIONS = 20
+TERMS = ["golden", "firulays", "otitis", "vacuna anual"]
+
+SEED_SQL = [
+    """
+    INSERT INTO petcare.users (id, username, email, full_name, hashed_password, role, is_active, created_at, updated_at)
+    SELECT gen_random_uuid(), 'search_user_' || g, 'search_user_' || g || '@example.test',
+           (ARRAY['Ana', 'Luis', 'Marta', 'Jorge', 'Sofía'])[1 + g % 5] || ' ' || md5(g::text),
+           'x', 'user', TRUE, now(), now()
+    FROM generate_series(1, :users) g
+    """,
+    """
+    INSERT INTO petcare.pets (id, owner_id, name, species, breed, notes, created_at, updated_at)
+    SELECT gen_random_uuid(), (SELECT id FROM petcare.users WHERE email = 'search_user_1@example.test'),
+           (ARRAY['Firulais', 'Luna', 'Rocky', 'Toby', 'Nala'])[1 + g % 5] || ' ' || g,
+           (ARRAY['perro', 'gato', 'ave'])[1 + g % 3],
+           (ARRAY['Golden Retriever', 'Siamés', 'Labrador', 'Mestizo'])[1 + g % 4],
+           'Notas de la mascota ' || md5(g::text), now(), now()
+    FROM generate_series(1, :pets) g
+    """,
+    """
+    INSERT INTO petcare.vet_visits (id, pet_id, visit_date, reason, diagnosis, treatment, created_at, updated_at)
+    SELECT gen_random_uuid(), p.id, now() - random() * interval '700 days',
+           (ARRAY['Vacuna anual', 'Control general', 'Dolor de oído', 'Vómitos'])[1 + (random() * 3)::int],
+           (ARRAY['Otitis externa', 'Sano', 'Gastritis', 'Dermatitis'])[1 + (random() * 3)::int],
+           (ARRAY['Gotas óticas', 'Ninguno', 'Dieta blanda', 'Antibiótico'])[1 + (random() * 3)::int],
+           now(), now()
+    FROM (
+        SELECT id FROM petcare.pets
+        WHERE owner_id = (SELECT id FROM petcare.users WHERE email = 'search_user_1@example.test')
+    ) p CROSS JOIN generate_series(1, :visits_per_pet)
+    """,
+]
+
+
+def seed(conn):
+    conn.execute(text(SEED_SQL[0]), {"users": USERS})
+    conn.execute(text(SEED_SQL[1]), {"pets": PETS})
+    conn.execute(text(SEED_SQL[2]), {"visits_per_pet": max(VET_VISITS // PETS, 1)})
+    for table in ("users", "pets", "vet_visits"):
+        conn.execute(text(f"ANALYZE petcare.{table}"))
+    return conn.execute(text(
+        "SELECT id FROM petcare.users WHERE email = 'search_user_1@example.test'"
+    )).scalar()
+
+
+def ilike_pets(db: Session, owner_id, term: str) -> int:
+    pattern = f"%{term}%"
+    return len(db.execute(select(Pet.id).where(
+        Pet.owner_id == owner_id,
+        or_(Pet.name.ilike(pattern), Pet.species.ilike(pattern), Pet.breed.ilike(pattern))
+    )).all())
+
+
+def fts_pets(db: Session, owner_id, term: str) -> int:
+    return len(db.execute(select(Pet.id).where(Pet.owner_id == owner_id, pet_match(term))).all())
+
+
+def ilike_vet_visits(db: Session, owner_id, term: str) -> int:
+    pattern = f"%{term}%"
+    return len(db.execute(select(VetVisit.id).join(Pet).where(
+        Pet.owner_id == owner_id,
+        or_(VetVisit.reason.ilike(pattern), VetVisit.diagnosis.ilike(pattern), VetVisit.treatment.ilike(pattern))
+    )).all())
+
+
+def fts_vet_visits(db: Session, owner_id, term: str) -> int:
+    return len(search(db, owner_id, term, types=["vet_visits"], limit=100000))
+
+
+def users_query(db: Session, term: str) -> int:
+    pattern = f"%{term}%"
+    return len(db.execute(select(User.id).where(or_(
+        User.username.ilike(pattern), User.email.ilike(pattern), User.full_name.ilike(pattern)
+    ))).all())
+
+
+def measure(fn) -> tuple:
+    samples = []
+    result = None
+    for _ in range(ITERATIONS):
+        started_at = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            owner_id = seed(conn)
+            db = Session(bind=conn)
+            print(f"{USERS} usuarios, {PETS} mascotas, {VET_VISITS} visitas\n")
+            print(f"{'consulta':<34}{'antes (ms)':>12}{'filas':>8}{'ahora (ms)':>12}{'filas':>8}")
+            for term in TERMS:
+                cases = [
+                    ("pets", lambda: ilike_pets(db, owner_id, term), lambda: fts_pets(db, owner_id, term)),
+                    ("vet_visits", lambda: ilike_vet_visits(db, owner_id, term), lambda: fts_vet_visits(db, owner_id, term)),
+                ]
+                for name, before_fn, after_fn in cases:
+                    before_ms, before_rows = measure(before_fn)
+                    after_ms, after_rows = measure(after_fn)
+                    label = f"{name} '{term}'"
+                    print(f"{label:<34}{before_ms:>12.1f}{before_rows:>8}{after_ms:>12.1f}{after_rows:>8}")
+
+            # Usuarios: misma consulta ILIKE, sin y con los índices trigram
+            for term in ("ana", "search_user_4242"):
+                conn.execute(text("SET LOCAL enable_bitmapscan = off"))
+                conn.execute(text("SET LOCAL enable_indexscan = off"))
+                before_ms, before_rows = measure(lambda: users_query(db, term))
+                conn.execute(text("SET LOCAL enable_bitmapscan = on"))
+                conn.execute(text("SET LOCAL enable_indexscan = on"))
+                after_ms, after_rows = measure(lambda: users_query(db, term))
+                label = f"users '{term}'"
+                print(f"{label:<34}{before_ms:>12.1f}{before_rows:>8}{after_ms:>12.1f}{after_rows:>8}")
+            print("\nNota: el full-text busca palabras (con prefijos y stemming) y tolera errores")
+            print("de tipeo en el nombre, así que el número de filas puede diferir del ILIKE")
+        finally:
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Benchmark del arranque de la API
+Ejecutar con: python -m benchmarks.bench_startup
+
+Cada medición corre en un proceso nuevo (como un worker recién creado por
+el autoscaling), RUNS veces, y reporta la mediana de:
+- import: `import app.main` (routers, modelos, servicios)
+- engine al importar: si el import dejó creado el engine (debe ser "no":
+  importar la app no carga el driver ni abre conexiones)
+- arranque: eventos de startup (lifespan) hasta estar lista para atender
+- primer request: GET /health/ready, que abre la primera conexión del pool
+- create_all: lo que costaba el import antes (conectar y revisar las tablas
+  con Base.metadata.create_all); ahora lo hacen init_db.py y alembic
+"""
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+RUNS = 5
+FIRST_REQUEST_PATH = "/health/ready"
+
+
+def _time_to_first_request() -> dict:
+    import asyncio
+
+    started_at = time.perf_counter()
+    from app.main import app
+    from app import database
+    imported_at = time.perf_counter()
+    engine_created_on_import = database._engine is not None
+
+    async def run() -> dict:
+        lifespan_messages: "asyncio.Queue[dict]" = asyncio.Queue()
+        completed = {"lifespan.startup.complete": asyncio.Event(), "lifespan.shutdown.complete": asyncio.Event()}
+
+        async def lifespan_receive():
+            return await lifespan_messages.get()
+
+        async def lifespan_send(message):
+            if message["type"].endswith(".failed"):
+                raise RuntimeError(f"{message['type']}: {message.get('message')}")
+            completed[message["type"]].set()
+
+        lifespan_scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}
+        lifespan = asyncio.create_task(app(lifespan_scope, lifespan_receive, lifespan_send))
+        await lifespan_messages.put({"type": "lifespan.startup"})
+        await completed["lifespan.startup.complete"].wait()
+        started_up_at = time.perf_counter()
+
+        response = {}
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": FIRST_REQUEST_PATH,
+            "raw_path": FIRST_REQUEST_PATH.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"testserver")],
+            "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+        }
+        await app(scope, receive, send)
+        responded_at = time.perf_counter()
+
+        await lifespan_messages.put({"type": "lifespan.shutdown"})
+        await completed["lifespan.shutdown.complete"].wait()
+        await lifespan
+        return {
+            "startup_s": started_up_at - imported_at,
+            "first_request_s": responded_at - started_up_at,
+            "status": response.get("status")
+        }
+
+    result = asyncio.run(run())
+    return {
+        "import_s": imported_at - started_at,
+        "engine_created_on_import": engine_created_on_import,
+        **result
+    }
+
+
+def _create_all() -> dict:
+    from app.database import Base, get_engine
+    from app import models  # noqa: F401
+
+    engine = get_engine()
+    started_at = time.perf_counter()
+    Base.metadata.create_all(bind=engine)
+    return {"create_all_s": time.perf_counter() - started_at}
+
+
+CHILDREN = {
+    "first-request": _time_to_first_request,
+    "create-all": _create_all,
+}
+
+
+def run_child(name: str) -> dict:
+    """Corre una medición en un proceso nuevo; el resultado es la última línea (JSON)"""
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child", name],
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    samples = [run_child("first-request") for _ in range(RUNS)]
+    create_all = [run_child("create-all")["create_all_s"] for _ in range(RUNS)]
+
+    def median_ms(key: str) -> float:
+        return statistics.median(sample[key] for sample in samples) * 1000
+
+    import_ms = median_ms("import_s")
+    startup_ms = median_ms("startup_s")
+    first_request_ms = median_ms("first_request_s")
+    create_all_ms = statistics.median(create_all) * 1000
+    engine_on_import = any(sample["engine_created_on_import"] for sample in samples)
+    statuses = sorted({sample["status"] for sample in samples})
+
+    print(f"Mediana de {RUNS} procesos nuevos")
+    print(f"  import app.main:          {import_ms:8.1f} ms")
+    print(f"  engine creado al importar: {'sí ❌' if engine_on_import else 'no ✅'}")
+    print(f"  startup (lifespan):       {startup_ms:8.1f} ms")
+    print(f"  primer request ({FIRST_REQUEST_PATH}): {first_request_ms:8.1f} ms  status={statuses}")
+    print(f"  total hasta responder:    {import_ms + startup_ms + first_request_ms:8.1f} ms")
+    print(f"\n  create_all (antes, en cada import): {create_all_ms:8.1f} ms")
+    print(f"  total estimado antes:     {import_ms + create_all_ms + startup_ms + first_request_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        print(json.dumps(CHILDREN[sys.argv[2]]()))
+    else:
+        main()
@@ -0,0 +1,82 @@
+"""
+Chequeo del número de consultas de /pets/dashboard
+Ejecutar con: python -m benchmarks.check_dashboard_queries
+
+Arma el dashboard para usuarios con 1, 10 y 50 mascotas (con vacunas,
+desparasitaciones, visitas y recordatorios) contando las sentencias SQL
+que llegan al driver. Falla (exit code 1) si el conteo no es exactamente
+DASHBOARD_QUERIES en todos los casos, es decir, si alguna sección volvió
+a consultar por mascota. Al final hace ROLLBACK: no deja datos en la base.
+"""
+import sys
+import uuid
+from datetime import date, datetime, timedelta
+from sqlalchemy.orm import Session
+from app.database import engine
+from app.models import Deworming, Pet, Reminder, User, Vaccination, VetVisit
+from app.services.pet_dashboard import DASHBOARD_QUERIES, get_dashboard
+from app.utils.query_counter import count_statements
+
+PET_COUNTS = [1, 10, 50]
+
+
+def seed(db: Session, pets: int) -> User:
+    now = datetime.now()
+    owner = User(
+        id=uuid.uuid4(),
+        username=f"dash_{uuid.uuid4().hex[:8]}",
+        email=f"dash_{uuid.uuid4().hex[:8]}@example.test",
+        hashed_password="x",
+        created_at=now,
+        updated_at=now
+    )
+    db.add(owner)
+    for i in range(pets):
+        pet = Pet(id=uuid.uuid4(), owner_id=owner.id, name=f"pet {i}", species="perro")
+        db.add(pet)
+        for days in (400, 30):
+            db.add(Vaccination(
+                pet_id=pet.id,
+                vaccine_name="rabia",
+                date_administered=date.today() - timedelta(days=days),
+                next_due=date.today() + timedelta(days=365 - days)
+            ))
+        db.add(Deworming(pet_id=pet.id, medication="antiparasitario", date_administered=date.today()))
+        db.add(VetVisit(pet_id=pet.id, visit_date=now - timedelta(days=10), reason="control"))
+        db.add(Reminder(owner_id=owner.id, pet_id=pet.id, title="vacuna", event_time=now + timedelta(days=2)))
+    db.flush()
+    return owner
+
+
+def count_queries(conn, fn) -> int:
+    with count_statements(conn) as statements:
+        fn()
+    return len(statements)
+
+
+def main() -> int:
+    failures = []
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            db = Session(bind=conn)
+            for pets in PET_COUNTS:
+                owner = seed(db, pets)
+                items = []
+                queries = count_queries(conn, lambda: items.extend(get_dashboard(db, owner.id)))
+                ok = queries == DASHBOARD_QUERIES and len(items) == pets
+                print(f"{pets:>4} mascotas: {queries} consultas  {'✅' if ok else '❌'}")
+                if not ok:
+                    failures.append(pets)
+        finally:
+            transaction.rollback()
+
+    if failures:
+        print(f"\n❌ Se esperaban {DASHBOARD_QUERIES} consultas para cualquier número de mascotas")
+        return 1
+    print(f"\n✅ El dashboard usa {DASHBOARD_QUERIES} consultas sin importar el número de mascotas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
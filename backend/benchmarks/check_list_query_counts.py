@@ -0,0 +1,223 @@
+"""
+Chequeo de consultas N+1 en los listados
+Ejecutar con: python -m benchmarks.check_list_query_counts
+
+Llama a cada endpoint de listado (GET con parámetro `limit`) a través de
+FastAPI, con limit=SMALL_PAGE y limit=LARGE_PAGE, contando las sentencias SQL
+que llegan al driver. Falla (exit code 1) si alguno hace más consultas con la
+página grande, es decir, si carga una relación fila por fila (lazy load) en
+lugar de en la consulta del listado o con selectinload / joinedload. También
+falla si un listado de los routers no está en ENDPOINTS, para que los nuevos
+entren al chequeo.
+
+Los logs y resets de la primera página son de usuarios distintos y la sesión
+se vacía antes de cada request, así el identity map no esconde los lazy
+loads. La sesión corre dentro de una transacción que al final hace
+ROLLBACK: no deja datos en la base.
+"""
+import asyncio
+import sys
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Tuple
+from urllib.parse import urlencode
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy.orm import Session
+from app.database import engine
+from app.middleware.auth import get_current_active_user, get_db
+from app.middleware.error_handler import setup_error_handlers
+from app.models import (
+    AuditLog, Deworming, Meal, Notification, NutritionPlan, PasswordReset,
+    Pet, PetPhoto, Reminder, User, Vaccination, VetVisit
+)
+from app.routes import (
+    audit_logs, dewormings, meals, notifications, nutrition_plans, password_resets,
+    pet_photos, pets, reminders, search, users, vaccinations, vet_visits
+)
+from app.utils.query_counter import count_statements
+from app.utils.serialization import ORJSONResponse
+
+SMALL_PAGE = 5
+LARGE_PAGE = 50
+ROWS = LARGE_PAGE + 5
+
+# Listados a chequear: ruta -> parámetros extra del query string
+ENDPOINTS = {
+    "/audit-logs/": {},
+    "/audit-logs/my-activity": {},
+    "/audit-logs/user/{user_id}/activity": {},
+    "/audit-logs/object/{object_type}/{object_id}/history": {},
+    "/password-resets/": {},
+    "/password-resets/user/{user_id}/history": {},
+    "/users/": {},
+    "/pets/": {},
+    "/pets/search": {"q": "luna"},
+    "/search": {"q": "luna", "types": "pets"},
+    "/vaccinations/": {},
+    "/dewormings/": {},
+    "/vet-visits/": {},
+    "/nutrition-plans/": {},
+    "/nutrition-plans/pet/{pet_id}/history": {},
+    "/meals/": {},
+    "/reminders/": {},
+    "/notifications/": {},
+    "/pet-photos/pet/{pet_id}": {},
+}
+
+ROUTERS = [
+    audit_logs, dewormings, meals, notifications, nutrition_plans, password_resets,
+    pet_photos, pets, reminders, search, users, vaccinations, vet_visits
+]
+
+
+def build_app(db: Session, current_user: dict) -> FastAPI:
+    """App con los routers sync, la sesión de la transacción y el admin como usuario actual"""
+    app = FastAPI(default_response_class=ORJSONResponse)
+    setup_error_handlers(app)
+    for module in ROUTERS:
+        app.include_router(module.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_active_user] = lambda: current_user["user"]
+    return app
+
+
+def list_routes(app: FastAPI) -> set:
+    return {
+        route.path
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        and "GET" in route.methods
+        and any(param.name == "limit" for param in route.dependant.query_params)
+    }
+
+
+def get(app: FastAPI, path: str, params: dict) -> Tuple[int, bytes]:
+    """GET directo contra la app ASGI (sin cliente HTTP)"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": urlencode(params).encode(),
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    status_code = next(m["status"] for m in messages if m["type"] == "http.response.start")
+    body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+    return status_code, body
+
+
+def _user(prefix: str, role: str = "user") -> User:
+    tag = uuid.uuid4().hex[:10]
+    return User(
+        id=uuid.uuid4(),
+        username=f"{prefix}_{tag}",
+        email=f"{prefix}_{tag}@example.test",
+        hashed_password="x",
+        role=role,
+        is_active=True
+    )
+
+
+def seed(db: Session) -> Dict[str, str]:
+    now = datetime.now(timezone.utc)
+    admin = _user("list_admin", role="admin")
+    actors = [_user("list_actor") for _ in range(ROWS)]
+    db.add_all([admin, *actors])
+    db.flush()
+
+    pet_list = [Pet(id=uuid.uuid4(), owner_id=admin.id, name=f"luna {i}", species="perro") for i in range(ROWS)]
+    db.add_all(pet_list)
+    db.flush()
+    first_pet = pet_list[0]
+
+    for i, (pet, actor) in enumerate(zip(pet_list, actors)):
+        recent = now - timedelta(minutes=i)
+        older = now - timedelta(days=1, minutes=i)
+        db.add(Vaccination(pet_id=pet.id, vaccine_name="rabia", date_administered=date.today()))
+        db.add(Deworming(pet_id=pet.id, medication="antiparasitario", date_administered=date.today()))
+        db.add(VetVisit(pet_id=pet.id, visit_date=recent, reason="control"))
+        plan = NutritionPlan(id=uuid.uuid4(), pet_id=first_pet.id, name=f"plan {i}", calories_per_day=500)
+        db.add(plan)
+        db.add(Meal(pet_id=pet.id, plan_id=plan.id, meal_time=recent, calories=200))
+        reminder = Reminder(id=uuid.uuid4(), owner_id=admin.id, pet_id=pet.id, title="vacuna", event_time=now + timedelta(days=1))
+        db.add(reminder)
+        db.add(Notification(reminder_id=reminder.id, owner_id=admin.id, pet_id=pet.id, sent_at=recent, method="in_app", status="sent"))
+        db.add(PetPhoto(pet_id=first_pet.id, file_name=f"foto{i}.jpg", mime_type="image/jpeg", sha256="0" * 64))
+        # Primera página de /audit-logs/ y /password-resets/: un usuario distinto por fila
+        db.add(AuditLog(actor_user_id=actor.id, action="pet.update", object_type="Pet", object_id=first_pet.id, created_at=recent))
+        db.add(PasswordReset(user_id=actor.id, token=uuid.uuid4().hex, expires_at=now + timedelta(hours=1), created_at=recent))
+        # Actividad e historial de resets del admin (más antiguos)
+        db.add(AuditLog(actor_user_id=admin.id, action="pet.view", object_type="Pet", object_id=pet.id, created_at=older))
+        db.add(PasswordReset(user_id=admin.id, token=uuid.uuid4().hex, expires_at=now + timedelta(hours=1), created_at=older))
+    db.flush()
+    return {
+        "admin_id": admin.id,
+        "user_id": str(admin.id),
+        "pet_id": str(first_pet.id),
+        "object_type": "Pet",
+        "object_id": str(first_pet.id),
+    }
+
+
+def main() -> int:
+    failures = []
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            db = Session(bind=conn)
+            ids = seed(db)
+            current_user = {}
+            app = build_app(db, current_user)
+
+            missing = list_routes(app) - set(ENDPOINTS)
+            for path in sorted(missing):
+                print(f"❌ {path}: listado sin entrada en ENDPOINTS")
+                failures.append(path)
+
+            for path, params in ENDPOINTS.items():
+                url = path.format(**ids)
+                counts = []
+                for limit in (SMALL_PAGE, LARGE_PAGE):
+                    # Sesión vacía: cada request carga sus relaciones desde la base
+                    db.expunge_all()
+                    current_user["user"] = db.get(User, ids["admin_id"])
+                    with count_statements(conn) as statements:
+                        status_code, body = get(app, url, {**params, "limit": limit})
+                    if status_code != 200:
+                        print(f"❌ {path}: HTTP {status_code} {body[:200]!r}")
+                        failures.append(path)
+                        break
+                    counts.append(len(statements))
+                else:
+                    ok = counts[0] == counts[1]
+                    print(f"{path:<55} limit={SMALL_PAGE}: {counts[0]:>3}  limit={LARGE_PAGE}: {counts[1]:>3}  {'✅' if ok else '❌'}")
+                    if not ok:
+                        failures.append(path)
+        finally:
+            transaction.rollback()
+
+    if failures:
+        print(f"\n❌ Listados con problemas: {', '.join(failures)}")
+        return 1
+    print("\n✅ Todos los listados usan el mismo número de consultas sin importar el tamaño de página")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""
+Chequeo de regresión de planes de ejecución (EXPLAIN)
+Ejecutar con: python -m benchmarks.check_query_plans
+
+Carga un dataset sintético dentro de una transacción, ejecuta ANALYZE y
+revisa el plan de cada consulta "caliente", armada con los mismos builders
+que usan los controladores y los workers (listados, estadísticas, dashboard,
+mascotas que necesitan atención, búsqueda, recordatorios vencidos y outbox
+de emails). Falla (exit code 1) si alguna cae en un Seq Scan, p. ej. porque
+se borró o dejó de aplicarse un índice de alembic/versions.
+Al final hace ROLLBACK: no deja datos ni estadísticas en la base.
+"""
+import json
+import sys
+from datetime import date, datetime, timezone
+from sqlalchemy import desc, select, text
+from app.database import engine
+from app.models import AuditLog, Meal, Notification, Pet, Reminder, Vaccination
+from app.services.email_outbox import pending_query
+from app.services.pet_attention import attention_query
+from app.services.pet_dashboard import summary_queries
+from app.services.pet_stats import stats_query
+from app.services.reminder_scheduler import due_query
+from app.services.search import search_query
+from app.controllers.pets import PET_KEYSET
+from app.controllers.vaccinations import VACCINATION_KEYSET
+from app.controllers.meals import MEAL_KEYSET
+from app.controllers.notifications import NOTIFICATION_KEYSET
+from app.controllers.audit_logs import AUDIT_LOG_KEYSET
+
+USERS = 1000
+PETS_PER_USER = 4
+VACCINATIONS_PER_PET = 20
+DEWORMINGS_PER_PET = 10
+MEALS_PER_PET = 50
+VET_VISITS_PER_PET = 5
+REMINDERS_PER_PET = 10
+NOTIFICATIONS_PER_USER = 100
+AUDIT_LOGS_PER_USER = 200
+OUTBOX_EMAILS = 20000
+PAGE_SIZE = 100
+# Lotes de los workers (notification_worker.py, email_outbox_worker.py)
+WORKER_BATCH_SIZE = 100
+
+SEED_SQL = [
+    """
+    INSERT INTO petcare.users (id, username, email, full_name, hashed_password, role, is_active, created_at, updated_at)
+    SELECT gen_random_uuid(), 'plan_user_' || g, 'plan_user_' || g || '@example.test', 'Usuario ' || g, 'x', 'user', TRUE,
+           now() - g * interval '1 minute', now()
+    FROM generate_series(1, :users) g
+    """,
+    """
+    INSERT INTO petcare.pets (id, owner_id, name, species, breed, notes, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id, 'pet ' || g, 'perro', (ARRAY['golden retriever', 'labrador', 'mestizo'])[1 + g % 3],
+           'come dos veces al día', now() - random() * interval '365 days', now()
+    FROM petcare.users u CROSS JOIN generate_series(1, :pets_per_user) g
+    WHERE u.email LIKE 'plan_user_%'
+    """,
+    """
+    INSERT INTO petcare.vaccinations (id, pet_id, vaccine_name, date_administered, next_due, created_at, updated_at)
+    SELECT gen_random_uuid(), p.id, 'vacuna', current_date - (random() * 1000)::int,
+           CASE WHEN random() < 0.3 THEN current_date + (random() * 60 - 30)::int END, now(), now()
+    FROM petcare.pets p JOIN petcare.users u ON u.id = p.owner_id
+    CROSS JOIN generate_series(1, :vaccinations_per_pet)
+    WHERE u.email LIKE 'plan_user_%'
+    """,
+    """
+    INSERT INTO petcare.dewormings (id, pet_id, medication, date_administered, next_due, created_at, updated_at)
+    SELECT gen_random_uuid(), p.id, 'antiparasitario', current_date - (random() * 1000)::int,
+           CASE WHEN random() < 0.3 THEN current_date + (random() * 60 - 30)::int END, now(), now()
+    FROM petcare.pets p JOIN petcare.users u ON u.id = p.owner_id
+    CROSS JOIN generate_series(1, :dewormings_per_pet)
+    WHERE u.email LIKE 'plan_user_%'
+    """,
+    """
+    INSERT INTO petcare.meals (id, pet_id, meal_time, calories, created_at, updated_at)
+    SELECT gen_random_uuid(), p.id, now() - random() * interval '365 days', 300, now(), now()
+    FROM petcare.pets p JOIN petcare.users u ON u.id = p.owner_id
+    CROSS JOIN generate_series(1, :meals_per_pet)
+    WHERE u.email LIKE 'plan_user_%'
+    """,
+    """
+    INSERT INTO petcare.vet_visits (id, pet_id, visit_date, reason, diagnosis, treatment, follow_up_date, created_at, updated_at)
+    SELECT gen_random_uuid(), p.id, now() - random() * interval '1000 days',
+           (ARRAY['control anual', 'vómitos', 'cojera', 'vacunación'])[1 + g % 4], 'sin hallazgos', 'reposo',
+           CASE WHEN random() < 0.2 THEN now() + (random() * 60 - 30) * interval '1 day' END, now(), now()
+    FROM petcare.pets p JOIN petcare.users u ON u.id = p.owner_id
+    CROSS JOIN generate_series(1, :vet_visits_per_pet) g
+    WHERE u.email LIKE 'plan_user_%'
+    """,
+    # next_fire_at: casi todos a futuro, ~5% vencidos y ~5% sin programar (fuera del índice parcial)
+    """
+    INSERT INTO petcare.reminders (id, owner_id, pet_id, title, event_time, is_active, notify_by_email, notify_in_app,
+                                   next_fire_at, created_at, updated_at)
+    SELECT gen_random_uuid(), p.owner_id, p.id, 'recordatorio', event_time, TRUE, TRUE, TRUE,
+           CASE WHEN r < 0.90 THEN now() + random() * interval '365 days'
+                WHEN r < 0.95 THEN now() - random() * interval '1 hour' END,
+           now(), now()
+    FROM (
+        SELECT p.id, p.owner_id, now() + (random() * 60 - 30) * interval '1 day' AS event_time, random() AS r
+        FROM petcare.pets p JOIN petcare.users u ON u.id = p.owner_id
+        CROSS JOIN generate_series(1, :reminders_per_pet)
+        WHERE u.email LIKE 'plan_user_%'
+    ) p
+    """,
+    """
+    INSERT INTO petcare.notifications (id, owner_id, sent_at, method, status, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id, now() - random() * interval '365 days', 'email', 'sent', now(), now()
+    FROM petcare.users u CROSS JOIN generate_series(1, :notifications_per_user)
+    WHERE u.email LIKE 'plan_user_%'
+    """,
+    """
+    INSERT INTO petcare.audit_logs (id, actor_user_id, action, object_type, object_id, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id, 'PET_UPDATED', 'Pet', gen_random_uuid(),
+           now() - random() * interval '365 days', now()
+    FROM petcare.users u CROSS JOIN generate_series(1, :audit_logs_per_user)
+    WHERE u.email LIKE 'plan_user_%'
+    """,
+    # Outbox: casi todo enviado, ~1% pendiente (lo que toma el worker)
+    """
+    INSERT INTO petcare.email_outbox (id, to_email, template, payload, status, attempts, next_attempt_at, created_at, updated_at)
+    SELECT gen_random_uuid(), 'plan_outbox_' || g || '@example.test', 'verification', '{}'::jsonb,
+           CASE WHEN random() < 0.01 THEN 'pending' ELSE 'sent' END, 1,
+           now() - random() * interval '30 days', now(), now()
+    FROM generate_series(1, :outbox_emails) g
+    """,
+]
+
+TABLES = [
+    "users", "pets", "vaccinations", "dewormings", "meals", "vet_visits",
+    "reminders", "notifications", "audit_logs", "email_outbox",
+]
+
+
+def seed(conn) -> None:
+    params = {
+        "users": USERS,
+        "pets_per_user": PETS_PER_USER,
+        "vaccinations_per_pet": VACCINATIONS_PER_PET,
+        "dewormings_per_pet": DEWORMINGS_PER_PET,
+        "meals_per_pet": MEALS_PER_PET,
+        "vet_visits_per_pet": VET_VISITS_PER_PET,
+        "reminders_per_pet": REMINDERS_PER_PET,
+        "notifications_per_user": NOTIFICATIONS_PER_USER,
+        "audit_logs_per_user": AUDIT_LOGS_PER_USER,
+        "outbox_emails": OUTBOX_EMAILS,
+    }
+    for statement in SEED_SQL:
+        conn.execute(text(statement), params)
+    for table in TABLES:
+        conn.execute(text(f"ANALYZE petcare.{table}"))
+
+
+def second_page(conn, keyset, query):
+    """Consulta de la página 2 usando el cursor de la última fila de la página 1"""
+    rows = conn.execute(keyset.paginate(query, None, 0, PAGE_SIZE)).all()
+    cursor = keyset.next_cursor(rows, PAGE_SIZE)
+    return keyset.paginate(query, cursor, 0, PAGE_SIZE)
+
+
+def hot_queries(conn) -> dict:
+    """Las mismas consultas que arman los controladores y los workers, para un usuario del dataset"""
+    owner_id = conn.execute(text(
+        "SELECT id FROM petcare.users WHERE email LIKE 'plan_user_%' LIMIT 1"
+    )).scalar()
+    pet_id = conn.execute(text(
+        "SELECT id FROM petcare.pets WHERE owner_id = :owner_id LIMIT 1"
+    ), {"owner_id": owner_id}).scalar()
+    object_id = conn.execute(text(
+        "SELECT object_id FROM petcare.audit_logs WHERE actor_user_id = :owner_id LIMIT 1"
+    ), {"owner_id": owner_id}).scalar()
+    now = datetime.now(timezone.utc)
+
+    owner_meals = select(Meal).join(Pet).where(Pet.owner_id == owner_id, Meal.pet_id == pet_id)
+    all_audit_logs = select(AuditLog)
+
+    queries = {
+        "pets.list": PET_KEYSET.paginate(
+            select(Pet).where(Pet.owner_id == owner_id), None, 0, PAGE_SIZE
+        ),
+        "vaccinations.list": VACCINATION_KEYSET.paginate(
+            select(Vaccination).join(Pet).where(Pet.owner_id == owner_id, Vaccination.pet_id == pet_id),
+            None, 0, PAGE_SIZE
+        ),
+        "meals.list": MEAL_KEYSET.paginate(owner_meals, None, 0, PAGE_SIZE),
+        "meals.list (cursor)": second_page(conn, MEAL_KEYSET, owner_meals),
+        "reminders.list": select(Reminder).where(
+            Reminder.owner_id == owner_id
+        ).order_by(Reminder.event_time).limit(PAGE_SIZE),
+        "notifications.list": NOTIFICATION_KEYSET.paginate(
+            select(Notification).where(Notification.owner_id == owner_id), None, 0, PAGE_SIZE
+        ),
+        "audit_logs.by_actor": AUDIT_LOG_KEYSET.paginate(
+            select(AuditLog).where(AuditLog.actor_user_id == owner_id), None, 0, PAGE_SIZE
+        ),
+        "audit_logs.admin (cursor)": second_page(conn, AUDIT_LOG_KEYSET, all_audit_logs),
+        "audit_logs.object_history": select(AuditLog).where(
+            AuditLog.object_type == "Pet",
+            AuditLog.object_id == object_id
+        ).order_by(desc(AuditLog.created_at)).limit(PAGE_SIZE),
+        "pets.stats": stats_query(owner_id),
+        "pets.needing_attention": attention_query(owner_id, date.today()),
+        "search.pets+vet_visits": search_query(owner_id, "control", ("pets", "vet_visits")),
+        "search.users": search_query(owner_id, "plan_user_1", ("users",)),
+        "reminders.due": due_query(now, WORKER_BATCH_SIZE),
+        "email_outbox.pending": pending_query(now, WORKER_BATCH_SIZE),
+    }
+    # El dashboard usa la hora UTC sin zona (ver get_health_summaries)
+    for name, query in summary_queries(owner_id, None, datetime.utcnow()).items():
+        queries[f"pets.dashboard.{name}"] = query
+    return queries
+
+
+def seq_scans(plan: dict) -> list:
+    """Tablas con Seq Scan en el árbol del plan"""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+def explain(conn, statement) -> dict:
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    result = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]["Plan"]
+
+
+def main() -> int:
+    failures = []
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            print("🌱 Cargando dataset sintético...")
+            seed(conn)
+            for name, statement in hot_queries(conn).items():
+                plan = explain(conn, statement)
+                scans = seq_scans(plan)
+                status = "❌ Seq Scan en " + ", ".join(scans) if scans else "✅"
+                print(f"{name:<40}{plan['Total Cost']:>12.1f}  {status}")
+                if scans:
+                    failures.append(name)
+        finally:
+            transaction.rollback()
+
+    if failures:
+        print(f"\n❌ {len(failures)} consulta(s) sin índice: {', '.join(failures)}")
+        return 1
+    print("\n✅ Todas las consultas calientes usan índices")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
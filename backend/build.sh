@@ -10,4 +10,7 @@ pip install -r requirements.txt
 echo "🗄️ Inicializando base de datos..."
 python init_db.py
 
+echo "🧭 Aplicando migraciones..."
+alembic upgrade head
+
 echo "✅ Build completado"
\ No newline at end of file
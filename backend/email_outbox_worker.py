@@ -0,0 +1,47 @@
+"""
+Worker del outbox de emails
+Ejecutar con: python email_outbox_worker.py [--batch-size 50] [--concurrency 4] [--interval 2] [--once]
+
+Envía los emails que los requests dejan en email_outbox (verificación,
+reseteo de contraseña) reutilizando conexiones SMTP o la API batch de Resend,
+con reintentos y backoff exponencial. Se pueden correr varias instancias.
+"""
+import argparse
+from app.config import settings
+from app.services.email_templates import email_templates
+from app.services.email_outbox import EmailOutboxDispatcher
+from app.utils.worker_loop import run_batches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Envía los emails pendientes del outbox")
+    parser.add_argument("--batch-size", type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE, help="Emails por transacción")
+    parser.add_argument("--concurrency", type=int, default=settings.EMAIL_OUTBOX_CONCURRENCY, help="Conexiones SMTP en paralelo")
+    parser.add_argument("--interval", type=float, default=settings.EMAIL_OUTBOX_POLL_INTERVAL_SECONDS, help="Segundos de espera cuando no hay pendientes")
+    parser.add_argument("--once", action="store_true", help="Envía lo pendiente y termina")
+    args = parser.parse_args()
+
+    dispatcher = EmailOutboxDispatcher(
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    )
+    print(
+        f"📬 Worker del outbox de emails iniciado (lote={args.batch_size}, "
+        f"concurrencia={args.concurrency}, proveedor={settings.EMAIL_PROVIDER})"
+    )
+    email_templates.preload()
+    run_batches(
+        dispatcher,
+        batch_size=args.batch_size,
+        interval=args.interval,
+        once=args.once,
+        report=lambda processed, stats: (
+            f"📧 {processed} emails en {stats['last_batch_ms']:.0f} ms "
+            f"(enviados {stats['sent']}, reintentos {stats['retried']}, fallidos {stats['failed']})"
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ Ejecutar con: python init_db.py
 """
 import os
 from sqlalchemy import create_engine, text
-from app.database import Base, engine
+from app.database import Base, get_engine
 from app.models import *
 from dotenv import load_dotenv
 
@@ -36,6 +36,10 @@ def init_database():
             print("🔐 Creando extensión pgcrypto...")
             conn.execute(text("CREATE EXTENSION IF NOT EXISTS pgcrypto;"))
             
+            # pg_trgm para los índices de búsqueda por similitud
+            print("🔎 Creando extensión pg_trgm...")
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm;"))
+            
             # Crear esquema petcare si no existe
             print("📁 Creando esquema petcare...")
             conn.execute(text("CREATE SCHEMA IF NOT EXISTS petcare;"))
@@ -68,23 +72,12 @@ def init_database():
         
         # Crear todas las tablas usando SQLAlchemy
         print("🏗️ Creando tablas...")
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.create_all(bind=get_engine())
         print("✅ Tablas creadas exitosamente")
         
-        # Crear vista upcoming_reminders
-        with temp_engine.connect() as conn:
-            print("👁️ Creando vistas...")
-            conn.execute(text("""
-                CREATE OR REPLACE VIEW petcare.upcoming_reminders AS
-                SELECT r.*
-                FROM petcare.reminders r
-                WHERE r.is_active = TRUE
-                  AND (r.frequency <> 'once' OR r.event_time >= now())
-                  AND (r.event_time >= now() - interval '1 day')
-                ORDER BY r.event_time ASC;
-            """))
-            conn.commit()
-            print("✅ Vistas creadas exitosamente")
+        # La vista upcoming_reminders depende de reminders.next_fire_at y la crea
+        # la migración e5b1f9c3a824: en una base existente esa columna todavía no
+        # existe cuando corre este script (alembic upgrade head va después)
         
         print("\n🎉 ¡Base de datos inicializada correctamente!")
         print("✅ Puedes iniciar la aplicación con: uvicorn app.main:app")
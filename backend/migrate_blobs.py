@@ -0,0 +1,78 @@
+"""
+Script para mover las fotos guardadas en bytea al blob store
+Ejecutar con: python migrate_blobs.py [--batch-size 100]
+
+Recorre pet_photos.data y pets.photo_bytea en lotes: escribe cada binario
+en el blob store, guarda el digest (y el tamaño) y pone la columna bytea
+en NULL. Cada lote se confirma por separado, así que se puede interrumpir
+y volver a ejecutar sin repetir trabajo. Requiere la revisión 8c4e1b7a9d20.
+"""
+import argparse
+from sqlalchemy import select, update
+from app.database import engine
+from app.models import Pet, PetPhoto
+from app.services.blob_store import blob_store
+
+
+def migrate_pet_photos(batch_size: int) -> int:
+    """pet_photos.data -> blob store (sha256 + file_size_bytes)"""
+    moved = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(PetPhoto.id, PetPhoto.data)
+                .where(PetPhoto.data.isnot(None))
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not rows:
+                return moved
+            for photo_id, data in rows:
+                digest, size = blob_store.save_bytes(bytes(data))
+                conn.execute(
+                    update(PetPhoto)
+                    .where(PetPhoto.id == photo_id)
+                    .values(sha256=digest, file_size_bytes=size, data=None)
+                )
+        moved += len(rows)
+        print(f"📦 pet_photos: {moved} fotos movidas")
+
+
+def migrate_pet_avatars(batch_size: int) -> int:
+    """pets.photo_bytea -> blob store (photo_sha256)"""
+    moved = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(Pet.id, Pet.photo_bytea)
+                .where(Pet.photo_bytea.isnot(None))
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not rows:
+                return moved
+            for pet_id, data in rows:
+                digest, _ = blob_store.save_bytes(bytes(data))
+                conn.execute(
+                    update(Pet)
+                    .where(Pet.id == pet_id)
+                    .values(photo_sha256=digest, photo_bytea=None)
+                )
+        moved += len(rows)
+        print(f"📦 pets: {moved} fotos movidas")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mueve las fotos bytea al blob store")
+    parser.add_argument("--batch-size", type=int, default=100, help="Filas por transacción")
+    args = parser.parse_args()
+
+    print(f"🔧 Moviendo fotos a {blob_store.root} (lotes de {args.batch_size})...")
+    photos = migrate_pet_photos(args.batch_size)
+    avatars = migrate_pet_avatars(args.batch_size)
+    print(f"\n✅ Migración completada: {photos} fotos de pet_photos, {avatars} fotos de pets")
+    print("💡 Ejecuta VACUUM (o pg_repack) sobre petcare.pet_photos y petcare.pets para recuperar el espacio")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Worker de notificaciones de recordatorios
+Ejecutar con: python notification_worker.py [--batch-size 100] [--concurrency 10] [--interval 5] [--once]
+
+Toma lotes de recordatorios vencidos (FOR UPDATE SKIP LOCKED), los avanza y
+registra las notificaciones, y después del commit envía los emails con
+concurrencia acotada. Los envíos fallidos los reintenta email_outbox_worker.py.
+Se pueden correr varias instancias a la vez sin enviar dos veces la misma ocurrencia.
+Para pruebas de carga sin red: EMAIL_PROVIDER=fake (ver FAKE_EMAIL_LATENCY_MS).
+"""
+import argparse
+from app.config import settings
+from app.services.email_templates import email_templates
+from app.services.notification_dispatcher import NotificationDispatcher
+from app.utils.worker_loop import run_batches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Despacha las notificaciones de recordatorios vencidos")
+    parser.add_argument("--batch-size", type=int, default=settings.NOTIFICATION_BATCH_SIZE, help="Recordatorios por transacción")
+    parser.add_argument("--concurrency", type=int, default=settings.NOTIFICATION_CONCURRENCY, help="Emails enviados en paralelo")
+    parser.add_argument("--interval", type=float, default=settings.NOTIFICATION_POLL_INTERVAL_SECONDS, help="Segundos de espera cuando no hay vencidos")
+    parser.add_argument("--once", action="store_true", help="Procesa lo vencido y termina")
+    args = parser.parse_args()
+
+    dispatcher = NotificationDispatcher(batch_size=args.batch_size, concurrency=args.concurrency)
+    print(
+        f"🔔 Worker de notificaciones iniciado (lote={args.batch_size}, "
+        f"concurrencia={args.concurrency}, proveedor={settings.EMAIL_PROVIDER})"
+    )
+    email_templates.preload()
+    run_batches(
+        dispatcher,
+        batch_size=args.batch_size,
+        interval=args.interval,
+        once=args.once,
+        report=lambda processed, stats: (
+            f"📨 {processed} recordatorios en {stats['last_batch_ms']:.0f} ms "
+            f"(total {stats['reminders']}, {stats['reminders_per_second']}/s, "
+            f"emails a reintentar {stats['emails_retried']}, fallidos {stats['emails_failed']})"
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
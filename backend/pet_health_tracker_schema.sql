@@ -4,6 +4,7 @@
 -- =============================================
 
 CREATE EXTENSION IF NOT EXISTS pgcrypto;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- === Crear esquema ===
 CREATE SCHEMA IF NOT EXISTS petcare AUTHORIZATION petuser;
@@ -57,8 +58,14 @@ CREATE TABLE IF NOT EXISTS pets (
     weight_kg NUMERIC(5,2),
     sex TEXT,
     photo_url TEXT,
+    photo_sha256 VARCHAR(64),
     photo_bytea BYTEA,
     notes TEXT,
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(species, '') || ' ' || coalesce(breed, '')), 'B') ||
+        setweight(to_tsvector('spanish', coalesce(notes, '')), 'C')
+    ) STORED,
     created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
@@ -78,6 +85,7 @@ CREATE TABLE IF NOT EXISTS pet_photos (
     file_size_bytes BIGINT,
     mime_type TEXT,
     url TEXT,
+    sha256 VARCHAR(64),
     data BYTEA,
     created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
@@ -88,6 +96,26 @@ BEFORE UPDATE ON pet_photos
 FOR EACH ROW
 EXECUTE FUNCTION petcare.update_updated_at();
 
+-- === Tabla: variantes redimensionadas de imágenes (por digest del original) ===
+CREATE TABLE IF NOT EXISTS image_variants (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    source_sha256 VARCHAR(64) NOT NULL,
+    size TEXT NOT NULL,
+    format TEXT NOT NULL,
+    width INT,
+    height INT,
+    sha256 VARCHAR(64) NOT NULL,
+    file_size_bytes BIGINT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    CONSTRAINT uq_image_variants_source_size_format UNIQUE (source_sha256, size, format)
+);
+
+CREATE TRIGGER trg_image_variants_updated_at
+BEFORE UPDATE ON image_variants
+FOR EACH ROW
+EXECUTE FUNCTION petcare.update_updated_at();
+
 -- === Tabla: vacunas ===
 CREATE TABLE IF NOT EXISTS vaccinations (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -138,6 +166,11 @@ CREATE TABLE IF NOT EXISTS vet_visits (
     follow_up_date TIMESTAMPTZ,
     veterinarian TEXT,
     documents_id UUID REFERENCES pet_photos(id),
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', coalesce(reason, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(diagnosis, '')), 'B') ||
+        setweight(to_tsvector('spanish', coalesce(treatment, '')), 'C')
+    ) STORED,
     created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
@@ -201,6 +234,8 @@ CREATE TABLE IF NOT EXISTS reminders (
     is_active BOOLEAN NOT NULL DEFAULT TRUE,
     notify_by_email BOOLEAN NOT NULL DEFAULT TRUE,
     notify_in_app BOOLEAN NOT NULL DEFAULT TRUE,
+    next_fire_at TIMESTAMPTZ,
+    last_fired_at TIMESTAMPTZ,
     created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
@@ -245,6 +280,27 @@ BEFORE UPDATE ON password_resets
 FOR EACH ROW
 EXECUTE FUNCTION petcare.update_updated_at();
 
+-- === Tabla: outbox de emails (enviados por email_outbox_worker.py) ===
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    to_email TEXT NOT NULL,
+    template TEXT NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    last_error TEXT,
+    provider_response JSONB,
+    sent_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TRIGGER trg_email_outbox_updated_at
+BEFORE UPDATE ON email_outbox
+FOR EACH ROW
+EXECUTE FUNCTION petcare.update_updated_at();
+
 -- === Tabla: logs de auditoría ===
 CREATE TABLE IF NOT EXISTS audit_logs (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -262,11 +318,39 @@ BEFORE UPDATE ON audit_logs
 FOR EACH ROW
 EXECUTE FUNCTION petcare.update_updated_at();
 
+-- === Índices para los patrones de consulta (filtro + orden de cada listado) ===
+-- (también gestionados por Alembic: alembic/versions/3f2a9c7d1b4e_query_pattern_indexes.py)
+CREATE INDEX IF NOT EXISTS ix_users_created_at_id ON users(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_pets_owner_created_at ON pets(owner_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_vaccinations_pet_date_administered ON vaccinations(pet_id, date_administered, id);
+CREATE INDEX IF NOT EXISTS ix_vaccinations_pet_next_due ON vaccinations(pet_id, next_due) WHERE next_due IS NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_dewormings_pet_next_due ON dewormings(pet_id, next_due) WHERE next_due IS NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_meals_pet_meal_time ON meals(pet_id, meal_time, id);
+CREATE INDEX IF NOT EXISTS ix_reminders_owner_event_time ON reminders(owner_id, event_time);
+CREATE INDEX IF NOT EXISTS ix_notifications_owner_sent_at ON notifications(owner_id, sent_at, id);
+CREATE INDEX IF NOT EXISTS ix_audit_logs_actor_created_at ON audit_logs(actor_user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_audit_logs_object_created_at ON audit_logs(object_type, object_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_audit_logs_created_at_id ON audit_logs(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_pet_photos_sha256 ON pet_photos(sha256);
+CREATE INDEX IF NOT EXISTS ix_dewormings_pet_date_administered ON dewormings(pet_id, date_administered);
+CREATE INDEX IF NOT EXISTS ix_vet_visits_pet_visit_date ON vet_visits(pet_id, visit_date);
+CREATE INDEX IF NOT EXISTS ix_reminders_pet_active ON reminders(pet_id) WHERE is_active;
+CREATE INDEX IF NOT EXISTS ix_reminders_next_fire_at ON reminders(next_fire_at) WHERE is_active AND next_fire_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_email_outbox_pending ON email_outbox(next_attempt_at) WHERE status = 'pending';
+
+-- === Búsqueda (full-text + pg_trgm) ===
+CREATE INDEX IF NOT EXISTS ix_pets_search_vector ON pets USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS ix_pets_name_trgm ON pets USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_vet_visits_search_vector ON vet_visits USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS ix_users_username_trgm ON users USING gin (username gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_users_email_trgm ON users USING gin (email gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_users_full_name_trgm ON users USING gin (full_name gin_trgm_ops);
+
 -- === Vista: recordatorios próximos ===
+-- next_fire_at es la próxima ocurrencia (la mantiene app/services/reminder_scheduler.py)
 CREATE OR REPLACE VIEW upcoming_reminders AS
 SELECT r.*
 FROM reminders r
 WHERE r.is_active = TRUE
-  AND (r.frequency <> 'once' OR r.event_time >= now())
-  AND (r.event_time >= now() - interval '1 day')
-ORDER BY r.event_time ASC;
+  AND r.next_fire_at IS NOT NULL
+ORDER BY r.next_fire_at ASC;